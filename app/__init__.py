@@ -5,9 +5,10 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from config import Config
 from flask_cors import CORS 
+from app.utils.db_routing import RoutingSession
 
 # Create SQLAlchemy and Migrate instances
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 
 
 def create_app(config_class=Config):
@@ -15,14 +16,64 @@ def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
 
+    # Use the fast JSON provider (orjson when installed, ISO-8601 dates)
+    from app.utils.json_provider import init_json_provider
+    init_json_provider(app)
+
     # Initialize CORS
     CORS(app, resources={r"/*": {"origins": "*"}})
 
     from app.services.jwt import jwt
     jwt.init_app(app)
 
-    # Initialize SQLAlchemy
+    # Initialize SQLAlchemy with the configured connection pool
+    from app.utils.db_pool import build_engine_options, init_db_pool
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = build_engine_options(app.config)
+    from app.utils.db_routing import configure_replica_binds, init_db_routing
+    configure_replica_binds(app)
     db.init_app(app)
+    init_db_pool(app)
+    init_db_routing(app)
+
+    # Initialize SQL query tracking
+    from app.utils.query_tracking import init_query_tracking
+    init_query_tracking(app)
+
+    # Initialize the slow-query log
+    from app.utils.slow_query_log import init_slow_query_log
+    init_slow_query_log(app)
+
+    # Initialize the user summary cache
+    from app.utils.cache import init_user_cache
+    init_user_cache(app)
+
+    # Initialize the revoked token cache and the `flask auth` commands
+    from app.services.auth.token_blocklist import init_token_blocklist
+    init_token_blocklist(app)
+
+    # Initialize the token generation cache ("log out everywhere")
+    from app.services.auth.token_generation import init_token_generations
+    init_token_generations(app)
+
+    # Initialize the write-behind counter buffer (post and hashtag views)
+    from app.utils.counter_buffer import init_counter_buffer
+    init_counter_buffer(app)
+
+    # Initialize sharded counters for hot follower and reaction counts
+    from app.utils.counters import init_counter_shards
+    init_counter_shards(app)
+
+    # Initialize the persistent job queue (deletes, timeline fan-out and cleanup)
+    from app.services.jobs import init_jobs
+    init_jobs(app)
+
+    # Refresh post reaction summaries in the background (no-op unless REACTION_SUMMARY_ENABLED)
+    from app.services.posts.react.reaction_summary import init_reaction_summary
+    init_reaction_summary(app)
+
+    # Register the materialized timeline commands
+    from app.services.feed.timeline import init_timelines
+    init_timelines(app)
     # Initialize Migrate
     migrate = Migrate(app, db)
 
@@ -30,6 +81,14 @@ def create_app(config_class=Config):
     from app.api.v1 import bp as api_v1_bp
     app.register_blueprint(api_v1_bp, url_prefix="/api/v1")
 
+    # Initialize request and connection pool metrics
+    from app.utils.metrics import init_metrics
+    init_metrics(app, blueprint=api_v1_bp.name, route_prefix="/api/v1")
+
+    # Initialize on-demand profiling (no-op unless PROFILING_ENABLED)
+    from app.utils.profiling import init_profiling
+    init_profiling(app)
+
 
     # Custom error handlers
     @app.errorhandler(400)
@@ -61,4 +120,8 @@ def create_app(config_class=Config):
         print(f"Internal Server Error: {str(error)}")
         return jsonify({"error": "Internal Server Error", "message": str(error)}), 500
 
+    # Compress responses (wraps the WSGI app, so it must come last)
+    from app.utils.compression import init_compression
+    init_compression(app)
+
     return app
@@ -9,7 +9,8 @@ from app.api.v1 import (debug,
                         users,
                         posts,
                         hashtags,
-                        blocks
+                        blocks,
+                        feed
                         )
 
 # Register the blueprints with the main api_v1 blueprint
@@ -20,4 +21,5 @@ bp.register_blueprint(market.bp)
 bp.register_blueprint(users.bp)
 bp.register_blueprint(posts.bp)
 bp.register_blueprint(hashtags.bp)
-bp.register_blueprint(blocks.bp)
\ No newline at end of file
+bp.register_blueprint(blocks.bp)
+bp.register_blueprint(feed.bp)
\ No newline at end of file
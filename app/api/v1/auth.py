@@ -1,7 +1,7 @@
 from app import db
 from flask import Blueprint, app, request
 from flask_jwt_extended import get_jwt, get_jwt_identity, jwt_required
-from app.services.auth import api_key_required, login_service, refresh_token_service, logout_service
+from app.services.auth import api_key_required, login_service, refresh_token_service, logout_service, logout_all_service
 
 bp = Blueprint("auth", __name__)
 
@@ -17,8 +17,16 @@ def login():
 @api_key_required
 @jwt_required()
 def logout():
-    jti = get_jwt()["jti"]
-    return logout_service(jti)
+    token = get_jwt()
+    return logout_service(token["jti"], token.get("exp"))
+
+# ----------------- LOGOUT USER EVERYWHERE ----------------- #
+@bp.route("/logout/all", methods=["POST"])
+@api_key_required
+@jwt_required()
+def logout_all():
+    private_user_id = get_jwt_identity()
+    return logout_all_service(private_user_id)
 
 # ----------------- REFRESH TOKEN ----------------- #
 @bp.route("/refresh", methods=["POST"])
@@ -26,4 +34,4 @@ def logout():
 @jwt_required(refresh=True)
 def refresh():
     identity = get_jwt_identity()
-    return refresh_token_service(identity)
+    return refresh_token_service(identity, get_jwt())
@@ -1,10 +1,27 @@
 from app import db
 from flask import Blueprint, jsonify
-
-from app.services.debug import debug_service
+from flask_jwt_extended import jwt_required
+from app.services.auth import api_key_required, admin_required
+from app.services.debug import debug_service, pool_stats_service, cache_stats_service
 
 bp = Blueprint("debug", __name__)
 
 @bp.route("/debug", methods=["POST"])
 def debug():
-    return debug_service()
\ No newline at end of file
+    return debug_service()
+
+# ----------------- CONNECTION POOL STATS ----------------- #
+@bp.route("/debug/pool", methods=["GET"])
+@api_key_required
+@jwt_required()
+@admin_required
+def pool_stats():
+    return pool_stats_service()
+
+# ----------------- CACHE STATS ----------------- #
+@bp.route("/debug/cache", methods=["GET"])
+@api_key_required
+@jwt_required()
+@admin_required
+def cache_stats():
+    return cache_stats_service()
@@ -0,0 +1,15 @@
+from flask import Blueprint
+from flask_jwt_extended import get_jwt_identity, jwt_required
+from app.services.auth import api_key_required
+from app.services.feed import get_feed_service
+
+bp = Blueprint("feed", __name__)
+
+# ----------------- GET HOME FEED ----------------- #
+@bp.route("/feed", methods=["GET"])
+@api_key_required
+@jwt_required()
+def get_feed():
+    # Get private_user_id from JWT token
+    private_user_id = get_jwt_identity()
+    return get_feed_service(private_user_id)
@@ -65,7 +65,7 @@ def update_user():
 @bp.route("/users", methods=["DELETE"])
 @api_key_required
 @jwt_required()
-def delete_user(private_user_id):
+def delete_user():
     # Get the user's private_user_id from the JWT
     private_user_id = get_jwt_identity()
     
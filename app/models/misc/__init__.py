@@ -1 +1,3 @@
-from app.models.misc.jwt_token_blocklist import JWTTokenBlocklist
\ No newline at end of file
+from app.models.misc.jwt_token_blocklist import JWTTokenBlocklist
+from app.models.misc.counter_shards import CounterShards
+from app.models.misc.jobs import Jobs
\ No newline at end of file
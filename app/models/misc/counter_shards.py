@@ -0,0 +1,71 @@
+from app import db
+from enum import Enum
+from datetime import datetime
+from sqlalchemy import DateTime, Integer, String
+from app.types.length import (
+    COUNTER_SHARD_NAME_LENGTH,
+    COUNTER_SHARD_KEY_LENGTH
+)
+
+class CounterShards(db.Model): # type: ignore
+    """Represents a pending delta of a sharded counter.
+
+    Increments of a hot counter, such as the follower count of a celebrity account or
+    the reaction count of a viral post, are spread over several shard rows instead of
+    all locking the counter's own row. The counter's value is its base row plus the
+    deltas of its shards; the compactor periodically folds the deltas into the base
+    row and deletes the shards. See `app.utils.counters`.
+
+    Attributes:
+        counter_name (str): The counter column, e.g. `user_stats.follower_count`. Part of the primary key.
+        counter_key (str): The counted row, built with `counter_key()`, e.g. a user ID. Part of the primary key.
+        shard (int): The shard number, from 0 to `COUNTER_SHARDS - 1`. Part of the primary key.
+        delta (int): The change not yet folded into the base row. May be negative.
+        updated_at (datetime): When the shard last changed.
+
+    Returns:
+        None
+    """
+    # TABLE NAME
+    __tablename__: str = "counter_shards"
+
+    # COLUMNS
+    counter_name: str = db.Column(String(COUNTER_SHARD_NAME_LENGTH), primary_key=True)
+    counter_key: str = db.Column(String(COUNTER_SHARD_KEY_LENGTH), primary_key=True)
+    shard: int = db.Column(Integer, primary_key=True, autoincrement=False)
+    delta: int = db.Column(Integer, nullable=False, default=0)
+    updated_at: datetime = db.Column(DateTime, nullable=False, default=datetime.now, onupdate=datetime.now)
+
+    # METHODS
+    def __repr__(self):
+        return f"<COUNTER_SHARD {self.counter_name} {self.counter_key} {self.shard}>"
+
+    class DictKeys(Enum):
+        """Defines keys for the dictionary representation of the CounterShards model."""
+        NAME = "name"
+        KEY = "key"
+        SHARD = "shard"
+        DELTA = "delta"
+        UPDATED_AT = "updated_at"
+
+    def to_dict(self, exclude_fields: list[DictKeys] = []) -> dict:
+        """Converts the CounterShards instance into a dictionary representation.
+
+        Args:
+            exclude_fields (list): A list of fields to exclude from the dictionary representation.
+
+        Returns:
+            dict: A dictionary representation of the CounterShards instance.
+        """
+        data: dict = {
+            "name": self.counter_name,
+            "key": self.counter_key,
+            "shard": self.shard,
+            "delta": self.delta,
+            "updated_at": self.updated_at
+        }
+
+        for field in exclude_fields:
+            data.pop(field.value, None)
+
+        return data
@@ -0,0 +1,108 @@
+from app import db
+from enum import Enum
+from datetime import datetime
+from sqlalchemy import JSON, DateTime, Integer, String, Text, Enum as SQLAlchemyEnum
+from app.types.enum import JobStatus
+from app.utils.id_generation import generate_uuid
+from app.types.length import (
+    JOB_ID_LENGTH,
+    JOB_NAME_LENGTH,
+    JOB_IDEMPOTENCY_KEY_LENGTH,
+    JOB_WORKER_ID_LENGTH
+)
+
+class Jobs(db.Model): # type: ignore
+    """Represents a unit of background work in the persistent job queue.
+
+    Services enqueue jobs in their own transaction, so a job exists exactly when the
+    change that requires it was committed. Workers (`flask jobs work`) claim due
+    jobs, run the handler registered under `job_name` with `payload`, and retry
+    failed attempts with exponential backoff. See `app.services.jobs`.
+
+    Attributes:
+        job_id (str): The unique identifier of the job. Defaults to a generated UUID.
+        job_name (str): The registered handler to run, e.g. `posts.delete`.
+        payload (dict): The JSON arguments of the handler.
+        idempotency_key (str): Optional. At most one job is ever enqueued per key, e.g. `posts.delete:<post_id>`.
+        status (JobStatus): Where the job is in its life cycle.
+        attempts (int): Attempts started so far.
+        max_attempts (int): Attempts allowed before the job is marked as failed.
+        run_at (datetime): When the job is due, later than `created_at` for delayed jobs and retries.
+        locked_by (str): The worker running the job, while it is running.
+        locked_at (datetime): When the current attempt started. A running job whose lock is older
+            than `JOBS_LOCK_TIMEOUT_SECONDS` is assumed abandoned and claimed again.
+        last_error (str): The error of the last failed attempt.
+        created_at (datetime): When the job was enqueued.
+        finished_at (datetime): When the job succeeded or finally failed.
+
+    Returns:
+        None
+    """
+    # TABLE NAME
+    __tablename__: str = "jobs"
+    __table_args__ = (
+        # Workers claim the earliest due jobs of a status
+        db.Index("idx_jobs_status_run_at", "status", "run_at"),
+        db.UniqueConstraint("idempotency_key", name="uq_jobs_idempotency_key"),
+    )
+
+    # COLUMNS
+    job_id: str = db.Column(String(JOB_ID_LENGTH), primary_key=True, default=generate_uuid)
+    job_name: str = db.Column(String(JOB_NAME_LENGTH), nullable=False)
+    payload: dict = db.Column(JSON, nullable=False, default=dict)
+    idempotency_key: str = db.Column(String(JOB_IDEMPOTENCY_KEY_LENGTH), nullable=True)
+    status: JobStatus = db.Column(SQLAlchemyEnum(JobStatus), nullable=False, default=JobStatus.PENDING)
+    attempts: int = db.Column(Integer, nullable=False, default=0)
+    max_attempts: int = db.Column(Integer, nullable=False, default=5)
+    run_at: datetime = db.Column(DateTime, nullable=False, default=datetime.now)
+    locked_by: str = db.Column(String(JOB_WORKER_ID_LENGTH), nullable=True)
+    locked_at: datetime = db.Column(DateTime, nullable=True)
+    last_error: str = db.Column(Text, nullable=True)
+    created_at: datetime = db.Column(DateTime, nullable=False, default=datetime.now)
+    finished_at: datetime = db.Column(DateTime, nullable=True)
+
+    # METHODS
+    def __repr__(self):
+        return f"<JOB {self.job_name} {self.job_id}>"
+
+    class DictKeys(Enum):
+        """Defines keys for the dictionary representation of the Jobs model."""
+        ID = "id"
+        NAME = "name"
+        PAYLOAD = "payload"
+        IDEMPOTENCY_KEY = "idempotency_key"
+        STATUS = "status"
+        ATTEMPTS = "attempts"
+        MAX_ATTEMPTS = "max_attempts"
+        RUN_AT = "run_at"
+        LAST_ERROR = "last_error"
+        CREATED_AT = "created_at"
+        FINISHED_AT = "finished_at"
+
+    def to_dict(self, exclude_fields: list[DictKeys] = []) -> dict:
+        """Converts the Jobs instance into a dictionary representation.
+
+        Args:
+            exclude_fields (list): A list of fields to exclude from the dictionary representation.
+
+        Returns:
+            dict: A dictionary representation of the Jobs instance.
+        """
+        data: dict = {
+            "id": self.job_id,
+            "name": self.job_name,
+            "payload": self.payload,
+            "idempotency_key": self.idempotency_key,
+            "status": self.status.value,
+            "attempts": self.attempts,
+            "max_attempts": self.max_attempts,
+            "run_at": self.run_at,
+            "last_error": self.last_error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at
+        }
+
+        for field in exclude_fields:
+            data.pop(field.value, None)
+
+        return data
@@ -41,23 +41,32 @@ class JWTTokenBlocklist(db.Model): # type: ignore
 
     This model tracks JWT tokens that are no longer valid and should be 
     rejected by the authentication system. It stores information about 
-    the token identifier and the time when the token was created.
+    the token identifier, the time when the token was added and the time
+    when the token expires anyway, after which the record can be purged.
 
     Attributes:
         jwt_token_blocklist_id (int): The unique identifier for the token blocklist record. Defaults to a UUID.
         jti (str): The JWT identifier, which uniquely identifies the token being blocked and cannot be null.
         created_at (datetime): The timestamp when the token was created and added to the blocklist.
+        expires_at (datetime): When the token expires. Null for records added before expiries were stored.
 
     Returns:
         None
     """
     # TABLE NAME
     __tablename__: str = "jwt_token_blocklist"
+    __table_args__ = (
+        db.UniqueConstraint("jti", name="uq_jwt_token_blocklist_jti"),
+        # Workers poll for records added since their last poll
+        db.Index("idx_jwt_token_blocklist_created_at", "created_at"),
+        db.Index("idx_jwt_token_blocklist_expires_at", "expires_at"),
+    )
 
     # COLUMNS
     jwt_token_blocklist_id: str = db.Column(String(JWT_TOKEN_BLOCKLIST_ID_LENGTH), primary_key=True, default=generate_uuid)
     jti: str = db.Column(db.String(JTI_LENGTH), nullable=False)
     created_at: datetime = db.Column(DateTime, nullable=False, default=datetime.now)
+    expires_at: datetime = db.Column(DateTime, nullable=True)
 
     #region VALIDATION
     # JWT_TOKEN_BLOCKLIST_ID
@@ -92,6 +101,7 @@ class JWTTokenBlocklist(db.Model): # type: ignore
         ID = "id"
         JTI = "jti"
         CREATED_AT = "created_at"
+        EXPIRES_AT = "expires_at"
     
     #region TO_DICT
     def to_dict(self, exclude_fields: list[DictKeys] = []) -> dict:
@@ -109,7 +119,8 @@ class JWTTokenBlocklist(db.Model): # type: ignore
         data: dict = {
             "id": self.jwt_token_blocklist_id,
             "jti": self.jti,
-            "created_at": self.created_at
+            "created_at": self.created_at,
+            "expires_at": self.expires_at
         }
         
         for field in exclude_fields:
@@ -1,9 +1,11 @@
-from typing import Optional
+from typing import Dict, Iterable, Optional
 import uuid
 from app import db
 from enum import Enum
 from sqlalchemy.orm import validates
-from sqlalchemy import Integer, String
+from sqlalchemy import Integer, String, insert, select
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
 from app.utils.id_generation import generate_uuid
 from app.utils.validation import valid_uuid, valid_string, valid_integer
 from app.types.length import (
@@ -34,6 +36,20 @@ def valid_hashtag_name(hashtag_name: Optional[str]) -> bool:
     """
     return valid_string(hashtag_name, length=(HASHTAG_NAME_LENGTH_MIN, HASHTAG_NAME_LENGTH_MAX), allow_empty=False)
 
+def normalize_hashtag_name(hashtag_name: str) -> str:
+    """Normalizes a hashtag as entered by a user to its stored name.
+
+    A leading `#` and all whitespace are removed and the name is lowercased,
+    so `#Summer Vibes` and `summervibes` are the same hashtag.
+
+    Args:
+        hashtag_name (str): The hashtag as entered.
+
+    Returns:
+        str: The normalized name. It may still be invalid, e.g. empty or too long.
+    """
+    return "".join(hashtag_name.split()).lstrip("#").lower()
+
 def valid_hashtag_views(views: int) -> bool:
     """Validates the views count for a hashtag.
 
@@ -82,6 +98,9 @@ class HashTags(db.Model): # type: ignore
     """
     # TABLE NAME
     __tablename__: str = "hashtags"
+    __table_args__ = (
+        db.UniqueConstraint("hashtag_name", name="uq_hashtags_hashtag_name"),
+    )
 
     # COLUMNS
     hashtag_id: str = db.Column(String(HASHTAG_ID_LENGTH), primary_key=True, default=generate_uuid)
@@ -163,4 +182,86 @@ class HashTags(db.Model): # type: ignore
         for field in exclude_fields:
             data.pop(field.value, None)
     
-        return data
\ No newline at end of file
+        return data
+
+    @classmethod
+    def version_stamp(cls, hashtag_name: str) -> Optional[tuple]:
+        """Returns a version stamp of the hashtag's `to_dict()` representation.
+
+        `views` is left out, since every GET counts a view; a copy validated with a 304
+        may show an older view count. The first element is the hashtag's ID.
+
+        Args:
+            hashtag_name (str): The name of the hashtag.
+
+        Returns:
+            Optional[tuple]: The stamp, or None if the hashtag does not exist.
+        """
+        row = (
+            db.session.query(cls.hashtag_id, cls.hashtag_name, cls.post_count)
+            .filter(cls.hashtag_name == hashtag_name)
+            .first()
+        )
+        return tuple(row) if row is not None else None
+
+    @classmethod
+    def resolve_names(cls, hashtag_names: Iterable[str]) -> Dict[str, str]:
+        """Maps hashtag names to their IDs, creating the hashtags that do not exist yet.
+
+        Existing hashtags are read with a single `IN` query and the missing ones are
+        inserted with one statement that skips names created concurrently by another
+        transaction (`INSERT ... ON DUPLICATE KEY UPDATE` on MySQL, `ON CONFLICT DO NOTHING`
+        on SQLite and PostgreSQL), after which the IDs are read again. The unique
+        `hashtag_name` constraint guarantees both transactions end up with the same ID.
+        The second read is a locking read: a plain read in a REPEATABLE READ transaction
+        uses the snapshot taken by the first one, which cannot see a hashtag inserted and
+        committed by another transaction in between. Runs in the current transaction and
+        does not commit.
+
+        Args:
+            hashtag_names (Iterable[str]): Normalized, valid hashtag names.
+
+        Returns:
+            Dict[str, str]: The hashtag ID by name, for every given name.
+
+        Raises:
+            RuntimeError: If a hashtag could neither be inserted nor read.
+        """
+        names = list(dict.fromkeys(hashtag_names))
+        if not names:
+            return {}
+
+        def lookup(locking: bool = False) -> Dict[str, str]:
+            query = select(cls.hashtag_name, cls.hashtag_id).where(cls.hashtag_name.in_(names))
+            if locking:
+                # Reads the latest committed rows (LOCK IN SHARE MODE on MySQL) and keeps them until the transaction ends
+                query = query.with_for_update(read=True)
+            return {name: hashtag_id for name, hashtag_id in db.session.execute(query)}
+
+        resolved = lookup()
+        missing = [name for name in names if name not in resolved]
+        if not missing:
+            return resolved
+
+        rows = [{"hashtag_id": generate_uuid(), "hashtag_name": name, "views": 0, "post_count": 0} for name in missing]
+        dialect = db.session.get_bind(clause=cls.__table__).dialect.name
+        if dialect in ("mysql", "mariadb"):
+            statement = mysql.insert(cls.__table__)
+            # A no-op update turns duplicate names into successful no-ops without ignoring other errors
+            db.session.execute(statement.on_duplicate_key_update(hashtag_name=statement.inserted.hashtag_name), rows)
+        elif dialect in ("sqlite", "postgresql"):
+            dialect_insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+            db.session.execute(dialect_insert(cls.__table__).on_conflict_do_nothing(index_elements=["hashtag_name"]), rows)
+        else:
+            for row in rows:
+                try:
+                    with db.session.begin_nested():
+                        db.session.execute(insert(cls.__table__), row)
+                except IntegrityError:
+                    pass
+
+        resolved = lookup(locking=True)
+        missing = [name for name in names if name not in resolved]
+        if missing:
+            raise RuntimeError(f"Could not resolve hashtags: {', '.join(missing)}")
+        return resolved
@@ -92,7 +92,7 @@ class PostMedia(db.Model): # type: ignore
     # MEDIA_ORDER
     @validates("media_order")
     def validate_media_order(self, key, media_order: int) -> int:
-        if not valid_integer(media_order, allow_negative=False, allow_zero=False):
+        if not valid_integer(media_order, allow_negative=False, allow_zero=True):
             raise ValueError("Invalid media order.")
         return media_order
     
@@ -1,10 +1,11 @@
 from app import db
 from enum import Enum
 from sqlalchemy.orm import validates
+from app.utils.counters import counter_key, increment_counter, increment_sharded, upsert_counter
 from app.utils.validation import valid_integer
-from app.models.post.posts import valid_post_id
+from app.models.post.posts import Posts, valid_post_id
 from app.models.post.post_reaction_types import valid_post_reaction_type
-from sqlalchemy import Integer, String
+from sqlalchemy import Integer, String, delete
 from app.types.length import (
     POST_ID_LENGTH,
     POST_REACTION_TYPE_LENGTH
@@ -17,6 +18,11 @@ class PostReactionCounts(db.Model): # type: ignore
     to display the reaction count on the post. Each reaction count is associated
     with a specific post and reaction type.
 
+    Storage is sparse: a row exists only while its count is above zero. It is created
+    by the first reaction of its type and deleted when the last one is removed, and a
+    missing row reads as a count of zero. Use `increment` and `decrement` to change counts
+    and `Posts.reaction_counts()` to read them, which includes pending counter shards.
+
     Attributes:
         post_id (str): The unique identifier for the post, linked to the `posts` table. This serves as part of the primary key.
         post_reaction_type (str): The type of reaction, linked to the `post_reaction_types` table. This serves as part of the primary key.
@@ -93,4 +99,54 @@ class PostReactionCounts(db.Model): # type: ignore
         for field in exclude_fields:
             data.pop(field.value, None)
         
-        return data
\ No newline at end of file
+        return data
+
+    @classmethod
+    def increment(cls, post_id: str, post_reaction_type: str) -> None:
+        """Adds one reaction of a type to a post, creating the count row on the first one.
+
+        When the count is hot and counter sharding is enabled, the increment goes to a
+        counter shard instead and is folded into the row by the compactor. Otherwise see `add`.
+        Runs in the current transaction and does not commit.
+
+        Args:
+            post_id (str): The post.
+            post_reaction_type (str): The reaction type.
+        """
+        if not increment_sharded(cls.reaction_count, counter_key(post_id, post_reaction_type)):
+            cls.add(post_id, post_reaction_type, 1)
+
+    @classmethod
+    def decrement(cls, post_id: str, post_reaction_type: str) -> None:
+        """Removes one reaction of a type from a post, deleting the count row when it reaches zero.
+
+        Sharded like `increment`. Runs in the current transaction and does not commit.
+
+        Args:
+            post_id (str): The post.
+            post_reaction_type (str): The reaction type.
+        """
+        if not increment_sharded(cls.reaction_count, counter_key(post_id, post_reaction_type), -1):
+            cls.add(post_id, post_reaction_type, -1)
+
+    @classmethod
+    def add(cls, post_id: str, post_reaction_type: str, amount: int) -> None:
+        """Changes a post's count of a reaction type by `amount` and marks its reaction summary stale.
+
+        Positive amounts upsert the row with `upsert_counter`, so concurrent first reactions
+        do not collide. Negative amounts stop at zero and delete the row once it reaches zero.
+        Runs in the current transaction and does not commit.
+
+        Args:
+            post_id (str): The post.
+            post_reaction_type (str): The reaction type.
+            amount (int): The change.
+        """
+        table = cls.__table__
+        key = (table.c.post_id == post_id, table.c.post_reaction_type == post_reaction_type)
+        if amount > 0:
+            upsert_counter(cls.reaction_count, {"post_id": post_id, "post_reaction_type": post_reaction_type}, amount)
+        elif amount < 0:
+            increment_counter(cls.reaction_count, *key, amount=amount)
+            db.session.execute(delete(table).where(*key, table.c.reaction_count <= 0))
+        Posts.mark_reaction_summary_stale(post_id)
@@ -1,6 +1,9 @@
 from app import db
+from typing import List
+from flask import current_app, has_app_context
 from sqlalchemy import String
 from sqlalchemy.orm import validates
+from app.utils.cache import TTLCache
 from app.utils.validation import valid_string
 from enum import Enum
 from app.types.length import (
@@ -74,4 +77,32 @@ class PostReactionTypes(db.Model): # type: ignore
         for field in exclude_fields:
             data.pop(field.value, None)
         
-        return data
\ No newline at end of file
+        return data
+
+    @classmethod
+    def names(cls) -> List[str]:
+        """Returns every reaction type, sorted.
+
+        Reaction types are reference data that practically never change, so the list is
+        cached per worker for `REACTION_TYPES_CACHE_TTL_SECONDS` instead of being read
+        whenever a post is serialized or reacted to.
+
+        Returns:
+            List[str]: The reaction type names.
+        """
+        cache = None
+        if has_app_context():
+            cache = current_app.extensions.get("reaction_types_cache")
+            if cache is None:
+                cache = current_app.extensions.setdefault("reaction_types_cache", TTLCache(
+                    maxsize=1,
+                    ttl=current_app.config.get("REACTION_TYPES_CACHE_TTL_SECONDS", 300),
+                ))
+            names = cache.get("names")
+            if names is not None:
+                return names
+
+        names = sorted(name for (name,) in db.session.query(cls.post_reaction_type))
+        if cache is not None:
+            cache.set("names", names)
+        return names
@@ -1,5 +1,6 @@
 from app import db
 from enum import Enum
+from typing import Dict, Iterable
 from sqlalchemy import String
 from sqlalchemy.orm import validates
 from app.models.post.posts import valid_post_id
@@ -99,4 +100,28 @@ class PostReactions(db.Model): # type: ignore
         for field in exclude_fields:
             data.pop(field.value, None)
         
-        return data
\ No newline at end of file
+        return data
+
+    @classmethod
+    def load_viewer_reactions(cls, user_id: str, post_ids: Iterable[str]) -> Dict[str, str]:
+        """Fetches a user's reactions to a set of posts in a single query.
+
+        The lookup is served by the leading `(post_id, user_id)` columns of the primary key,
+        so it reads one index entry per post however many reactions the posts have.
+
+        Args:
+            user_id (str): The private identifier of the viewing user.
+            post_ids (Iterable[str]): The posts to look up, e.g. the posts of a page.
+
+        Returns:
+            Dict[str, str]: The viewer's reaction type by post ID. Posts without a reaction are absent.
+        """
+        post_ids = list(set(post_ids))
+        if not user_id or not post_ids:
+            return {}
+        rows = (
+            db.session.query(cls.post_id, cls.post_reaction_type)
+            .filter(cls.post_id.in_(post_ids), cls.user_id == user_id)
+            .all()
+        )
+        return {post_id: reaction_type for post_id, reaction_type in rows}
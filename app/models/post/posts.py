@@ -1,14 +1,15 @@
 from app import db
 from enum import Enum
+from flask import current_app, has_app_context
 from datetime import datetime
-from typing import Optional, Union
+from typing import Dict, Optional, Union
 from app.types.enum import PostType
 from sqlalchemy.orm import validates
 from app.utils.validation import valid_uuid, valid_enum_element, valid_datetime, valid_integer
 from app.models.post.post_categories import valid_post_category_id
 from app.models.user.users import valid_private_user_id
 from app.utils.id_generation import generate_uuid
-from sqlalchemy import DateTime, Enum as SQLAlchemyEnum, Integer, String, Text
+from sqlalchemy import JSON, Boolean, DateTime, Enum as SQLAlchemyEnum, Integer, String, Text
 from app.types.length import (
     POST_ID_LENGTH,
     POST_CATEGORY_ID_LENGTH,
@@ -27,6 +28,12 @@ def valid_post_id(value: Optional[str]) -> bool:
     """
     return valid_uuid(value)
 
+# Session info key of the posts whose reaction summary is refreshed after the session commits
+REACTION_SUMMARY_STALE_KEY = "reaction_summary_stale"
+
+def _reaction_summary_enabled() -> bool:
+    return has_app_context() and current_app.config.get("REACTION_SUMMARY_ENABLED", False)
+
 class Posts(db.Model): # type: ignore
     """Represents a record of user posts in the database.
 
@@ -43,6 +50,15 @@ class Posts(db.Model): # type: ignore
         group_id (str, optional): The unique identifier for the group to which the post belongs, linked to the `user_groups` table. This can be null for user posts.
         view_count (int): The number of views or interactions on the post. Defaults to 0.
         created_at (datetime): The timestamp when the post was created. Defaults to the current time.
+        reaction_summary (dict, optional): The non-zero reaction counts by reaction type, recomputed from
+            `post_reaction_counts` by the `posts.refresh_reaction_summary` job after they change. Read instead
+            of the count rows when `REACTION_SUMMARY_ENABLED` is set, so it lags them by up to
+            `REACTION_SUMMARY_REFRESH_DELAY_SECONDS`. Null if unknown, in which case the rows are read.
+        fanned_out (bool): Whether the post is delivered to the followers' materialized timelines. False for
+            posts of celebrities, which are merged into the feed at read time instead. Decided when the post
+            is created, so it does not change when the author's follower count crosses the threshold.
+        deleted_at (datetime, optional): When the post was deleted. A deleted post is hidden at once and
+            removed with everything cascading from it by the `posts.delete` job. Null for live posts.
 
     Relationships:
         post_category (PostCategories): A relationship to the PostCategories model, indicating the category of the post.
@@ -60,6 +76,12 @@ class Posts(db.Model): # type: ignore
     """
     # TABLE NAME
     __tablename__: str = "posts"
+    __table_args__ = (
+        # Keyset pagination of posts, newest first
+        db.Index("idx_posts_created_at_post_id", "created_at", "post_id"),
+        # A user's posts, newest first, and the followees' ranges merged by the home feed
+        db.Index("idx_posts_user_created_at", "user_id", "created_at", "post_id"),
+    )
     
     # COLUMNS
     post_id: str = db.Column(String(POST_ID_LENGTH), primary_key=True, default=generate_uuid)
@@ -70,6 +92,9 @@ class Posts(db.Model): # type: ignore
     group_id: str = db.Column(String(USER_GROUP_PRIVATE_ID_LENGTH), db.ForeignKey("user_groups.private_group_id"), nullable=True)
     view_count: int = db.Column(Integer, nullable=False, default=0)
     created_at: datetime = db.Column(DateTime, nullable=False, default=datetime.now)
+    reaction_summary: Optional[dict] = db.Column(JSON, nullable=True)
+    fanned_out: bool = db.Column(Boolean, nullable=False, default=True)
+    deleted_at: Optional[datetime] = db.Column(DateTime, nullable=True)
 
     # Define relationship to PostCategories model
     post_category = db.relationship("PostCategories", back_populates="posts")
@@ -172,7 +197,13 @@ class Posts(db.Model): # type: ignore
         USER_REACTED = "user_reacted"
         USER_REACTION_TYPE = "user_reaction_type"
     
-    def to_dict(self, user_id: Optional[str] = None, exclude_fields: list[DictKeys] = [DictKeys.USER_REACTED]) -> dict:
+    def to_dict(
+        self,
+        user_id: Optional[str] = None,
+        exclude_fields: list[DictKeys] = [DictKeys.USER_REACTED],
+        viewer_reactions: Optional[Dict[str, str]] = None,
+        use_cache: bool = True
+    ) -> dict:
         """Converts the Posts instance into a dictionary representation.
         
         This method converts the Posts instance into a dictionary representation,
@@ -182,14 +213,19 @@ class Posts(db.Model): # type: ignore
         Args:
             user_id (str): The unique identifier for the user viewing the post. This is used to fetch the user's reaction.
             exclude_fields (list): A list of fields to exclude from the dictionary representation.
+            viewer_reactions (dict, optional): The viewer's reaction type by post ID, from
+                `PostReactions.load_viewer_reactions`. Pass it when serializing many posts so
+                the reactions are fetched once per page instead of once per post.
+            use_cache (bool): Whether the poster may be rendered from the in-process user cache.
         
         Returns:
             dict: A dictionary representation of the Posts instance.
         """
+        from app.models import PostReactionTypes
+
         post_hashtags_relationship = getattr(self, "post_hashtags", [])
         media_relationship = getattr(self, "media", [])
-        reactions_relationship = getattr(self, "reactions", [])
-        post_reactions_relationship = getattr(self, "post_reactions", [])
+        reaction_counts = self.reaction_counts()
         
         data: dict = {
             "id": self.post_id,
@@ -197,21 +233,191 @@ class Posts(db.Model): # type: ignore
             "type": self.post_type.value,
             "category": self.post_category.to_dict(),
             "view_count": self.view_count,
-            "poster": self.user.to_dict(),
+            "poster": self.user.to_dict(use_cache=use_cache) if self.user else None,
             "created_at": self.created_at,
             "hashtags": [tag.hashtag.to_dict()["name"] for tag in post_hashtags_relationship],
             "media": [media.to_dict() for media in media_relationship],
-            "reactions": [reaction.to_dict(exclude_fields=["post_id"]) for reaction in reactions_relationship],
+            "reactions": [{"type": reaction_type, "count": reaction_counts.get(reaction_type, 0)} for reaction_type in PostReactionTypes.names()],
         }
         
         # Check if user_id is provided, to fetch their reaction
         if user_id:
-            user_reaction = next((reaction for reaction in post_reactions_relationship if reaction.user_id == user_id), None)
-            data["user_reacted"] = bool(user_reaction)  # True if user has reacted, False otherwise
-            data["user_reaction_type"] = user_reaction.post_reaction_type if user_reaction else None
+            if viewer_reactions is None:
+                from app.models import PostReactions
+                viewer_reactions = PostReactions.load_viewer_reactions(user_id, [self.post_id])
+            user_reaction_type = viewer_reactions.get(self.post_id)
+            data["user_reacted"] = user_reaction_type is not None  # True if user has reacted, False otherwise
+            data["user_reaction_type"] = user_reaction_type
 
         # Remove excluded fields from the dictionary
         for field in exclude_fields:
             data.pop(field.value, None)
         
         return data
+
+    def reaction_counts(self) -> Dict[str, int]:
+        """Returns the post's non-zero reaction counts by reaction type.
+
+        Read from `reaction_summary` when `REACTION_SUMMARY_ENABLED` is set and the summary
+        is known, otherwise from the sparse `post_reaction_counts` rows, plus any deltas
+        still pending in counter shards.
+
+        Returns:
+            Dict[str, int]: The counts. Reaction types without reactions are absent.
+        """
+        from app.models import PostReactionCounts
+        from app.utils.counters import get_sharded_counters
+
+        if self.reaction_summary is not None and _reaction_summary_enabled():
+            counts = dict(self.reaction_summary)
+        else:
+            counts = {reaction.post_reaction_type: reaction.reaction_count for reaction in self.reactions}
+
+        sharded_counters = get_sharded_counters()
+        pending = sharded_counters.pending_group(PostReactionCounts.reaction_count, self.post_id) if sharded_counters is not None else {}
+        if pending:
+            for reaction_type, delta in pending.items():
+                counts[reaction_type] = max(counts.get(reaction_type, 0) + delta, 0)
+            counts = {reaction_type: count for reaction_type, count in counts.items() if count}
+        return counts
+
+    @classmethod
+    def mark_reaction_summary_stale(cls, post_id: str) -> None:
+        """Schedules a refresh of a post's `reaction_summary` for when the current session commits.
+
+        Does nothing unless `REACTION_SUMMARY_ENABLED` is set. The refresh runs outside the
+        request, since locking the post or its other count rows here would deadlock with
+        concurrent reactions to the same post.
+
+        Args:
+            post_id (str): The post whose reaction count rows changed.
+        """
+        if _reaction_summary_enabled():
+            db.session.info.setdefault(REACTION_SUMMARY_STALE_KEY, set()).add(post_id)
+
+    @classmethod
+    def refresh_reaction_summary(cls, post_id: str) -> None:
+        """Recomputes a post's `reaction_summary` from its reaction count rows.
+
+        The post row is locked before the count rows are read, so concurrent refreshes
+        of the same post run one after the other and the last one sees every count. The
+        count rows themselves are not locked. Call it at the start of a transaction: the
+        count rows are then read from a snapshot taken after the lock was granted. Does
+        not commit.
+
+        Args:
+            post_id (str): The post.
+        """
+        from sqlalchemy import select, update
+        from app.models import PostReactionCounts
+
+        if db.session.execute(select(cls.post_id).where(cls.post_id == post_id).with_for_update()).first() is None:
+            return
+        rows = db.session.execute(
+            select(PostReactionCounts.post_reaction_type, PostReactionCounts.reaction_count)
+            .where(PostReactionCounts.post_id == post_id, PostReactionCounts.reaction_count > 0)
+        )
+        summary = {reaction_type: reaction_count for reaction_type, reaction_count in rows}
+        db.session.execute(
+            update(cls.__table__).where(cls.__table__.c.post_id == post_id).values(reaction_summary=summary)
+        )
+
+    @classmethod
+    def to_dict_loader_options(cls) -> list:
+        """Returns the loader options that load everything `to_dict()` reads.
+
+        Many-to-one and one-to-one relationships (category, poster and the poster's stats
+        and active accessories) are joined into the main query; collections (hashtags,
+        media and, unless `reaction_summary` is read instead, reaction counts) are loaded with
+        one `SELECT ... IN` per collection.
+        Together with `PostReactions.load_viewer_reactions` for the viewer's reactions,
+        a page of posts is serialized with a fixed number of queries, however many
+        posts it holds.
+
+        Returns:
+            list: Options for `Query.options()`.
+        """
+        from sqlalchemy.orm import joinedload, selectinload
+        from app.models import Users, UserProfileAccessories, OwnedAccessories, PostHashTags
+
+        poster = joinedload(cls.user)
+        active_accessories = poster.joinedload(Users.active_profile_accessories)
+        options = [
+            joinedload(cls.post_category),
+            poster.joinedload(Users.stats),
+            selectinload(cls.post_hashtags).joinedload(PostHashTags.hashtag),
+            selectinload(cls.media),
+        ]
+        if not _reaction_summary_enabled():
+            options.append(selectinload(cls.reactions))
+        for accessory in (
+            UserProfileAccessories.active_banner,
+            UserProfileAccessories.active_profile_picture_border,
+            UserProfileAccessories.active_badge,
+        ):
+            options.append(active_accessories.joinedload(accessory).joinedload(OwnedAccessories.profile_accessory))
+        return options
+
+    @classmethod
+    def version_stamp(cls, post_id: str, user_id: Optional[str] = None) -> Optional[tuple]:
+        """Returns a version stamp of the post's `to_dict(user_id)` representation.
+
+        Reads only the columns the representation is built from without loading ORM
+        objects: the post and its category, the poster's stamp and, in one UNION ALL,
+        the hashtags, media, reaction counts and the viewer's reaction.
+
+        `view_count` is left out: every GET counts a view, so the stamp would change with
+        every counter flush and a client revalidating its copy would never get a 304. A
+        copy validated with a 304 may therefore show an older view count.
+
+        Args:
+            post_id (str): The unique identifier of the post.
+            user_id (str, optional): The private identifier of the viewing user.
+
+        Returns:
+            Optional[tuple]: The stamp, or None if the post does not exist or was deleted.
+        """
+        from sqlalchemy import cast, literal, select, union_all
+        from app.models import Users, PostCategories, PostHashTags, HashTags, PostMedia, PostReactionCounts, PostReactions
+        from app.utils.counters import get_sharded_counters
+
+        post = (
+            db.session.query(
+                cls.post_id, cls.post_caption, cls.post_type, cls.created_at, cls.user_id, cls.reaction_summary,
+                PostCategories.post_category_id, PostCategories.post_category_name, PostCategories.post_category_description,
+            )
+            .join(PostCategories, PostCategories.post_category_id == cls.post_category_id)
+            .filter(cls.post_id == post_id, cls.deleted_at.is_(None))
+            .first()
+        )
+        if post is None:
+            return None
+
+        def as_text(column):
+            return cast(column, String)
+
+        empty = literal(None, String)
+        parts = [
+            select(literal("hashtag"), HashTags.hashtag_name, empty, empty, empty, empty)
+            .join(PostHashTags, PostHashTags.hashtag_id == HashTags.hashtag_id)
+            .where(PostHashTags.post_id == post_id),
+            select(
+                literal("media"), PostMedia.post_media_id, PostMedia.media_url,
+                as_text(PostMedia.media_size_bytes), as_text(PostMedia.media_order), as_text(PostMedia.created_at),
+            ).where(PostMedia.post_id == post_id),
+            select(literal("reaction"), PostReactionCounts.post_reaction_type, as_text(PostReactionCounts.reaction_count), empty, empty, empty)
+            .where(PostReactionCounts.post_id == post_id),
+        ]
+        if user_id:
+            parts.append(
+                select(literal("viewer"), PostReactions.post_reaction_type, empty, empty, empty, empty)
+                .where(PostReactions.post_id == post_id, PostReactions.user_id == user_id)
+            )
+        children = sorted(tuple("" if value is None else value for value in row) for row in db.session.execute(union_all(*parts)))
+        sharded_counters = get_sharded_counters()
+        if sharded_counters is not None:
+            pending = sharded_counters.pending_group(PostReactionCounts.reaction_count, post_id)
+            children.extend(("pending", reaction_type, str(delta), "", "", "") for reaction_type, delta in sorted(pending.items()))
+
+        poster = Users.version_stamp(private_user_id=post.user_id) if post.user_id else None
+        return tuple(post), poster, tuple(children)
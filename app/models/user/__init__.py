@@ -5,4 +5,5 @@ from app.models.user.user_groups import UserGroups
 from app.models.user.blocked_users import BlockedUsers
 from app.models.user.user_profile_accessories import UserProfileAccessories
 from app.models.user.owned_accessories import OwnedAccessories
-from app.models.user.user_public_ids import UserPublicId
\ No newline at end of file
+from app.models.user.user_public_ids import UserPublicId
+from app.models.user.timeline_entries import TimelineEntries
\ No newline at end of file
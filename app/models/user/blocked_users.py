@@ -1,6 +1,8 @@
 from enum import Enum
 from app import db
 from datetime import datetime
+from typing import Any
+from sqlalchemy import and_, exists, or_
 from sqlalchemy.orm import validates
 from app.utils.id_generation import generate_uuid
 from app.utils.validation import valid_uuid, valid_datetime
@@ -46,6 +48,13 @@ class BlockedUsers(db.Model): # type: ignore
     """
     # TABLE NAME
     __tablename__: str = "blocked_users"
+    __table_args__ = (
+        # Keyset pagination of a user's block list, newest first
+        db.Index("idx_blocked_users_blocker_blocked_at", "blocker_id", "blocked_at", "blocked_users_id"),
+        # Has either user blocked the other? Probed in both directions by the home feed
+        db.Index("idx_blocked_users_blocker_blocked", "blocker_id", "blocked_id"),
+        db.Index("idx_blocked_users_blocked_blocker", "blocked_id", "blocker_id"),
+    )
 
     # COLUMNS
     blocked_users_id: str = db.Column(db.String(BLOCKED_USERS_ID_LENGTH), primary_key=True, default=generate_uuid)
@@ -88,6 +97,25 @@ class BlockedUsers(db.Model): # type: ignore
     #endregion VALIDATION
 
     # METHODS
+    @classmethod
+    def either_way(cls, user_id: str, other_user_id: Any):
+        """Builds an EXISTS clause that is true when either user has blocked the other.
+
+        Each direction is answered from its own composite index, so the clause is cheap
+        to evaluate once per row of a larger query.
+
+        Args:
+            user_id (str): The private ID of one user.
+            other_user_id (Any): The private ID of the other user, or a column holding it, e.g. `Posts.user_id`.
+
+        Returns:
+            Exists: The clause, to be used in a filter.
+        """
+        return exists().where(or_(
+            and_(cls.blocker_id == user_id, cls.blocked_id == other_user_id),
+            and_(cls.blocker_id == other_user_id, cls.blocked_id == user_id),
+        ))
+
     def __repr__(self):
         return f"<BlockedUsers {self.blocked_users_id}>"
     
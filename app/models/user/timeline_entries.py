@@ -0,0 +1,108 @@
+from app import db
+from enum import Enum
+from datetime import datetime
+from typing import Dict, List
+from sqlalchemy import DateTime, String, insert, select, tuple_
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from app.types.length import (
+    USER_PRIVATE_ID_LENGTH,
+    POST_ID_LENGTH
+)
+
+class TimelineEntries(db.Model): # type: ignore
+    """Represents a post delivered to a user's materialized home timeline.
+
+    When timelines are enabled, a new post is fanned out in the background to one row
+    per follower of its author, so reading a home feed is a range scan of the reader's
+    entries instead of a merge over everyone they follow. Authors with more followers
+    than `TIMELINE_CELEBRITY_THRESHOLD` are not fanned out; their posts are merged in at
+    read time. See `app.services.feed.timeline`.
+
+    The table has no foreign keys: entries are removed asynchronously after their post
+    is deleted, the follow ends or a block is made, and readers join `posts`, so an
+    entry whose post is gone is never shown.
+
+    Attributes:
+        user_id (str): The private ID of the user whose timeline holds the entry. Part of the primary key.
+        post_id (str): The delivered post. Part of the primary key.
+        author_id (str): The private ID of the post's author, for removing an author's posts from a timeline.
+        created_at (datetime): A copy of the post's `created_at`, the timeline's ordering key.
+
+    Returns:
+        None
+    """
+    # TABLE NAME
+    __tablename__: str = "timeline_entries"
+    __table_args__ = (
+        # A user's timeline, newest first
+        db.Index("idx_timeline_entries_user_created_at", "user_id", "created_at", "post_id"),
+        # Removal of a deleted post, and of an author's posts from a timeline
+        db.Index("idx_timeline_entries_post_id", "post_id"),
+        db.Index("idx_timeline_entries_user_author", "user_id", "author_id"),
+    )
+
+    # COLUMNS
+    user_id: str = db.Column(String(USER_PRIVATE_ID_LENGTH), primary_key=True)
+    post_id: str = db.Column(String(POST_ID_LENGTH), primary_key=True)
+    author_id: str = db.Column(String(USER_PRIVATE_ID_LENGTH), nullable=False)
+    created_at: datetime = db.Column(DateTime, nullable=False)
+
+    # METHODS
+    @classmethod
+    def add_many(cls, rows: List[Dict[str, object]]) -> None:
+        """Inserts timeline entries, skipping those that already exist.
+
+        Fan-out, backfill and retries may deliver the same post to a timeline more than
+        once, so rows that already exist are ignored with one statement per dialect.
+        The caller commits.
+
+        Args:
+            rows (List[Dict[str, object]]): The entries, with `user_id`, `post_id`, `author_id` and `created_at`.
+        """
+        if not rows:
+            return
+        dialect = db.session.get_bind(clause=cls.__table__).dialect.name
+        if dialect in ("mysql", "mariadb"):
+            statement = mysql.insert(cls.__table__)
+            db.session.execute(statement.on_duplicate_key_update(created_at=statement.inserted.created_at), rows)
+        elif dialect in ("sqlite", "postgresql"):
+            dialect_insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+            db.session.execute(dialect_insert(cls.__table__).on_conflict_do_nothing(index_elements=["user_id", "post_id"]), rows)
+        else:
+            existing = set(db.session.execute(
+                select(cls.user_id, cls.post_id).where(tuple_(cls.user_id, cls.post_id).in_([(row["user_id"], row["post_id"]) for row in rows]))
+            ).all())
+            missing = [row for row in rows if (row["user_id"], row["post_id"]) not in existing]
+            if missing:
+                db.session.execute(insert(cls.__table__), missing)
+
+    def __repr__(self):
+        return f"<TIMELINE_ENTRY {self.user_id} {self.post_id}>"
+
+    class DictKeys(Enum):
+        """Defines keys for the dictionary representation of the TimelineEntries model."""
+        USER_ID = "user_id"
+        POST_ID = "post_id"
+        AUTHOR_ID = "author_id"
+        CREATED_AT = "created_at"
+
+    def to_dict(self, exclude_fields: list[DictKeys] = []) -> dict:
+        """Converts the TimelineEntries instance into a dictionary representation.
+
+        Args:
+            exclude_fields (list): A list of fields to exclude from the dictionary representation.
+
+        Returns:
+            dict: A dictionary representation of the TimelineEntries instance.
+        """
+        data: dict = {
+            "user_id": self.user_id,
+            "post_id": self.post_id,
+            "author_id": self.author_id,
+            "created_at": self.created_at
+        }
+
+        for field in exclude_fields:
+            data.pop(field.value, None)
+
+        return data
@@ -45,6 +45,13 @@ class UserFollowers(db.Model): # type: ignore
     """
     # TABLE NAME
     __tablename__: str = "user_followers"
+    __table_args__ = (
+        # Keyset pagination of a user's followers and followees, newest first
+        db.Index("idx_user_followers_followee_followed_at", "followee_user_id", "followed_at", "follow_id"),
+        db.Index("idx_user_followers_follower_followed_at", "follower_user_id", "followed_at", "follow_id"),
+        # Does the viewer follow this author? Probed per post by the home feed
+        db.Index("idx_user_followers_follower_followee", "follower_user_id", "followee_user_id"),
+    )
 
     # COLUMNS
     follow_id: str = db.Column(db.String(FOLLOWER_ID_LENGTH), primary_key=True, default=generate_uuid)
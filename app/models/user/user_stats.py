@@ -1,4 +1,6 @@
 from enum import Enum
+from datetime import datetime
+from typing import Optional
 from app import db
 from sqlalchemy.orm import validates
 from app.utils.validation import valid_integer
@@ -18,6 +20,9 @@ class UserStats(db.Model): # type: ignore
         follower_count (int): The number of followers for the user, which cannot be null.
         following_count (int): The number of users that the user is following, which cannot be null.
         post_count (int): The number of posts created by the user, which cannot be null.
+        celebrity_since (datetime, optional): When the user first posted while they had too many followers for
+            their posts to be fanned out to timelines. Their posts that were not fanned out are merged into
+            their followers' feeds at read time, even after they drop below the threshold. Null if never.
     
     Relationships:
         user (Users): A relationship to the Users model, indicating the user associated with the statistics.
@@ -30,6 +35,7 @@ class UserStats(db.Model): # type: ignore
     follower_count: int = db.Column(db.Integer, nullable=False)
     following_count: int = db.Column(db.Integer, nullable=False)
     post_count: int = db.Column(db.Integer, nullable=False)
+    celebrity_since: Optional[datetime] = db.Column(db.DateTime, nullable=True)
 
     # Define relationship to Users model
     user = db.relationship("Users", back_populates="stats")
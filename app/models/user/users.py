@@ -118,6 +118,9 @@ class Users(db.Model): # type: ignore
         user_type (UserType): The type of user (e.g., user, admin, moderator), which cannot be null and defaults to 'user'.
         birthdate (date, optional): The birthdate of the user, which can be null.
         created_at (datetime): The timestamp when the user account was created. Defaults to the current time.
+        token_generation (int): Embedded in the user's tokens; incrementing it revokes every token issued before.
+        deleted_at (datetime, optional): When the user was deleted. A deleted user cannot log in and is hidden
+            at once, and is removed with everything cascading from it by the `users.delete` job. Null for live users.
 
     Relationships:
         stats (UserStats): A relationship to the UserStats model, indicating the user's statistics.
@@ -150,6 +153,8 @@ class Users(db.Model): # type: ignore
     user_type: UserType = db.Column(SQLAlchemyEnum(UserType), nullable=False, default=UserType.USER)
     birthdate: date = db.Column(db.Date, nullable=True, default=None)
     created_at: datetime = db.Column(db.DateTime, nullable=False, default=datetime.now)
+    token_generation: int = db.Column(db.Integer, nullable=False, default=0)
+    deleted_at: Optional[datetime] = db.Column(db.DateTime, nullable=True)
 
     # Define relationship to UserStats model
     stats = db.relationship("UserStats", uselist=False, back_populates="user", cascade="all, delete-orphan")
@@ -317,18 +322,56 @@ class Users(db.Model): # type: ignore
         ACTIVE_ACCESSORIES = "active_accessories"
 
 
-    def to_dict(self, exclude_fields: list[DictKeys] = []):
+    def to_dict(self, exclude_fields: list[DictKeys] = [], use_cache: bool = True):
         """Converts the Users instance into a dictionary representation.
 
         This method converts the Users instance into a dictionary representation,
         allowing for exclusion of specified fields.
 
+        Rendered summaries are served from the in-process user cache when it is enabled,
+        which skips loading the user's stats and active accessories. Nested values are
+        shared with the cache and must not be modified. Other workers' changes do not
+        invalidate this worker's cache, so pass `use_cache=False` when the response is
+        validated by a freshly read `version_stamp`.
+
         Args:
             exclude_fields (list): A list of fields to exclude from the dictionary representation.
+            use_cache (bool): Whether to read and fill the in-process user cache.
 
         Returns:
             dict: A dictionary representation of the Users instance.
         """
+        from sqlalchemy import inspect
+        from app.utils.cache import get_user_cache
+
+        cache = get_user_cache() if use_cache else None
+        # Unflushed changes may still be rolled back, so never cache them
+        cacheable = cache is not None and inspect(self).persistent and not inspect(self).modified
+        data = cache.get(self.private_user_id) if cacheable else None
+        if data is None:
+            data = self._render_dict()
+            if cacheable:
+                cache.set(self.private_user_id, data)
+
+        data = dict(data)
+        self._apply_sharded_counts(data)
+        for field in exclude_fields:
+            data.pop(field.value, None)
+        
+        return data
+
+    def _apply_sharded_counts(self, data: dict) -> None:
+        """Adds follower count deltas still pending in counter shards to a rendered summary."""
+        from app.models import UserStats
+        from app.utils.counters import sharded_delta
+
+        delta = sharded_delta(UserStats.follower_count, self.private_user_id)
+        stats = data.get("stats")
+        if delta and stats and "follower_count" in stats:
+            data["stats"] = {**stats, "follower_count": max(stats["follower_count"] + delta, 0)}
+
+    def _render_dict(self) -> dict:
+        """Builds the full dictionary representation of the user, bypassing the cache."""
         from app.models import UserStats, UserProfileAccessories
 
         upa_dict_keys = UserProfileAccessories.DictKeys
@@ -352,7 +395,61 @@ class Users(db.Model): # type: ignore
             "active_accessories": self.active_profile_accessories.to_dict(exclude_fields=[upa_dict_keys.USER_ID])
         }
 
-        for field in exclude_fields:
-            data.pop(field.value, None)
-        
         return data
+
+    @classmethod
+    def version_stamp(cls, public_user_id: Optional[str] = None, private_user_id: Optional[str] = None) -> Optional[tuple]:
+        """Returns a version stamp of the user's `to_dict()` representation.
+
+        Reads only the columns the representation is built from (the user, their stats
+        and active profile accessories) in a single query without loading ORM objects,
+        so it is cheap enough to back an ETag. Pending follower count shards are included.
+
+        Args:
+            public_user_id (str, optional): The public identifier of the user.
+            private_user_id (str, optional): The private identifier of the user.
+
+        Returns:
+            Optional[tuple]: The stamp, or None if the user does not exist or was deleted.
+        """
+        from sqlalchemy.orm import aliased
+        from app.models import UserStats, UserProfileAccessories, OwnedAccessories, ProfileAccessories
+        from app.utils.counters import sharded_delta
+
+        columns = [
+            cls.public_user_id, cls.username, cls.email, cls.friend_code, cls.profile_picture_url,
+            cls.gender, cls.country, cls.orientation, cls.biography, cls.user_type, cls.birthdate, cls.created_at,
+            UserStats.follower_count, UserStats.following_count, UserStats.post_count, cls.private_user_id,
+        ]
+        joins = []
+        for active_id in (
+            UserProfileAccessories.active_banner_id,
+            UserProfileAccessories.active_profile_picture_border_id,
+            UserProfileAccessories.active_badge_id,
+        ):
+            owned = aliased(OwnedAccessories)
+            accessory = aliased(ProfileAccessories)
+            columns += [owned.owned_accessory_id, owned.created_at]
+            columns += [getattr(accessory, column.key) for column in ProfileAccessories.__table__.columns]
+            joins.append((owned, owned.owned_accessory_id == active_id))
+            joins.append((accessory, accessory.accessory_id == owned.accessory_id))
+
+        query = (
+            db.session.query(*columns)
+            .select_from(cls)
+            .outerjoin(UserStats, UserStats.user_id == cls.private_user_id)
+            .outerjoin(UserProfileAccessories, UserProfileAccessories.user_id == cls.private_user_id)
+        )
+        for target, onclause in joins:
+            query = query.outerjoin(target, onclause)
+
+        query = query.filter(cls.deleted_at.is_(None))
+        if private_user_id is not None:
+            query = query.filter(cls.private_user_id == private_user_id)
+        else:
+            query = query.filter(cls.public_user_id == public_user_id)
+
+        row = query.first()
+        if row is None:
+            return None
+        return tuple(row) + (sharded_delta(UserStats.follower_count, row.private_user_id),)
@@ -1,5 +1,5 @@
 import os
-from typing import Tuple
+from typing import Any, Dict, Optional, Tuple
 from config import Config
 from functools import wraps
 from app.services.jwt import jwt
@@ -7,9 +7,11 @@ from app.types.enum import UserType
 from flask_jwt_extended import get_jwt
 from app.services.auth.login import login
 from app.services.auth.logout import logout
+from app.services.auth.logout_all import logout_all
 from flask import Response, request, jsonify
 from app.services.auth.refresh_token import refresh_token
 from app.services.auth.is_token_in_blocklist import is_token_in_blocklist
+from app.services.auth.token_generation import is_token_generation_revoked
 
 # JWT TOKEN IN BLOCKLIST LOADER
 @jwt.token_in_blocklist_loader
@@ -21,7 +23,8 @@ def check_if_token_in_blocklist_service(jwt_header, jwt_payload):
     """
     Checks if a token is in the blocklist.
 
-    This function checks if a token is in the blocklist.
+    This function checks if a token was revoked, either by its user logging out of
+    every session since it was issued or by being added to the blocklist.
 
     Args:
         jwt_header (Dict[str, str]): The JWT header.
@@ -30,7 +33,7 @@ def check_if_token_in_blocklist_service(jwt_header, jwt_payload):
     Returns:
         bool: True if the token is in the blocklist, False otherwise.
     """
-    return is_token_in_blocklist(jwt_payload["jti"])
+    return is_token_generation_revoked(jwt_payload) or is_token_in_blocklist(jwt_payload["jti"])
 
 # ----------------- API KEY REQUIRED ----------------- #
 def api_key_required(f):
@@ -96,7 +99,7 @@ def login_service(login_data: dict) -> Tuple[Response, int]:
     return login(login_data)
 
 # ----------------- LOGOUT USER ----------------- #
-def logout_service(jti: str) -> Tuple[Response, int]:
+def logout_service(jti: str, expires: Optional[int] = None) -> Tuple[Response, int]:
     """
     Logs out a user.
 
@@ -104,16 +107,35 @@ def logout_service(jti: str) -> Tuple[Response, int]:
 
     Args:
         jti (str): The JWT ID of the token to be added to the blocklist.
+        expires (int, optional): The token's `exp` claim, after which the record can be purged.
 
     Returns:
         Tuple[Response, int]: A tuple containing the Flask response object and an HTTP status code.
             - If the logout is successful, returns a JSON response with a message and a 200 status code.
             - If an error occurs during the logout process, returns a JSON response with an error message and a 500 status code
     """
-    return logout(jti)
+    return logout(jti, expires)
+
+# ----------------- LOGOUT USER EVERYWHERE ----------------- #
+def logout_all_service(private_user_id: str) -> Tuple[Response, int]:
+    """
+    Logs a user out of every session.
+
+    This function increments the user's token generation, revoking every token issued to the user.
+
+    Args:
+        private_user_id (str): The private ID of the user.
+
+    Returns:
+        Tuple[Response, int]: A tuple containing the Flask response object and an HTTP status code.
+            - If the logout is successful, returns a JSON response with a message and a 200 status code.
+            - If the user is not found, returns a JSON response with an error message and a 404 status code.
+            - If an error occurs during the logout process, returns a JSON response with an error message and a 500 status code
+    """
+    return logout_all(private_user_id)
 
 # ----------------- REFRESH TOKEN ----------------- #
-def refresh_token_service(identity: str) -> Tuple[Response, int]:
+def refresh_token_service(identity: str, refresh_claims: Optional[Dict[str, Any]] = None) -> Tuple[Response, int]:
     """
     Refreshes the user's access token.
 
@@ -121,13 +143,14 @@ def refresh_token_service(identity: str) -> Tuple[Response, int]:
 
     Args:
         identity (str): The user's private user ID.
+        refresh_claims (Dict[str, Any], optional): The claims of the refresh token.
 
     Returns:
         Tuple[Response, int]: A tuple containing the Flask response object and an HTTP status code.
             - If the refresh is successful, returns a JSON response with a new access token and a 200 status code.
             - If an error occurs during the refresh process, returns a JSON response with an error message and a 500 status code
     """
-    return refresh_token(identity)
+    return refresh_token(identity, refresh_claims)
 
 
 
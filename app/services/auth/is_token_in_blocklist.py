@@ -2,12 +2,30 @@ def is_token_in_blocklist(jti: str) -> bool:
     """
     Check if the token is in the blocklist
 
+    The check is answered from the worker's cache of revoked tokens when it is enabled,
+    and from the database otherwise, or when the cache's Bloom filter cannot rule it out.
+
     Args:
         jti (str): The JWT ID of the token to check
 
     Returns:
         bool: True if the token is in the blocklist, False otherwise
     """
+    from app import db
+    from sqlalchemy import select
     from app.models import JWTTokenBlocklist
-    token = JWTTokenBlocklist.query.filter_by(jti=jti).first()
-    return token is not None
\ No newline at end of file
+    from app.utils.db_routing import use_primary
+    from app.services.auth.token_blocklist import get_token_blocklist, BLOCKLIST_LOOKUPS
+
+    cache = get_token_blocklist()
+    if cache is not None:
+        revoked = cache.is_revoked(jti)
+        if revoked is not None:
+            BLOCKLIST_LOOKUPS.inc(source="cache")
+            return revoked
+
+    # Revocations must take effect immediately, so never read them from a lagging replica
+    with use_primary():
+        token = db.session.execute(select(JWTTokenBlocklist.jti).where(JWTTokenBlocklist.jti == jti)).first()
+    BLOCKLIST_LOOKUPS.inc(source="database")
+    return token is not None
@@ -3,6 +3,7 @@ from config import Config
 from typing import Dict, Tuple
 from flask import Response, jsonify
 from app.models import Users
+from app.services.auth.token_generation import token_generation_claims
 from werkzeug.security import check_password_hash
 from app.utils.validation import validate_required_fields
 from flask_jwt_extended import JWTManager, create_access_token, create_refresh_token, jwt_required, get_jwt_identity
@@ -39,7 +40,7 @@ def login(login_data: Dict[str, str]) -> Tuple[Response, int]:
             return validation_message, status_code
         
         # Check if the user exists
-        user = Users.query.filter_by(email=login_data["email"]).first()
+        user = Users.query.filter_by(email=login_data["email"], deleted_at=None).first()
         if not user:
             return jsonify({"message": "Incorrect email or password."}), 401
         
@@ -48,7 +49,7 @@ def login(login_data: Dict[str, str]) -> Tuple[Response, int]:
             return jsonify({"message": "Incorrect email or password."}), 401 
         
         # Generate a JWT token
-        additional_claims = {"role": user.user_type.value}
+        additional_claims = {"role": user.user_type.value, **token_generation_claims(user)}
         access_token = create_access_token(identity=user.private_user_id, additional_claims=additional_claims)
         refresh_token = create_refresh_token(identity=user.private_user_id, additional_claims=additional_claims)
 
@@ -1,10 +1,13 @@
 from app import db
-from typing import Tuple
+from typing import Optional, Tuple
+from datetime import datetime
 from flask import Response, jsonify
+from sqlalchemy.exc import IntegrityError
 from app.models import JWTTokenBlocklist
+from app.services.auth.token_blocklist import get_token_blocklist
 
 
-def logout(jti: str) -> Tuple[Response, int]:
+def logout(jti: str, expires: Optional[int] = None) -> Tuple[Response, int]:
     """
     Logs out a user.
 
@@ -12,18 +15,28 @@ def logout(jti: str) -> Tuple[Response, int]:
 
     Args:
         jti (str): The JWT ID of the token to be added to the blocklist.
+        expires (int, optional): The token's `exp` claim, after which the record can be purged.
 
     Returns:
         Tuple[Response, int]: A tuple containing the Flask response object and an HTTP status code.
             - If the logout is successful, returns a JSON response with a message and a 200 status code.
             - If an error occurs during the logout process, returns a JSON response with an error message and a 500 status code
     """
+    expires_at = datetime.fromtimestamp(expires) if expires is not None else None
     try:
         # Add the JTI to the blocklist
-        token = JWTTokenBlocklist(jti=jti)
+        token = JWTTokenBlocklist(jti=jti, expires_at=expires_at)
         db.session.add(token)
         db.session.commit()
-
-        return jsonify({"message": "Successfully logged out"}), 200
+    except IntegrityError:
+        # A concurrent logout with the same token already revoked it
+        db.session.rollback()
     except Exception as e:
-        return jsonify({"message": str(e)}), 500
\ No newline at end of file
+        db.session.rollback()
+        return jsonify({"message": str(e)}), 500
+
+    # Reject the token in this worker at once; other workers see it on their next poll
+    cache = get_token_blocklist()
+    if cache is not None:
+        cache.add(jti, expires_at)
+    return jsonify({"message": "Successfully logged out"}), 200
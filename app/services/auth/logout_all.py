@@ -0,0 +1,35 @@
+from app import db
+from typing import Tuple
+from flask import Response, jsonify
+from app.models import Users
+from app.services.auth.token_generation import forget_token_generation
+from app.utils.counters import increment_counter
+
+
+def logout_all(private_user_id: str) -> Tuple[Response, int]:
+    """
+    Logs a user out of every session.
+
+    This function increments the user's token generation, which revokes every access
+    and refresh token issued to the user so far without adding them to the blocklist.
+    Other workers reject the tokens once their cached generation expires.
+
+    Args:
+        private_user_id (str): The private ID of the user.
+
+    Returns:
+        Tuple[Response, int]: A tuple containing the Flask response object and an HTTP status code.
+            - If the logout is successful, returns a JSON response with a message and a 200 status code.
+            - If the user is not found, returns a JSON response with an error message and a 404 status code.
+            - If an error occurs during the logout process, returns a JSON response with an error message and a 500 status code
+    """
+    try:
+        if not increment_counter(Users.token_generation, Users.private_user_id == private_user_id):
+            return jsonify({"message": "User not found"}), 404
+        db.session.commit()
+
+        forget_token_generation(private_user_id)
+        return jsonify({"message": "Successfully logged out of all sessions"}), 200
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"message": str(e)}), 500
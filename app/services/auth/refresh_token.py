@@ -1,17 +1,20 @@
 import datetime
-from typing import Tuple
+from typing import Any, Dict, Optional, Tuple
 from flask import Response, jsonify
 from flask_jwt_extended import create_access_token
+from app.services.auth.token_generation import TOKEN_GENERATION_CLAIM
 
 
-def refresh_token(identity: str) -> Tuple[Response, int]:
+def refresh_token(identity: str, refresh_claims: Optional[Dict[str, Any]] = None) -> Tuple[Response, int]:
     """
     Refreshes the user's access token.
 
-    This function generates a new access token for the user.
+    This function generates a new access token for the user, carrying over the role
+    and token generation of the refresh token, so it is revoked together with it.
 
     Args:
         identity (str): The user's private user ID.
+        refresh_claims (Dict[str, Any], optional): The claims of the refresh token.
 
     Returns:
         Tuple[Response, int]: A tuple containing the Flask response object and an HTTP status code.
@@ -19,7 +22,12 @@ def refresh_token(identity: str) -> Tuple[Response, int]:
             - If an error occurs during the refresh process, returns a JSON response with an error message and a 500 status code
     """
     try:
-        access_token = create_access_token(identity=identity, expires_delta=datetime.timedelta(minutes=15))
+        additional_claims = {
+            claim: refresh_claims[claim]
+            for claim in ("role", TOKEN_GENERATION_CLAIM)
+            if refresh_claims and claim in refresh_claims
+        }
+        access_token = create_access_token(identity=identity, additional_claims=additional_claims, expires_delta=datetime.timedelta(minutes=15))
         return jsonify({"access_token": access_token}), 200
     except Exception as e:
-        return jsonify({"message": str(e)}), 500
\ No newline at end of file
+        return jsonify({"message": str(e)}), 500
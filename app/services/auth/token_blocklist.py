@@ -0,0 +1,274 @@
+import heapq
+import math
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from flask import Flask, current_app, has_app_context
+from sqlalchemy import delete, or_, select
+from app import db
+from app.models import JWTTokenBlocklist
+from app.utils.bloom_filter import BloomFilter
+from app.utils.db_routing import use_primary
+from app.utils.metrics import registry, register_gauge_callback
+
+BLOCKLIST_LOOKUPS = registry.counter(
+    "token_blocklist_lookups_total",
+    "Token revocation checks by where they were answered (cache or database).",
+    ("source",),
+)
+BLOCKLIST_REFRESHES = registry.counter(
+    "token_blocklist_refreshes_total",
+    "Revoked token cache refreshes by kind (reload or poll).",
+    ("kind",),
+)
+
+
+def _expiry(expires_at: Optional[datetime]) -> float:
+    # Records added before expiries were stored are kept until the cache reloads after they are purged
+    return expires_at.timestamp() if expires_at is not None else math.inf
+
+
+class TokenBlocklistCache:
+    """
+    This worker's copy of the revoked token IDs (JTIs), kept fresh by polling the blocklist.
+
+    The cache loads the records of unexpired tokens once, then every `poll_interval`
+    seconds reads the records added since its previous refresh, re-reading the last
+    `poll_overlap` seconds to catch records committed late or stamped by a worker with
+    a skewed clock. Revocations made by this worker are added at once; those made by
+    other workers are seen within `poll_interval` seconds. Tokens are dropped when they
+    expire, since an expired token is rejected before the blocklist is checked, and the
+    cache reloads in full every `reload_interval` seconds.
+
+    With `bloom_capacity` set, only a Bloom filter of the JTIs is kept: tokens it has
+    definitely not seen are answered from memory, and possible matches are checked in
+    the database. This bounds the memory used when many tokens are revoked, at the
+    cost of a query per revoked or falsely matched token. Expired tokens leave the
+    filter on its next reload.
+
+    Attributes:
+        poll_interval (float): Seconds between polls for new records.
+        poll_overlap (float): Seconds of older records re-read by every poll.
+        reload_interval (float): Seconds between full reloads.
+        bloom_capacity (int): JTIs the Bloom filter is sized for, or 0 to keep the exact set.
+        bloom_error_rate (float): Target false-positive rate of the Bloom filter.
+    """
+    def __init__(
+        self,
+        poll_interval: float = 5.0,
+        poll_overlap: float = 30.0,
+        reload_interval: float = 3600.0,
+        bloom_capacity: int = 0,
+        bloom_error_rate: float = 0.001,
+        clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.poll_interval = poll_interval
+        self.poll_overlap = poll_overlap
+        self.reload_interval = reload_interval
+        self.bloom_capacity = bloom_capacity
+        self.bloom_error_rate = bloom_error_rate
+        self._clock = clock
+        self._revoked: Dict[str, float] = {}
+        self._expiries: List[Tuple[float, str]] = []
+        self._bloom: Optional[BloomFilter] = None
+        self._loaded = False
+        self._polled_from: Optional[datetime] = None
+        self._next_poll = 0.0
+        self._next_reload = 0.0
+        # Guards the in-memory state; the refresh lock is held while querying the database
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._bloom) if self._bloom is not None else len(self._revoked)
+
+    def _add(self, jti: str, expiry: float) -> None:
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(jti)
+            elif jti not in self._revoked:
+                self._revoked[jti] = expiry
+                if expiry != math.inf:
+                    heapq.heappush(self._expiries, (expiry, jti))
+
+    def _prune(self) -> None:
+        now = time.time()
+        with self._lock:
+            while self._expiries and self._expiries[0][0] <= now:
+                _, jti = heapq.heappop(self._expiries)
+                self._revoked.pop(jti, None)
+
+    def add(self, jti: str, expires_at: Optional[datetime]) -> None:
+        """
+        Records a revocation committed by this worker without waiting for the next poll.
+
+        Args:
+            jti (str): The revoked token's JTI.
+            expires_at (Optional[datetime]): When the token expires.
+        """
+        self._add(jti, _expiry(expires_at))
+
+    def _read(self, since: Optional[datetime]) -> list:
+        query = select(JWTTokenBlocklist.jti, JWTTokenBlocklist.expires_at).where(
+            or_(JWTTokenBlocklist.expires_at.is_(None), JWTTokenBlocklist.expires_at > datetime.now())
+        )
+        if since is not None:
+            query = query.where(JWTTokenBlocklist.created_at >= since)
+        # Revocations must take effect, so never read them from a lagging replica
+        with use_primary():
+            return db.session.execute(query).all()
+
+    def _reload(self) -> None:
+        started = datetime.now()
+        rows = self._read(None)
+        if self.bloom_capacity > 0:
+            bloom = BloomFilter(max(self.bloom_capacity, 2 * len(rows)), self.bloom_error_rate)
+            for row in rows:
+                bloom.add(row.jti)
+            with self._lock:
+                self._bloom, self._revoked, self._expiries = bloom, {}, []
+        else:
+            revoked = {row.jti: _expiry(row.expires_at) for row in rows}
+            expiries = [(expiry, jti) for jti, expiry in revoked.items() if expiry != math.inf]
+            heapq.heapify(expiries)
+            with self._lock:
+                self._bloom, self._revoked, self._expiries = None, revoked, expiries
+        self._polled_from = started
+        BLOCKLIST_REFRESHES.inc(kind="reload")
+
+    def _poll(self) -> None:
+        started = datetime.now()
+        for row in self._read(self._polled_from - timedelta(seconds=self.poll_overlap)):
+            self._add(row.jti, _expiry(row.expires_at))
+        self._polled_from = started
+        self._prune()
+        BLOCKLIST_REFRESHES.inc(kind="poll")
+
+    def refresh(self) -> None:
+        """Loads the blocklist on first use, then polls or reloads it when due."""
+        if self._loaded and self._clock() < self._next_poll:
+            return
+        # One thread refreshes while the others answer from the current state; before the
+        # first load there is no state, so they wait for it
+        if not self._refresh_lock.acquire(blocking=not self._loaded):
+            return
+        try:
+            now = self._clock()
+            if not self._loaded or now >= self._next_reload:
+                self._reload()
+                self._loaded = True
+                self._next_reload = now + self.reload_interval
+            elif now >= self._next_poll:
+                self._poll()
+            self._next_poll = now + self.poll_interval
+        finally:
+            self._refresh_lock.release()
+
+    def is_revoked(self, jti: str) -> Optional[bool]:
+        """
+        Checks a JTI against the cached blocklist.
+
+        Args:
+            jti (str): The token's JTI.
+
+        Returns:
+            Optional[bool]: Whether the token is revoked, or None if the Bloom filter
+            possibly contains it and the database must be checked.
+        """
+        self.refresh()
+        if self._bloom is not None:
+            return False if jti not in self._bloom else None
+        return jti in self._revoked
+
+
+def get_token_blocklist() -> Optional[TokenBlocklistCache]:
+    """
+    Returns the current application's cache of revoked token IDs.
+
+    Returns:
+        Optional[TokenBlocklistCache]: The cache, or None outside an application context
+        or when `TOKEN_BLOCKLIST_CACHE_ENABLED` is off.
+    """
+    if not has_app_context():
+        return None
+    return current_app.extensions.get("token_blocklist")
+
+
+def _lifetime(value: Any) -> Optional[timedelta]:
+    if isinstance(value, timedelta):
+        return value
+    if isinstance(value, bool) or value is None:
+        return None
+    return timedelta(seconds=value)
+
+
+def purge_expired_tokens() -> int:
+    """
+    Deletes the blocklist records of tokens that have expired.
+
+    Records without an expiry are deleted once they are older than the longest token
+    lifetime (`JWT_ACCESS_TOKEN_EXPIRES` or `JWT_REFRESH_TOKEN_EXPIRES`), unless tokens
+    are configured never to expire.
+
+    Returns:
+        int: Number of records deleted.
+    """
+    now = datetime.now()
+    purged = db.session.execute(delete(JWTTokenBlocklist).where(JWTTokenBlocklist.expires_at < now)).rowcount
+
+    lifetimes = [
+        _lifetime(current_app.config.get(name, False))
+        for name in ("JWT_ACCESS_TOKEN_EXPIRES", "JWT_REFRESH_TOKEN_EXPIRES")
+    ]
+    if all(lifetime is not None for lifetime in lifetimes):
+        purged += db.session.execute(
+            delete(JWTTokenBlocklist).where(JWTTokenBlocklist.expires_at.is_(None), JWTTokenBlocklist.created_at < now - max(lifetimes))
+        ).rowcount
+    db.session.commit()
+    return purged
+
+
+def init_token_blocklist(app: Flask) -> None:
+    """
+    Enables the per-worker cache of revoked token IDs and registers the `flask auth` commands.
+
+    Configured with `TOKEN_BLOCKLIST_CACHE_ENABLED`, `TOKEN_BLOCKLIST_POLL_INTERVAL_SECONDS`,
+    `TOKEN_BLOCKLIST_POLL_OVERLAP_SECONDS`, `TOKEN_BLOCKLIST_RELOAD_INTERVAL_SECONDS`,
+    `TOKEN_BLOCKLIST_BLOOM_CAPACITY` and `TOKEN_BLOCKLIST_BLOOM_ERROR_RATE`.
+    Registers the `token_blocklist_cache_entries` gauge.
+
+    Args:
+        app (Flask): The application.
+    """
+    app.config.setdefault("TOKEN_BLOCKLIST_CACHE_ENABLED", True)
+    app.config.setdefault("TOKEN_BLOCKLIST_POLL_INTERVAL_SECONDS", 5.0)
+    app.config.setdefault("TOKEN_BLOCKLIST_POLL_OVERLAP_SECONDS", 30.0)
+    app.config.setdefault("TOKEN_BLOCKLIST_RELOAD_INTERVAL_SECONDS", 3600.0)
+    app.config.setdefault("TOKEN_BLOCKLIST_BLOOM_CAPACITY", 0)
+    app.config.setdefault("TOKEN_BLOCKLIST_BLOOM_ERROR_RATE", 0.001)
+
+    @app.cli.group("auth")
+    def auth_cli():
+        """Authentication commands."""
+
+    @auth_cli.command("purge-blocklist")
+    def purge_blocklist_command():
+        """Delete the blocklist records of tokens that have expired."""
+        print(f"Purged {purge_expired_tokens()} expired blocklist records.")
+
+    if not app.config["TOKEN_BLOCKLIST_CACHE_ENABLED"]:
+        return
+
+    cache = TokenBlocklistCache(
+        poll_interval=app.config["TOKEN_BLOCKLIST_POLL_INTERVAL_SECONDS"],
+        poll_overlap=app.config["TOKEN_BLOCKLIST_POLL_OVERLAP_SECONDS"],
+        reload_interval=app.config["TOKEN_BLOCKLIST_RELOAD_INTERVAL_SECONDS"],
+        bloom_capacity=app.config["TOKEN_BLOCKLIST_BLOOM_CAPACITY"],
+        bloom_error_rate=app.config["TOKEN_BLOCKLIST_BLOOM_ERROR_RATE"],
+    )
+    app.extensions["token_blocklist"] = cache
+
+    def collect_size():
+        yield {}, len(cache)
+    register_gauge_callback("token_blocklist_cache_entries", "Number of revoked token IDs in this worker's cache.", collect_size)
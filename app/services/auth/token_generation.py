@@ -0,0 +1,114 @@
+from typing import Any, Dict, Optional
+from flask import Flask, current_app, has_app_context
+from sqlalchemy import select
+from app import db
+from app.models import Users
+from app.utils.cache import TTLCache
+from app.utils.db_routing import use_primary
+from app.utils.metrics import register_gauge_callback
+
+# The claim holding the user's token generation at the time the token was issued
+TOKEN_GENERATION_CLAIM = "gen"
+
+
+def _token_generation_cache() -> Optional[TTLCache]:
+    if not has_app_context():
+        return None
+    return current_app.extensions.get("token_generation_cache")
+
+
+def get_token_generation(private_user_id: str) -> Optional[int]:
+    """
+    Returns a user's current token generation.
+
+    The value is cached per worker for `TOKEN_GENERATION_CACHE_TTL_SECONDS`, so tokens
+    revoked by a "log out everywhere" on another worker are rejected by this one once
+    its entry expires.
+
+    Args:
+        private_user_id (str): The private ID of the user.
+
+    Returns:
+        Optional[int]: The generation, or None if the user does not exist.
+    """
+    cache = _token_generation_cache()
+    if cache is not None:
+        generation = cache.get(private_user_id)
+        if generation is not None:
+            return generation
+
+    # Revocations must take effect, so never read them from a lagging replica
+    with use_primary():
+        generation = db.session.execute(
+            select(Users.token_generation).where(Users.private_user_id == private_user_id)
+        ).scalar()
+    if cache is not None and generation is not None:
+        cache.set(private_user_id, generation)
+    return generation
+
+
+def forget_token_generation(private_user_id: str) -> None:
+    """
+    Drops a user's cached token generation, e.g. after it was incremented by this worker.
+
+    Args:
+        private_user_id (str): The private ID of the user.
+    """
+    cache = _token_generation_cache()
+    if cache is not None:
+        cache.delete(private_user_id)
+
+
+def token_generation_claims(user: Users) -> Dict[str, Any]:
+    """
+    Returns the claims tying a new token to the user's current token generation.
+
+    Args:
+        user (Users): The user the token is issued to.
+
+    Returns:
+        Dict[str, Any]: Claims to add to the token.
+    """
+    return {TOKEN_GENERATION_CLAIM: user.token_generation}
+
+
+def is_token_generation_revoked(jwt_payload: Dict[str, Any]) -> bool:
+    """
+    Checks whether a token was issued before its user's last "log out everywhere".
+
+    Tokens issued before generations were embedded count as generation 0.
+
+    Args:
+        jwt_payload (Dict[str, Any]): The decoded token.
+
+    Returns:
+        bool: True if the token's generation is older than the user's.
+    """
+    generation = get_token_generation(jwt_payload[current_app.config.get("JWT_IDENTITY_CLAIM", "sub")])
+    if generation is None:
+        return False
+    return jwt_payload.get(TOKEN_GENERATION_CLAIM, 0) < generation
+
+
+def init_token_generations(app: Flask) -> None:
+    """
+    Enables the per-worker cache of user token generations checked on every authenticated request.
+
+    Configured with `TOKEN_GENERATION_CACHE_MAX_SIZE` and `TOKEN_GENERATION_CACHE_TTL_SECONDS`;
+    a TTL of 0 reads the generation from the database on every request.
+    Registers the `token_generation_cache_entries` gauge.
+
+    Args:
+        app (Flask): The application.
+    """
+    app.config.setdefault("TOKEN_GENERATION_CACHE_MAX_SIZE", 100000)
+    app.config.setdefault("TOKEN_GENERATION_CACHE_TTL_SECONDS", 30.0)
+    if app.config["TOKEN_GENERATION_CACHE_TTL_SECONDS"] <= 0:
+        return
+
+    cache = TTLCache(maxsize=app.config["TOKEN_GENERATION_CACHE_MAX_SIZE"], ttl=app.config["TOKEN_GENERATION_CACHE_TTL_SECONDS"])
+    app.extensions["token_generation_cache"] = cache
+
+    def collect_size():
+        yield {}, len(cache)
+    register_gauge_callback("token_generation_cache_entries", "Number of user token generations in this worker's cache.", collect_size)
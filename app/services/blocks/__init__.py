@@ -1,6 +1,6 @@
 from typing import Tuple
 from flask import Response
-from app.utils.io import get_pagination_params, get_filter_params, get_sort_params
+from app.utils.io import get_pagination_params, get_filter_params, get_sort_params, get_cursor_params
 from app.services.blocks.get_blocked_users import get_blocked_users
 from app.services.blocks.block_user import block_user
 from app.services.blocks.unblock_user import unblock_user
@@ -21,13 +21,15 @@ def get_blocked_users_service(private_user_id: str) -> Tuple[Response, int]:
     Returns:
         Tuple[Response, int]: A tuple containing the Flask response object and an HTTP status code.
             - If the user is found, returns a JSON response with the list of blocked users and a 200 status code.
+            - If the pagination cursor is invalid, returns a JSON response with an error message and a 400 status code.
             - If the user is not found, returns a JSON response with an error message and a 404 status code.
             - If an error occurs during the process, returns a JSON response with an error message and a 500 status code.
     """
     page, per_page = get_pagination_params()
+    cursor, with_total = get_cursor_params()
     filter_params = get_filter_params()
     sort_params = get_sort_params()
-    return get_blocked_users(page=page, per_page=per_page, private_user_id=private_user_id, filters=filter_params, sorting=sort_params)
+    return get_blocked_users(page=page, per_page=per_page, private_user_id=private_user_id, filters=filter_params, sorting=sort_params, cursor=cursor, with_total=with_total)
 
 # ----------------- BLOCK USER ----------------- #
 def block_user_service(blocker_id: str, blocked_id: str) -> Tuple[Response, int]:
@@ -2,6 +2,7 @@ from typing import Tuple
 from flask import Response, jsonify
 from app import db
 from app.models.user import Users, BlockedUsers
+from app.services.feed.timeline import schedule_timeline_job
 
 def block_user(blocker_id: str, blocked_id: str) -> Tuple[Response, int]:
     """
@@ -25,7 +26,7 @@ def block_user(blocker_id: str, blocked_id: str) -> Tuple[Response, int]:
             return jsonify({"message": "Blocker not found."}), 404
         
         # Check if the blocked user exists
-        blocked_user = Users.query.filter_by(public_user_id=blocked_id).first()
+        blocked_user = Users.query.filter_by(public_user_id=blocked_id, deleted_at=None).first()
         if not blocked_user:
             return jsonify({"message": "Blocked user not found."}), 404
         
@@ -46,6 +47,9 @@ def block_user(blocker_id: str, blocked_id: str) -> Tuple[Response, int]:
         
         db.session.add(new_blocked_user)
 
+        # Remove each user's posts from the other's timeline in the background
+        schedule_timeline_job("timelines.remove_block", blocker_id=blocker_id, blocked_id=blocked_user.private_user_id)
+
         db.session.commit()
         return jsonify({"message": "User blocked successfully"}), 200
     except Exception as e:
@@ -2,19 +2,25 @@ from app import db
 from typing import Any, Dict, Optional, Tuple
 from flask import Response, jsonify
 from app.models import Users, BlockedUsers
-from app.utils.io import record_exists, paginate_query
+from app.types.enum import CountStrategy
+from app.utils.io import record_exists, paginate_query, keyset_paginate, InvalidCursorError
 from app.utils.io import PAGE, PER_PAGE, build_sort_conditions, build_filter_conditions
 from app.types.mappings.filters import BLOCKED_USERS_FILTER_MAPPINGS
 from app.types.mappings.sorting import BLOCKED_USERS_SORTING_MAPPINGS
 from sqlalchemy.orm import aliased
 from sqlalchemy.orm.collections import InstrumentedList
 
+# Most recently blocked first; blocked_users_id breaks ties so the order is unique
+BLOCKED_USERS_CURSOR_KEYS = [(BlockedUsers.blocked_at, "desc"), (BlockedUsers.blocked_users_id, "desc")]
+
 def get_blocked_users(
     private_user_id: str, 
     filters: Optional[Dict[str, Any]] = None, 
     page: int = PAGE, 
     per_page: int = PER_PAGE, 
-    sorting: Optional[Dict[str, Any]] = None
+    sorting: Optional[Dict[str, Any]] = None,
+    cursor: Optional[str] = None,
+    with_total: bool = False
 ) -> Tuple[Response, int]:
     try:
         # Check if the user exists
@@ -38,26 +44,42 @@ def get_blocked_users(
             )
 
 
-       # Query the database for blocked users with optional filters and sorting
+       # Query the database for blocked users with optional filters
         blocked_users_query = (
             db.session.query(BlockedUsers)
             .join(BlockedUsers.blocked)
             .filter(BlockedUsers.blocker_id == private_user_id) # type: ignore
             .filter(*filter_conditions if filters else [])
-            .order_by(*sort_conditions if sorting else [])
 )
+        to_representation = lambda blocked_user: blocked_user.to_dict([BlockedUsers.DictKeys.BLOCKER])
 
-        # Paginate the query
-        pagination_result = paginate_query(
-            query=blocked_users_query,
-            page=page,
-            per_page=per_page,
-            items_name="blocked_users",
-            to_representation=lambda blocked_user: blocked_user.to_dict([BlockedUsers.DictKeys.BLOCKER])
+        # Cursors follow the default order only, so custom sorting falls back to page numbers
+        if cursor is not None and not sorting:
+            pagination_result = keyset_paginate(
+                query=blocked_users_query,
+                keys=BLOCKED_USERS_CURSOR_KEYS,
+                cursor=cursor,
+                per_page=per_page,
+                items_name="blocked_users",
+                to_representation=to_representation,
+                count_strategy=CountStrategy.EXACT if with_total else CountStrategy.NONE
             )
+        else:
+            # Paginate the query with optional sorting
+            default_order = [column.desc() for column, _ in BLOCKED_USERS_CURSOR_KEYS]
+            pagination_result = paginate_query(
+                query=blocked_users_query.order_by(*sort_conditions if sorting else default_order),
+                page=page,
+                per_page=per_page,
+                items_name="blocked_users",
+                to_representation=to_representation,
+                cursor_keys=None if sorting else BLOCKED_USERS_CURSOR_KEYS
+                )
 
         return jsonify(pagination_result), 200
 
+    except InvalidCursorError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -11,7 +11,7 @@ def unblock_user(unblocker_id: str, unblocked_id: str) -> Tuple[Response, int]:
             return jsonify({"message": "Unblocker not found."}), 404
         
         # Check if the unblocked user exists
-        unblocked_user = Users.query.filter_by(public_user_id=unblocked_id).first()
+        unblocked_user = Users.query.filter_by(public_user_id=unblocked_id, deleted_at=None).first()
         if not unblocked_user:
             return jsonify({"message": "Blocked user not found."}), 404
         
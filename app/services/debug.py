@@ -5,6 +5,8 @@ from app import db
 from app.models import Users
 from app.types.enum import ProfileAccessoryType, ProfileType, OwnershipType, UserType
 from app.utils.id_generation import generate_uuid
+from app.utils.db_pool import get_pool_stats
+from app.utils.cache import get_user_cache
 
 def debug_service() -> Tuple[Response, int]:
     try:
@@ -19,4 +21,24 @@ def debug_service() -> Tuple[Response, int]:
     except Exception as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
-    
\ No newline at end of file
+    
+
+def pool_stats_service() -> Tuple[Response, int]:
+    """
+    Returns the connection pool statistics of the worker that serves the request.
+
+    Returns:
+        Tuple[Response, int]: The pool statistics per engine and HTTP 200.
+    """
+    return jsonify({"pools": get_pool_stats()}), 200
+
+
+def cache_stats_service() -> Tuple[Response, int]:
+    """
+    Returns the user summary cache statistics of the worker that serves the request.
+
+    Returns:
+        Tuple[Response, int]: The cache statistics (null when the cache is disabled) and HTTP 200.
+    """
+    cache = get_user_cache()
+    return jsonify({"user_cache": cache.stats() if cache is not None else None}), 200
@@ -0,0 +1,25 @@
+from typing import Tuple
+from flask import Response
+from app.services.feed.get_feed import get_feed
+from app.utils.io import get_pagination_params, get_cursor_params
+
+# ----------------- GET FEED ----------------- #
+def get_feed_service(private_user_id: str) -> Tuple[Response, int]:
+    """
+    Fetches a page of the user's home feed: posts by the users they follow, newest first.
+
+    Posts by users the viewer has blocked, or who have blocked the viewer, are left out.
+    The page is selected with the `c` cursor parameter and sized with `pp`; `count=true`
+    adds a cached total.
+
+    Args:
+        private_user_id (str): The private ID of the viewing user.
+
+    Returns:
+        Tuple[Response, int]:
+            - Response: JSON response containing a page of posts and pagination metadata.
+            - int: HTTP status code (200 for successful retrieval, 400 for an invalid cursor, 404 if the user is not found).
+    """
+    _, per_page = get_pagination_params()
+    cursor, with_total = get_cursor_params()
+    return get_feed(private_user_id, cursor=cursor, per_page=per_page, with_total=with_total)
@@ -0,0 +1,160 @@
+from typing import Dict, List, Optional, Tuple
+from flask import Response, jsonify
+from sqlalchemy import exists, and_
+from sqlalchemy.orm import load_only
+from app.models import Users, Posts, PostReactions, UserFollowers, BlockedUsers, TimelineEntries
+from app.services.feed.timeline import timelines_enabled, celebrity_followees
+from app.services.posts.get_posts import POSTS_CURSOR_KEYS
+from app.utils.io import PER_PAGE, keyset_paginate, keyset_paginate_merged, InvalidCursorError
+from app.utils.query_tracking import query_budget
+from app.types.enum import CountStrategy
+
+# A timeline's entries carry copies of their posts' keys, so its pages continue on the same cursor as POSTS_CURSOR_KEYS
+TIMELINE_CURSOR_KEYS = [(TimelineEntries.created_at, "desc"), (TimelineEntries.post_id, "desc")]
+
+def get_feed(
+    private_user_id: str,
+    cursor: Optional[str] = None,
+    per_page: int = PER_PAGE,
+    with_total: bool = False
+) -> Tuple[Response, int]:
+    """
+    Fetches a page of the user's home feed: the posts of the users they follow, newest first.
+
+    This function performs the following tasks:
+    - Checks if the user exists.
+    - Retrieves a page of posts by the user's followees, excluding users blocked in either direction,
+      from the user's materialized timeline if `TIMELINE_ENABLED`, otherwise from the posts themselves.
+    - Returns a JSON response containing the posts and pagination metadata.
+
+    Args:
+        private_user_id (str): The private ID of the viewing user.
+        cursor (Optional[str]): The cursor of the page to retrieve. None or empty for the first page.
+        per_page (int): The number of posts per page.
+        with_total (bool): Whether to include a (cached) total in `_meta`.
+
+    Returns:
+        Tuple[Response, int]: A tuple containing the Flask response object and an HTTP status code.
+            - If the feed is retrieved, returns a JSON response with the posts and `_meta` and a 200 status code.
+            - If the cursor is invalid, returns a JSON response with an error message and a 400 status code.
+            - If the user is not found, returns a JSON response with an error message and a 404 status code.
+    """
+    if not Users.query.filter_by(private_user_id=private_user_id, deleted_at=None).first():
+        return jsonify({"error": "User not found"}), 404
+
+    try:
+        if timelines_enabled():
+            return get_timeline_page(private_user_id, cursor, per_page, with_total)
+        return get_feed_page(private_user_id, cursor, per_page, with_total)
+    except InvalidCursorError as e:
+        return jsonify({"error": str(e)}), 400
+
+def feed_query(private_user_id: str):
+    """
+    Builds the query of the posts in a user's home feed, unordered.
+
+    Followees and blocks are correlated subqueries rather than lists fetched first, so the
+    query text stays the same size however many users are followed. Both are answered
+    from composite indexes (`idx_user_followers_follower_followee`,
+    `idx_blocked_users_blocker_blocked`, `idx_blocked_users_blocked_blocker`). The database
+    can then either walk `idx_posts_created_at_post_id` newest first and probe each post's
+    author, which stops after a page of matches and gets cheaper the more users are
+    followed, or merge the followees' ranges of `idx_posts_user_created_at`, whichever
+    its statistics favour.
+
+    Args:
+        private_user_id (str): The private ID of the viewing user.
+
+    Returns:
+        Query: The feed's posts.
+    """
+    follows_author = exists().where(
+        UserFollowers.follower_user_id == private_user_id,
+        UserFollowers.followee_user_id == Posts.user_id,
+    )
+    return Posts.query.filter(follows_author, ~BlockedUsers.either_way(private_user_id, Posts.user_id), Posts.deleted_at.is_(None))
+
+@query_budget(8)
+def get_feed_page(private_user_id: str, cursor: Optional[str], per_page: int, with_total: bool) -> Tuple[Response, int]:
+    """
+    Fetches a page of the user's home feed with everything `Posts.to_dict` needs eagerly loaded.
+
+    Like `get_posts_page`, the page is loaded with a fixed number of queries regardless of
+    its size or of the number of followees.
+
+    Args:
+        private_user_id (str): The private ID of the viewing user.
+        cursor (Optional[str]): The cursor of the page to retrieve. None or empty for the first page.
+        per_page (int): The number of posts per page.
+        with_total (bool): Whether to include a (cached) total in `_meta`.
+
+    Returns:
+        Tuple[Response, int]: JSON response containing the posts and `_meta`, and HTTP 200.
+    """
+    data = keyset_paginate(
+        query=feed_query(private_user_id).options(*Posts.to_dict_loader_options()),
+        keys=POSTS_CURSOR_KEYS,
+        cursor=cursor,
+        per_page=per_page,
+        # Salts the cursors, so a cursor of `GET /posts` is rejected here rather than misread
+        items_name="feed",
+        prepare=lambda posts: PostReactions.load_viewer_reactions(private_user_id, [post.post_id for post in posts]),
+        to_representation=lambda post, viewer_reactions: post.to_dict(user_id=private_user_id, viewer_reactions=viewer_reactions),
+        count_strategy=CountStrategy.CACHED if with_total else CountStrategy.NONE
+    )
+    data["posts"] = data.pop("feed")
+    return jsonify(data), 200
+
+def _load_page(private_user_id: str, posts: List[Posts]) -> Dict[str, str]:
+    """Loads everything `to_dict` reads for a page of posts fetched by key only, and the viewer's reactions."""
+    post_ids = [post.post_id for post in posts]
+    if post_ids:
+        Posts.query.options(*Posts.to_dict_loader_options()).populate_existing().filter(Posts.post_id.in_(post_ids)).all()
+    return PostReactions.load_viewer_reactions(private_user_id, post_ids)
+
+@query_budget(11)
+def get_timeline_page(private_user_id: str, cursor: Optional[str], per_page: int, with_total: bool) -> Tuple[Response, int]:
+    """
+    Fetches a page of the user's home feed from their materialized timeline.
+
+    The fanned-out posts are a range scan of `idx_timeline_entries_user_created_at`. Posts
+    that were not fanned out because their author was a celebrity when they were posted
+    are read from `idx_posts_user_created_at` and merged into the page. Blocks and deletions are
+    checked again because timelines are cleaned up in the background. The sources are
+    paged on their keys only, and the merged page is then loaded with
+    `Posts.to_dict_loader_options()` once, so a page costs the same number of queries
+    however many sources it merges.
+
+    Args:
+        private_user_id (str): The private ID of the viewing user.
+        cursor (Optional[str]): The cursor of the page to retrieve. None or empty for the first page.
+        per_page (int): The number of posts per page.
+        with_total (bool): Whether to include a (cached) total in `_meta`.
+
+    Returns:
+        Tuple[Response, int]: JSON response containing the posts and `_meta`, and HTTP 200.
+    """
+    not_blocked = ~BlockedUsers.either_way(private_user_id, Posts.user_id)
+    timeline = (
+        Posts.query
+        .join(TimelineEntries, and_(TimelineEntries.post_id == Posts.post_id, TimelineEntries.user_id == private_user_id))
+        .filter(not_blocked, Posts.deleted_at.is_(None))
+    )
+    keys_only = load_only(Posts.post_id, Posts.created_at)
+    sources = [(timeline.options(keys_only), TIMELINE_CURSOR_KEYS)]
+    celebrities = celebrity_followees(private_user_id)
+    if celebrities:
+        celebrity_posts = Posts.query.filter(Posts.user_id.in_(celebrities), Posts.fanned_out.is_(False), not_blocked, Posts.deleted_at.is_(None))
+        sources.append((celebrity_posts.options(keys_only), POSTS_CURSOR_KEYS))
+
+    data = keyset_paginate_merged(
+        sources=sources,
+        cursor=cursor,
+        per_page=per_page,
+        items_name="feed",
+        prepare=lambda posts: _load_page(private_user_id, posts),
+        to_representation=lambda post, viewer_reactions: post.to_dict(user_id=private_user_id, viewer_reactions=viewer_reactions),
+        count_strategy=CountStrategy.CACHED if with_total else CountStrategy.NONE
+    )
+    data["posts"] = data.pop("feed")
+    return jsonify(data), 200
@@ -0,0 +1,310 @@
+from datetime import datetime
+from typing import Any, List, Optional
+from flask import Flask, current_app, has_app_context
+from sqlalchemy import and_, delete, or_, select, update
+from app import db
+from app.models import Posts, UserFollowers, UserStats, BlockedUsers, TimelineEntries
+from app.services.jobs import job, enqueue
+from app.utils.cache import TTLCache
+
+
+def timelines_enabled() -> bool:
+    """Whether home feeds are read from, and new posts fanned out to, materialized timelines."""
+    return has_app_context() and current_app.config.get("TIMELINE_ENABLED", False)
+
+def schedule_timeline_job(name: str, **payload: Any) -> None:
+    """
+    Enqueues a timeline maintenance job if timelines are enabled.
+
+    Call it before the commit of the change the job follows up on, so the job is
+    committed, or rolled back, with it.
+
+    Args:
+        name (str): One of the jobs of this module, e.g. `timelines.fan_out_post`.
+        **payload (Any): The job's arguments.
+    """
+    if timelines_enabled():
+        enqueue(name, payload)
+
+#region CELEBRITIES
+def _celebrity_threshold() -> int:
+    return current_app.config.get("TIMELINE_CELEBRITY_THRESHOLD", 10000)
+
+def is_celebrity(private_user_id: str) -> bool:
+    """
+    Whether a user has too many followers for their posts to be fanned out.
+
+    Uses the stored follower count; increments still pending in counter shards are not added.
+
+    Args:
+        private_user_id (str): The private ID of the user.
+
+    Returns:
+        bool: True if the user has more than `TIMELINE_CELEBRITY_THRESHOLD` followers.
+    """
+    follower_count = db.session.execute(
+        select(UserStats.follower_count).where(UserStats.user_id == private_user_id)
+    ).scalar()
+    return (follower_count or 0) > _celebrity_threshold()
+
+def _celebrity_followees_cache() -> TTLCache:
+    cache = current_app.extensions.get("celebrity_followees_cache")
+    if cache is None:
+        cache = current_app.extensions.setdefault("celebrity_followees_cache", TTLCache(
+            maxsize=current_app.config.get("TIMELINE_CELEBRITY_CACHE_MAX_SIZE", 10000),
+            ttl=current_app.config.get("TIMELINE_CELEBRITY_CACHE_TTL_SECONDS", 60),
+        ))
+    return cache
+
+def celebrity_followees(private_user_id: str) -> List[str]:
+    """
+    Returns the users followed by `private_user_id` whose posts are merged in at read time.
+
+    These are the followees with a `celebrity_since`, i.e. with posts that were not fanned
+    out, whatever their follower count is now. The list is cached per worker for
+    `TIMELINE_CELEBRITY_CACHE_TTL_SECONDS`, so a new follow of, or an unfollow from, a
+    celebrity, or a followee's first post as a celebrity, shows in the feed once the entry expires.
+
+    Args:
+        private_user_id (str): The private ID of the reader.
+
+    Returns:
+        List[str]: The private IDs of the followees whose posts are not all fanned out.
+    """
+    cache = _celebrity_followees_cache()
+    followees = cache.get(private_user_id)
+    if followees is None:
+        followees = list(db.session.execute(
+            select(UserFollowers.followee_user_id)
+            .join(UserStats, UserStats.user_id == UserFollowers.followee_user_id)
+            .where(UserFollowers.follower_user_id == private_user_id, UserStats.celebrity_since.isnot(None))
+        ).scalars())
+        cache.set(private_user_id, followees)
+    return followees
+
+def schedule_fan_out(post: Posts) -> None:
+    """
+    Decides whether a new post is fanned out to its author's followers' timelines.
+
+    Posts of celebrities (see `is_celebrity`) are stored with `fanned_out` false and their
+    author's `celebrity_since` is set, so readers merge them in at read time for as long as
+    they exist, even once the author drops below the threshold. Other posts are delivered
+    by the `timelines.fan_out_post` job. Does nothing if timelines are disabled; such posts
+    are delivered by `flask timelines rebuild` when they are enabled.
+
+    Call it before the commit of the post.
+
+    Args:
+        post (Posts): The new post.
+    """
+    if not timelines_enabled() or post.user_id is None:
+        return
+    if is_celebrity(post.user_id):
+        post.fanned_out = False
+        db.session.execute(
+            update(UserStats)
+            .where(UserStats.user_id == post.user_id, UserStats.celebrity_since.is_(None))
+            .values(celebrity_since=datetime.now())
+        )
+    else:
+        enqueue("timelines.fan_out_post", {"post_id": post.post_id})
+#endregion CELEBRITIES
+
+#region JOBS
+@job("timelines.fan_out_post")
+def fan_out_post(post_id: str) -> int:
+    """
+    Delivers a new post to the timelines of its author's followers.
+
+    Followers are read in batches of `TIMELINE_FANOUT_BATCH_SIZE`, keyset-paginated on
+    the followee index, and each batch is inserted and committed on its own, so the
+    job holds no long transaction. Followers blocked by or blocking the author are
+    skipped. Posts stored as not fanned out (see `schedule_fan_out`) are not delivered.
+
+    Args:
+        post_id (str): The new post.
+
+    Returns:
+        int: Number of timelines the post was delivered to.
+    """
+    post = db.session.execute(
+        select(Posts.user_id, Posts.created_at, Posts.fanned_out).where(Posts.post_id == post_id, Posts.deleted_at.is_(None))
+    ).first()
+    if post is None or post.user_id is None or not post.fanned_out:
+        return 0
+
+    batch_size = current_app.config.get("TIMELINE_FANOUT_BATCH_SIZE", 1000)
+    delivered = 0
+    last: Optional[tuple] = None
+    while True:
+        query = (
+            select(UserFollowers.follower_user_id, UserFollowers.followed_at, UserFollowers.follow_id)
+            .where(UserFollowers.followee_user_id == post.user_id, ~BlockedUsers.either_way(post.user_id, UserFollowers.follower_user_id))
+            .order_by(UserFollowers.followed_at, UserFollowers.follow_id)
+            .limit(batch_size)
+        )
+        if last is not None:
+            query = query.where(or_(
+                UserFollowers.followed_at > last[0],
+                and_(UserFollowers.followed_at == last[0], UserFollowers.follow_id > last[1]),
+            ))
+        followers = db.session.execute(query).all()
+        if not followers:
+            break
+        TimelineEntries.add_many([
+            {"user_id": follower.follower_user_id, "post_id": post_id, "author_id": post.user_id, "created_at": post.created_at}
+            for follower in followers
+        ])
+        db.session.commit()
+        delivered += len(followers)
+        if len(followers) < batch_size:
+            break
+        last = (followers[-1].followed_at, followers[-1].follow_id)
+    return delivered
+
+@job("timelines.backfill")
+def backfill_timeline(private_user_id: str, author_id: str) -> int:
+    """
+    Delivers an author's latest `TIMELINE_BACKFILL_POSTS` fanned-out posts to a user who started following them.
+
+    Posts that were not fanned out are merged into the feed at read time instead.
+    Does nothing if the follow has ended since.
+
+    Args:
+        private_user_id (str): The private ID of the follower.
+        author_id (str): The private ID of the followed user.
+
+    Returns:
+        int: Number of posts delivered.
+    """
+    follows = db.session.execute(
+        select(UserFollowers.follow_id).where(UserFollowers.follower_user_id == private_user_id, UserFollowers.followee_user_id == author_id)
+    ).first()
+    if follows is None:
+        return 0
+
+    posts = db.session.execute(
+        select(Posts.post_id, Posts.created_at)
+        .where(Posts.user_id == author_id, Posts.fanned_out.is_(True), Posts.deleted_at.is_(None))
+        .order_by(Posts.created_at.desc(), Posts.post_id.desc())
+        .limit(current_app.config.get("TIMELINE_BACKFILL_POSTS", 50))
+    ).all()
+    TimelineEntries.add_many([
+        {"user_id": private_user_id, "post_id": post.post_id, "author_id": author_id, "created_at": post.created_at}
+        for post in posts
+    ])
+    db.session.commit()
+    return len(posts)
+
+@job("timelines.remove_post")
+def remove_post_from_timelines(post_id: str) -> int:
+    """
+    Removes a deleted post from every timeline it was delivered to.
+
+    Args:
+        post_id (str): The deleted post.
+
+    Returns:
+        int: Number of entries removed.
+    """
+    removed = db.session.execute(delete(TimelineEntries).where(TimelineEntries.post_id == post_id)).rowcount
+    db.session.commit()
+    return removed
+
+@job("timelines.remove_author")
+def remove_author_from_timeline(private_user_id: str, author_id: str) -> int:
+    """
+    Removes an author's posts from a user's timeline, after an unfollow or a block.
+
+    Args:
+        private_user_id (str): The private ID of the timeline's owner.
+        author_id (str): The private ID of the author.
+
+    Returns:
+        int: Number of entries removed.
+    """
+    removed = db.session.execute(
+        delete(TimelineEntries).where(TimelineEntries.user_id == private_user_id, TimelineEntries.author_id == author_id)
+    ).rowcount
+    db.session.commit()
+    return removed
+
+@job("timelines.remove_block")
+def remove_block_from_timelines(blocker_id: str, blocked_id: str) -> int:
+    """
+    Removes each user's posts from the other's timeline after a block.
+
+    Args:
+        blocker_id (str): The private ID of the user who blocked.
+        blocked_id (str): The private ID of the blocked user.
+
+    Returns:
+        int: Number of entries removed.
+    """
+    return remove_author_from_timeline(blocker_id, blocked_id) + remove_author_from_timeline(blocked_id, blocker_id)
+
+@job("timelines.clear")
+def clear_timeline(private_user_id: str) -> int:
+    """
+    Removes every entry of a user's timeline, e.g. after the user is deleted.
+
+    Args:
+        private_user_id (str): The private ID of the timeline's owner.
+
+    Returns:
+        int: Number of entries removed.
+    """
+    removed = db.session.execute(delete(TimelineEntries).where(TimelineEntries.user_id == private_user_id)).rowcount
+    db.session.commit()
+    return removed
+
+def rebuild_timeline(private_user_id: str) -> int:
+    """
+    Rebuilds a user's timeline from the latest posts of everyone they follow.
+
+    Used when timelines are first enabled, or to repair a timeline after failed jobs.
+
+    Args:
+        private_user_id (str): The private ID of the timeline's owner.
+
+    Returns:
+        int: Number of entries in the rebuilt timeline.
+    """
+    clear_timeline(private_user_id)
+    followees = db.session.execute(
+        select(UserFollowers.followee_user_id).where(
+            UserFollowers.follower_user_id == private_user_id,
+            ~BlockedUsers.either_way(private_user_id, UserFollowers.followee_user_id),
+        )
+    ).scalars().all()
+    return sum(backfill_timeline(private_user_id, followee) for followee in followees)
+#endregion JOBS
+
+def init_timelines(app: Flask) -> None:
+    """
+    Registers the `flask timelines rebuild` command.
+
+    Timelines are configured with `TIMELINE_ENABLED`, `TIMELINE_CELEBRITY_THRESHOLD`,
+    `TIMELINE_FANOUT_BATCH_SIZE`, `TIMELINE_BACKFILL_POSTS`,
+    `TIMELINE_CELEBRITY_CACHE_MAX_SIZE` and `TIMELINE_CELEBRITY_CACHE_TTL_SECONDS`.
+
+    Args:
+        app (Flask): The application.
+    """
+    app.config.setdefault("TIMELINE_ENABLED", False)
+    app.config.setdefault("TIMELINE_CELEBRITY_THRESHOLD", 10000)
+    app.config.setdefault("TIMELINE_FANOUT_BATCH_SIZE", 1000)
+    app.config.setdefault("TIMELINE_BACKFILL_POSTS", 50)
+    app.config.setdefault("TIMELINE_CELEBRITY_CACHE_MAX_SIZE", 10000)
+    app.config.setdefault("TIMELINE_CELEBRITY_CACHE_TTL_SECONDS", 60.0)
+
+    @app.cli.group("timelines")
+    def timelines_cli():
+        """Materialized home timeline commands."""
+
+    @timelines_cli.command("rebuild")
+    def rebuild_command():
+        """Rebuild the timeline of every user who follows someone."""
+        users = db.session.execute(select(UserFollowers.follower_user_id).distinct()).scalars().all()
+        entries = sum(rebuild_timeline(private_user_id) for private_user_id in users)
+        print(f"Rebuilt {len(users)} timelines with {entries} entries.")
@@ -1,6 +1,7 @@
 from flask import Response, jsonify
 from typing import Optional, Tuple
 from app.models import HashTags
+from app.utils.counter_buffer import increment_counter_buffered
 
 def get_hashtag_posts(hashtag_name: str) -> Tuple[Response, int]:
     """
@@ -26,8 +27,11 @@ def get_hashtag_posts(hashtag_name: str) -> Tuple[Response, int]:
         if not hashtag:
             # Return a 404 response if the hashtag is not found
             return jsonify({"error": "Hashtag not found"}), 404
+
+        # Count the view without writing in this request; the buffer flushes it in the background
+        increment_counter_buffered(HashTags.views, hashtag.hashtag_id)
         
         # Return a list of posts associated with the hashtag
-        return jsonify([post.to_dict() for post in hashtag.posts]), 200
+        return jsonify([post.to_dict() for post in hashtag.posts if post.deleted_at is None]), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
\ No newline at end of file
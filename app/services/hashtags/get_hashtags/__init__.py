@@ -1,6 +1,8 @@
 from flask import Response, jsonify
 from typing import Optional, Tuple
 from app.models import HashTags
+from app.utils.etag import conditional_response, make_etag
+from app.utils.counter_buffer import increment_counter_buffered
 
 def get_hashtags(hashtag_name: Optional[str] = None) -> Tuple[Response, int]:
     """
@@ -28,13 +30,22 @@ def get_hashtags(hashtag_name: Optional[str] = None) -> Tuple[Response, int]:
         if hashtag_name:
             # Check if the hashtag exists in the database
             hashtag_name = hashtag_name.lower()
-            hashtag = HashTags.query.filter_by(hashtag_name=hashtag_name).first()
-            if hashtag:
-                # Return the hashtag
-                return jsonify({"hashtag": hashtag.to_dict()}), 200
-            else:
+            stamp = HashTags.version_stamp(hashtag_name)
+            if stamp is None:
                 # Return a 404 response if the hashtag is not found
                 return jsonify({"error": "Hashtag not found"}), 404
+
+            # Count the view without writing in this request; the buffer flushes it in the background
+            increment_counter_buffered(HashTags.views, stamp[0])
+
+            def build() -> Tuple[Response, int]:
+                hashtag = HashTags.query.filter_by(hashtag_name=hashtag_name).first()
+                if hashtag is None:
+                    return jsonify({"error": "Hashtag not found"}), 404
+                return jsonify({"hashtag": hashtag.to_dict()}), 200
+
+            # Return 304 if the client's copy is current, otherwise the hashtag
+            return conditional_response(make_etag("hashtag", stamp), build)
         else:
             # Fetch all hashtags from the database
             hashtags = HashTags.query.all()
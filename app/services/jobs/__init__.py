@@ -0,0 +1,111 @@
+import atexit
+import signal
+from datetime import datetime, timedelta
+import click
+from flask import Flask
+from sqlalchemy import delete, func, select, update
+from app import db
+from app.models import Jobs
+from app.types.enum import JobStatus
+from app.services.jobs.registry import job, get_job, registered_jobs
+from app.services.jobs.queue import enqueue, release_idempotency_key, claim_job, run_job, retry_delay, register_inline_listeners
+from app.services.jobs.worker import JobWorker
+
+
+def init_jobs(app: Flask) -> None:
+    """
+    Configures the persistent job queue and registers the `flask jobs` commands.
+
+    Jobs are run by `JOBS_EMBEDDED_WORKERS` threads of each web worker (one by default)
+    and by `flask jobs work` processes, or with `JOBS_RUN_INLINE` right after the
+    enqueuing commit. Set `JOBS_EMBEDDED_WORKERS` to 0 only when `flask jobs work`
+    processes are deployed, otherwise delete cascades and timeline maintenance never run.
+    Configured with `JOBS_RUN_INLINE`, `JOBS_EMBEDDED_WORKERS`, `JOBS_WORKER_THREADS`,
+    `JOBS_POLL_INTERVAL`, `JOBS_MAX_ATTEMPTS`, `JOBS_BACKOFF_BASE_SECONDS`,
+    `JOBS_BACKOFF_MAX_SECONDS`, `JOBS_LOCK_TIMEOUT_SECONDS`, `JOBS_CLAIM_CANDIDATES`
+    and `JOBS_RETENTION_DAYS`.
+
+    Args:
+        app (Flask): The application.
+    """
+    app.config.setdefault("JOBS_RUN_INLINE", False)
+    app.config.setdefault("JOBS_EMBEDDED_WORKERS", 1)
+    app.config.setdefault("JOBS_WORKER_THREADS", 4)
+    app.config.setdefault("JOBS_POLL_INTERVAL", 1.0)
+    app.config.setdefault("JOBS_MAX_ATTEMPTS", 5)
+    app.config.setdefault("JOBS_BACKOFF_BASE_SECONDS", 5.0)
+    app.config.setdefault("JOBS_BACKOFF_MAX_SECONDS", 3600.0)
+    app.config.setdefault("JOBS_LOCK_TIMEOUT_SECONDS", 600)
+    app.config.setdefault("JOBS_CLAIM_CANDIDATES", 10)
+    app.config.setdefault("JOBS_RETENTION_DAYS", 7)
+
+    if app.config["JOBS_RUN_INLINE"]:
+        register_inline_listeners()
+    elif app.config["JOBS_EMBEDDED_WORKERS"] > 0:
+        # Started by the first request or enqueue in each process, so jobs left over from
+        # before a restart run without waiting for a new one
+        worker = JobWorker(app, threads=app.config["JOBS_EMBEDDED_WORKERS"], poll_interval=app.config["JOBS_POLL_INTERVAL"])
+        app.extensions["job_worker"] = worker
+        app.before_request(worker.start)
+        atexit.register(worker.stop, app.config["JOBS_POLL_INTERVAL"] + 1)
+
+    @app.cli.group("jobs")
+    def jobs_cli():
+        """Background job commands."""
+
+    @jobs_cli.command("work")
+    @click.option("--threads", type=int, default=None, help="Worker threads. Defaults to JOBS_WORKER_THREADS.")
+    @click.option("--poll-interval", type=float, default=None, help="Seconds between polls of an empty queue.")
+    @click.option("--once", is_flag=True, help="Exit once no job is due.")
+    def work_command(threads, poll_interval, once):
+        """Run due jobs until interrupted."""
+        # Jobs enqueued by the jobs run here are picked up by this worker, not by embedded threads
+        app.extensions.pop("job_worker", None)
+        worker = JobWorker(
+            app,
+            threads=threads or app.config["JOBS_WORKER_THREADS"],
+            poll_interval=poll_interval if poll_interval is not None else app.config["JOBS_POLL_INTERVAL"],
+        )
+        # Finish the current jobs on SIGTERM instead of abandoning them until their lock expires
+        signal.signal(signal.SIGTERM, lambda signum, frame: worker.stop(timeout=0))
+        print(f"Running jobs with {worker.threads} threads: {', '.join(registered_jobs())}")
+        try:
+            worker.run(once=once)
+        except KeyboardInterrupt:
+            worker.stop()
+
+    @jobs_cli.command("status")
+    def status_command():
+        """Print the number of jobs by name and status."""
+        rows = db.session.execute(
+            select(Jobs.job_name, Jobs.status, func.count(), func.min(Jobs.run_at))
+            .group_by(Jobs.job_name, Jobs.status)
+            .order_by(Jobs.job_name, Jobs.status)
+        )
+        for name, status, count, next_run_at in rows:
+            due = f"  next={next_run_at.isoformat(sep=' ', timespec='seconds')}" if status == JobStatus.PENDING else ""
+            print(f"{name}  {status.value}  {count}{due}")
+
+    @jobs_cli.command("retry-failed")
+    @click.option("--name", default=None, help="Only retry jobs with this name.")
+    def retry_failed_command(name):
+        """Queue failed jobs again with a fresh set of attempts."""
+        statement = update(Jobs).where(Jobs.status == JobStatus.FAILED)
+        if name:
+            statement = statement.where(Jobs.job_name == name)
+        retried = db.session.execute(
+            statement.values(status=JobStatus.PENDING, attempts=0, run_at=datetime.now(), finished_at=None)
+        ).rowcount
+        db.session.commit()
+        print(f"Queued {retried} failed jobs again.")
+
+    @jobs_cli.command("purge")
+    @click.option("--days", type=int, default=None, help="Age in days. Defaults to JOBS_RETENTION_DAYS.")
+    def purge_command(days):
+        """Delete succeeded jobs that finished more than --days ago, releasing their idempotency keys."""
+        cutoff = datetime.now() - timedelta(days=days if days is not None else app.config["JOBS_RETENTION_DAYS"])
+        purged = db.session.execute(
+            delete(Jobs).where(Jobs.status == JobStatus.SUCCEEDED, Jobs.finished_at < cutoff)
+        ).rowcount
+        db.session.commit()
+        print(f"Purged {purged} jobs.")
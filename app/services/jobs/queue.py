@@ -0,0 +1,307 @@
+import logging
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+from flask import current_app, has_app_context
+from sqlalchemy import and_, event, insert, or_, select, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.orm import Session
+from app import db
+from app.models import Jobs
+from app.types.enum import JobStatus
+from app.types.length import JOB_WORKER_ID_LENGTH
+from app.utils.id_generation import generate_uuid
+from app.utils.metrics import registry
+from app.services.jobs.registry import get_job
+
+logger = logging.getLogger(__name__)
+
+JOBS_ENQUEUED = registry.counter(
+    "jobs_enqueued_total",
+    "Jobs enqueued by job and result (queued, or duplicate of an idempotency key).",
+    ("job", "result"),
+)
+JOB_ATTEMPTS = registry.counter(
+    "job_attempts_total",
+    "Job attempts by job and result (succeeded, retried or failed).",
+    ("job", "result"),
+)
+JOB_DURATION = registry.histogram(
+    "job_duration_seconds",
+    "Duration of job attempts by job.",
+    ("job",),
+)
+
+# Jobs enqueued in a session with JOBS_RUN_INLINE, run once the session commits
+_INLINE_KEY = "jobs_run_inline"
+# Errors are stored truncated; the full traceback goes to the log
+ERROR_MAX_LENGTH = 2000
+
+
+def _config(name: str, default: Any) -> Any:
+    return current_app.config.get(name, default) if has_app_context() else default
+
+
+#region ENQUEUE
+def _insert_unless_duplicate(session: Session, row: Dict[str, Any]) -> bool:
+    table = Jobs.__table__
+    dialect = session.get_bind(clause=table).dialect.name
+    if dialect in ("mysql", "mariadb"):
+        return session.execute(mysql.insert(table).prefix_with("IGNORE").values(row)).rowcount > 0
+    if dialect in ("sqlite", "postgresql"):
+        dialect_insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        return session.execute(dialect_insert(table).values(row).on_conflict_do_nothing(index_elements=["idempotency_key"])).rowcount > 0
+
+    if session.execute(select(Jobs.job_id).where(Jobs.idempotency_key == row["idempotency_key"])).first() is not None:
+        return False
+    session.execute(insert(table).values(row))
+    return True
+
+def enqueue(
+    name: str,
+    payload: Optional[Dict[str, Any]] = None,
+    idempotency_key: Optional[str] = None,
+    delay: float = 0,
+    max_attempts: Optional[int] = None,
+    session: Optional[Session] = None
+) -> Optional[str]:
+    """
+    Adds a job to the queue in the caller's transaction.
+
+    The job is only visible to workers once the caller commits, and disappears if it
+    rolls back, so a job exists exactly when the change it follows up on does. With
+    `JOBS_RUN_INLINE` the job instead runs in the caller's process right after that
+    commit, which keeps tests and scripts synchronous.
+
+    Args:
+        name (str): A job registered with `@job`.
+        payload (Dict[str, Any], optional): JSON-serializable keyword arguments of the handler.
+            Pass IDs, not model instances.
+        idempotency_key (str, optional): Skips the job if one with the same key was ever enqueued.
+        delay (float): Seconds before the job is due.
+        max_attempts (int, optional): Overrides the job's default number of attempts.
+        session (Session, optional): The session to enqueue in. Defaults to `db.session`.
+
+    Returns:
+        Optional[str]: The new job's ID, or None if the idempotency key was already used.
+
+    Raises:
+        ValueError: If no handler is registered under `name`.
+    """
+    definition = get_job(name)
+    if definition is None:
+        raise ValueError(f"No handler is registered for job '{name}'")
+
+    session = session or db.session
+    now = datetime.now()
+    row = {
+        "job_id": generate_uuid(),
+        "job_name": name,
+        "payload": payload or {},
+        "idempotency_key": idempotency_key,
+        "status": JobStatus.PENDING,
+        "attempts": 0,
+        "max_attempts": max_attempts or definition.max_attempts or _config("JOBS_MAX_ATTEMPTS", 5),
+        "run_at": now + timedelta(seconds=delay),
+        "created_at": now,
+    }
+    if idempotency_key is None:
+        session.execute(insert(Jobs.__table__).values(row))
+    elif not _insert_unless_duplicate(session, row):
+        JOBS_ENQUEUED.inc(job=name, result="duplicate")
+        return None
+    JOBS_ENQUEUED.inc(job=name, result="queued")
+
+    if _config("JOBS_RUN_INLINE", False):
+        session.info.setdefault(_INLINE_KEY, []).append(row["job_id"])
+    elif has_app_context():
+        worker = current_app.extensions.get("job_worker")
+        if worker is not None:
+            worker.start()
+    return row["job_id"]
+
+def release_idempotency_key(idempotency_key: str, session: Optional[Session] = None) -> None:
+    """
+    Lets the next `enqueue` with `idempotency_key` add a job again.
+
+    Called by a handler before it starts its work, this coalesces follow-up jobs:
+    changes committed while the job waited share it, and changes committed once it
+    has started enqueue the next one.
+
+    Args:
+        idempotency_key (str): The key to release.
+        session (Session, optional): The session to release it in. Defaults to `db.session`.
+    """
+    (session or db.session).execute(
+        update(Jobs).where(Jobs.idempotency_key == idempotency_key)
+        .values(idempotency_key=None)
+        .execution_options(synchronize_session=False)
+    )
+#endregion ENQUEUE
+
+#region RUN
+def claim_job(worker_id: str) -> Optional[str]:
+    """
+    Claims the earliest due job for `worker_id`.
+
+    A job is due when it is pending and its `run_at` has passed, or when it has been
+    running for longer than `JOBS_LOCK_TIMEOUT_SECONDS` (its worker is assumed dead).
+    Candidates are read with `SKIP LOCKED` where supported, and claimed with a
+    conditional update, so two workers never claim the same attempt.
+
+    Args:
+        worker_id (str): Identifies the claiming worker in `locked_by`.
+
+    Returns:
+        Optional[str]: The claimed job's ID, or None if no job is due.
+    """
+    now = datetime.now()
+    stale = now - timedelta(seconds=_config("JOBS_LOCK_TIMEOUT_SECONDS", 600))
+    query = (
+        select(Jobs.job_id, Jobs.status, Jobs.locked_at)
+        .where(or_(
+            and_(Jobs.status == JobStatus.PENDING, Jobs.run_at <= now),
+            and_(Jobs.status == JobStatus.RUNNING, Jobs.locked_at < stale),
+        ))
+        .order_by(Jobs.run_at)
+        .limit(_config("JOBS_CLAIM_CANDIDATES", 10))
+    )
+    if db.session.get_bind(clause=Jobs.__table__).dialect.name in ("mysql", "mariadb", "postgresql"):
+        query = query.with_for_update(skip_locked=True)
+
+    for candidate in db.session.execute(query).all():
+        claimed = db.session.execute(
+            update(Jobs)
+            .where(
+                Jobs.job_id == candidate.job_id,
+                Jobs.status == candidate.status,
+                Jobs.locked_at == candidate.locked_at if candidate.locked_at is not None else Jobs.locked_at.is_(None),
+            )
+            .values(status=JobStatus.RUNNING, locked_by=worker_id[:JOB_WORKER_ID_LENGTH], locked_at=now, attempts=Jobs.attempts + 1)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if claimed:
+            db.session.commit()
+            return candidate.job_id
+    db.session.commit()
+    return None
+
+def _claim_pending(job_id: str, worker_id: str) -> bool:
+    claimed = db.session.execute(
+        update(Jobs)
+        .where(Jobs.job_id == job_id, Jobs.status == JobStatus.PENDING)
+        .values(status=JobStatus.RUNNING, locked_by=worker_id[:JOB_WORKER_ID_LENGTH], locked_at=datetime.now(), attempts=Jobs.attempts + 1)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.session.commit()
+    return claimed > 0
+
+def retry_delay(attempts: int) -> float:
+    """
+    Returns the seconds to wait before the next attempt of a job that failed `attempts` times.
+
+    The delay doubles with every attempt from `JOBS_BACKOFF_BASE_SECONDS` up to
+    `JOBS_BACKOFF_MAX_SECONDS`, and is jittered so jobs that failed together do not
+    retry together.
+
+    Args:
+        attempts (int): Attempts made so far, at least 1.
+
+    Returns:
+        float: The delay in seconds.
+    """
+    base = _config("JOBS_BACKOFF_BASE_SECONDS", 5.0)
+    ceiling = _config("JOBS_BACKOFF_MAX_SECONDS", 3600.0)
+    return min(ceiling, base * 2 ** (attempts - 1)) * random.uniform(0.5, 1.0)
+
+def _finish(job_id: str, **values: Any) -> None:
+    db.session.execute(
+        update(Jobs).where(Jobs.job_id == job_id).values(locked_by=None, **values).execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+
+def run_job(job_id: str, worker_id: str, claimed: bool = True) -> Optional[JobStatus]:
+    """
+    Runs one attempt of a job and records its outcome.
+
+    On success the job is marked as succeeded in the same transaction as the handler's
+    uncommitted changes. On failure those changes are rolled back and the job is
+    either scheduled again after `retry_delay` or, after its last attempt, marked as
+    failed.
+
+    Args:
+        job_id (str): The job.
+        worker_id (str): Identifies the worker in `locked_by`.
+        claimed (bool): Whether `claim_job` already claimed the job. Otherwise a pending job is claimed first.
+
+    Returns:
+        Optional[JobStatus]: The job's new status, or None if it could not be claimed.
+    """
+    if not claimed and not _claim_pending(job_id, worker_id):
+        return None
+
+    job = db.session.get(Jobs, job_id)
+    if job is None:
+        return None
+    name, payload, attempts, max_attempts = job.job_name, dict(job.payload or {}), job.attempts, job.max_attempts
+
+    definition = get_job(name)
+    if definition is None:
+        logger.error("No handler is registered for job %s (%s)", name, job_id)
+        _finish(job_id, status=JobStatus.FAILED, last_error=f"No handler is registered for job '{name}'", finished_at=datetime.now())
+        JOB_ATTEMPTS.inc(job=name, result="failed")
+        return JobStatus.FAILED
+
+    start = time.perf_counter()
+    try:
+        definition.handler(**payload)
+        db.session.execute(
+            update(Jobs).where(Jobs.job_id == job_id)
+            .values(status=JobStatus.SUCCEEDED, locked_by=None, last_error=None, finished_at=datetime.now())
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        JOB_DURATION.observe(time.perf_counter() - start, job=name)
+        error = f"{type(e).__name__}: {e}"[:ERROR_MAX_LENGTH]
+        if attempts >= max_attempts:
+            logger.exception("Job %s (%s) failed its last attempt (%d)", name, job_id, attempts)
+            _finish(job_id, status=JobStatus.FAILED, last_error=error, finished_at=datetime.now())
+            JOB_ATTEMPTS.inc(job=name, result="failed")
+            return JobStatus.FAILED
+        logger.warning("Job %s (%s) failed attempt %d of %d: %s", name, job_id, attempts, max_attempts, error)
+        _finish(job_id, status=JobStatus.PENDING, last_error=error, run_at=datetime.now() + timedelta(seconds=retry_delay(attempts)))
+        JOB_ATTEMPTS.inc(job=name, result="retried")
+        return JobStatus.PENDING
+
+    JOB_DURATION.observe(time.perf_counter() - start, job=name)
+    JOB_ATTEMPTS.inc(job=name, result="succeeded")
+    return JobStatus.SUCCEEDED
+#endregion RUN
+
+#region INLINE
+def _run_inline_jobs(session: Session) -> None:
+    job_ids = session.info.pop(_INLINE_KEY, None)
+    if not job_ids or not has_app_context():
+        return
+    app = current_app._get_current_object()
+    for job_id in job_ids:
+        # A fresh application context has its own session; the committing one cannot run SQL here
+        with app.app_context():
+            try:
+                run_job(job_id, worker_id="inline", claimed=False)
+            finally:
+                db.session.remove()
+
+def _discard_inline_jobs(session: Session) -> None:
+    session.info.pop(_INLINE_KEY, None)
+
+def register_inline_listeners() -> None:
+    """Makes jobs enqueued with `JOBS_RUN_INLINE` run when their session commits."""
+    if event.contains(Session, "after_commit", _run_inline_jobs):
+        return
+    event.listen(Session, "after_commit", _run_inline_jobs)
+    event.listen(Session, "after_rollback", _discard_inline_jobs)
+#endregion INLINE
@@ -0,0 +1,59 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+
+@dataclass
+class JobDefinition:
+    """A registered job handler.
+
+    Attributes:
+        name (str): The name jobs are enqueued under, e.g. `posts.delete`.
+        handler (Callable): Called with the job's payload as keyword arguments.
+        max_attempts (int, optional): Overrides `JOBS_MAX_ATTEMPTS` for this job.
+    """
+    name: str
+    handler: Callable[..., Any]
+    max_attempts: Optional[int] = None
+
+
+_JOBS: Dict[str, JobDefinition] = {}
+
+
+def job(name: str, max_attempts: Optional[int] = None) -> Callable:
+    """
+    Registers the decorated function as the handler of the jobs named `name`.
+
+    The handler is called with the job's payload as keyword arguments, inside an
+    application context, and the worker commits after it returns. Handlers may commit
+    themselves, e.g. between batches. A job may run more than once (a worker can die
+    after the handler committed but before the job was marked as done), so handlers
+    must be idempotent. The function itself is returned unchanged and can still be
+    called directly.
+
+    Args:
+        name (str): The job name, `<domain>.<action>`.
+        max_attempts (int, optional): Attempts before the job is marked as failed. Defaults to `JOBS_MAX_ATTEMPTS`.
+
+    Returns:
+        Callable: The decorator.
+
+    Raises:
+        ValueError: If another handler is already registered under `name`.
+    """
+    def decorator(handler: Callable[..., Any]) -> Callable[..., Any]:
+        existing = _JOBS.get(name)
+        if existing is not None and existing.handler is not handler:
+            raise ValueError(f"A handler is already registered for job '{name}'")
+        _JOBS[name] = JobDefinition(name, handler, max_attempts)
+        return handler
+    return decorator
+
+
+def get_job(name: str) -> Optional[JobDefinition]:
+    """Returns the definition registered under `name`, or None."""
+    return _JOBS.get(name)
+
+
+def registered_jobs() -> List[str]:
+    """Returns the names of every registered job, sorted."""
+    return sorted(_JOBS)
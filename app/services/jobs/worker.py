@@ -0,0 +1,104 @@
+import logging
+import os
+import socket
+import threading
+from typing import List, Optional
+from flask import Flask
+from app import db
+from app.services.jobs.queue import claim_job, run_job
+
+logger = logging.getLogger(__name__)
+
+
+class JobWorker:
+    """
+    A pool of threads that claim and run due jobs.
+
+    Each thread runs in its own application context, and therefore with its own
+    session and connection, and polls the queue every `poll_interval` seconds while
+    it is empty. Any number of workers, in any number of processes, may share a queue.
+
+    Attributes:
+        app (Flask): The application jobs run in.
+        threads (int): Number of worker threads.
+        poll_interval (float): Seconds an idle thread waits before polling again.
+    """
+    def __init__(self, app: Flask, threads: int = 1, poll_interval: float = 1.0) -> None:
+        self.app = app
+        self.threads = threads
+        self.poll_interval = poll_interval
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self._pid: Optional[int] = None
+
+    def _worker_id(self, index: int) -> str:
+        return f"{socket.gethostname()}:{os.getpid()}:{index}"
+
+    def _loop(self, index: int, once: bool) -> None:
+        worker_id = self._worker_id(index)
+        with self.app.app_context():
+            while not self._stopped.is_set():
+                try:
+                    job_id = claim_job(worker_id)
+                    if job_id is not None:
+                        run_job(job_id, worker_id)
+                except Exception:
+                    # The queue itself failed, e.g. the database is unreachable; back off and try again
+                    logger.exception("Job worker %s failed to claim or record a job", worker_id)
+                    db.session.rollback()
+                    job_id = None
+                finally:
+                    db.session.remove()
+                if job_id is None:
+                    if once:
+                        return
+                    self._stopped.wait(self.poll_interval)
+
+    def run(self, once: bool = False) -> None:
+        """
+        Runs the worker threads in the foreground until `stop` is called.
+
+        Args:
+            once (bool): Return once no job is due instead of polling for more.
+        """
+        self._stopped.clear()
+        self._threads = threads = [
+            threading.Thread(target=self._loop, args=(index, once), name=f"job-worker-{index}", daemon=True)
+            for index in range(self.threads)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            # Join in short steps so the main thread still receives KeyboardInterrupt
+            while thread.is_alive():
+                thread.join(timeout=0.5)
+
+    def start(self) -> None:
+        """Starts the worker threads in the background, once per process."""
+        # Worker processes forked after the worker was created need their own threads
+        if self._pid == os.getpid() and any(thread.is_alive() for thread in self._threads):
+            return
+        with self._lock:
+            if self._pid == os.getpid() and any(thread.is_alive() for thread in self._threads):
+                return
+            self._pid = os.getpid()
+            self._stopped.clear()
+            self._threads = [
+                threading.Thread(target=self._loop, args=(index, False), name=f"job-worker-{index}", daemon=True)
+                for index in range(self.threads)
+            ]
+            for thread in self._threads:
+                thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Asks the threads to stop after their current job and waits for them.
+
+        Args:
+            timeout (float, optional): Seconds to wait for each thread. Defaults to waiting until it stops.
+        """
+        self._stopped.set()
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout=timeout)
@@ -2,6 +2,7 @@ from sqlalchemy import and_
 from typing import Optional, Tuple, Dict, Any
 from flask import Response, jsonify
 from app.models import ProfileAccessories
+from app.types.enum import CountStrategy
 from app.utils.io import paginate_query, build_filter_conditions, build_sort_conditions
 from app.types.mappings.filters import PROFILE_ACCESSORIES_FILTER_MAPPINGS
 from app.types.mappings.sorting import PROFILE_ACCESSORIES_SORTING_MAPPINGS
@@ -37,7 +38,9 @@ def get_profile_accessories(page: int, per_page: int, filters: Optional[Dict[str
             query=query,
             per_page=per_page,
             page=page,
-            items_name="profile_accessories"
+            items_name="profile_accessories",
+            # ilike filters scan the whole catalog; the count barely changes, so reuse it briefly
+            count_strategy=CountStrategy.CACHED
         )
         
         return jsonify(data), 200
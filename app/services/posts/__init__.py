@@ -6,11 +6,12 @@ from app.services.posts.delete_post import delete_post
 from app.services.posts.get_posts_for_user import get_posts_for_user
 from app.services.posts.react import react_to_post, unreact_to_post
 from app.services.posts.comment import get_comments_for_post, comment_on_post, delete_comment, like_comment, unlike_comment
+from app.utils.io import get_pagination_params, get_cursor_params
 
 # ----------------- GET POSTS ----------------- #
 def get_posts_service(post_id: Optional[int], private_user_id: Optional[str]) -> Tuple[Response, int]:
     """
-    Fetches posts from the database, either a specific post by ID or all posts.
+    Fetches posts from the database, either a specific post by ID or a page of posts.
 
     This function performs the following tasks:
     - If a `post_id` is provided:
@@ -18,21 +19,27 @@ def get_posts_service(post_id: Optional[int], private_user_id: Optional[str]) ->
     - Returns a JSON response containing the post details if found.
     - If the post is not found, returns a JSON response with an error message and a 404 status code.
     - If no `post_id` is provided:
-    - Retrieves all posts from the database.
-    - Returns a JSON response containing a list of all posts.
+    - Retrieves a page of posts, newest first. The page is selected with the `c` cursor
+      parameter and sized with `pp`; `count=true` adds an estimated total.
+    - Returns a JSON response containing the posts and pagination metadata.
 
     Args:
-        post_id (Optional[int]): The ID of the post to retrieve. If not provided, all posts are returned.
+        post_id (Optional[int]): The ID of the post to retrieve. If not provided, a page of posts is returned.
+        private_user_id (Optional[str]): The private ID of the viewing user, used for their reactions.
 
     Returns:
         Tuple[Response, int]: 
-            - Response: JSON response containing the post details or a list of all posts. 
-            - int: HTTP status code (200 for successful retrieval, 404 if a specific post is not found).
+            - Response: JSON response containing the post details or a page of posts. 
+            - int: HTTP status code (200 for successful retrieval, 400 for an invalid cursor, 404 if a specific post is not found).
 
     Raises:
         - 404 Not Found: If a specific post ID is provided but no matching post is found in the database.
     """
-    return get_posts(post_id, private_user_id)
+    if post_id:
+        return get_posts(post_id, private_user_id)
+    _, per_page = get_pagination_params()
+    cursor, with_total = get_cursor_params()
+    return get_posts(None, private_user_id, cursor=cursor, per_page=per_page, with_total=with_total)
 
 # ----------------- CREATE POST ----------------- #
 def create_post_service(private_user_id: str, post_data: dict) -> Tuple[Response, int]:
@@ -81,7 +88,7 @@ def create_post_service(private_user_id: str, post_data: dict) -> Tuple[Response
 # ----------------- DELETE POST ----------------- #
 def delete_post_service(private_user_id: str, post_id: int) -> Tuple[Response, int]:
     """
-    Deletes a post from the database based on the post ID.
+    Schedules the deletion of a post based on the post ID.
 
     Args:
         private_user_id (str): The private user ID of the user deleting the post.
@@ -89,7 +96,7 @@ def delete_post_service(private_user_id: str, post_id: int) -> Tuple[Response, i
 
     Returns:
         Tuple[Response, int]: A tuple containing the Flask response object and an HTTP status code.
-            - If the post is successfully deleted, returns a JSON response with a success message and a 200 status code.
+            - If the deletion is scheduled, returns a JSON response with a success message and a 202 status code.
             - If the post is not found, returns a JSON response with an error message and a 404 status code.
             - If an error occurs during deletion, returns a JSON response with an error message and a 500 status code.
     """
@@ -44,7 +44,7 @@ def comment_on_post(private_user_id: str, post_id: int, comment_data: dict) -> T
             return jsonify({"error": "User not found"}), 404
         
         # Check if the post exists
-        post = Posts.query.get(post_id)
+        post = Posts.query.filter_by(post_id=post_id, deleted_at=None).first()
         if not post:
             return jsonify({"error": "Post not found"}), 404
         
@@ -12,7 +12,7 @@ def delete_comment(private_user_id: str, post_id: int, comment_id: int) -> Tuple
             return jsonify({"error": "User not found"}), 404
         
         # Check if the post exists
-        post = Posts.query.get(post_id)
+        post = Posts.query.filter_by(post_id=post_id, deleted_at=None).first()
         if not post:
             return jsonify({"error": "Post not found"}), 404
         
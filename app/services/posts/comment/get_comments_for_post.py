@@ -23,7 +23,7 @@ def get_comments_for_post(post_id: int) -> Tuple[Response, int]:
     """
     try:
         # Check if the post exists
-        post = Posts.query.get(post_id)
+        post = Posts.query.filter_by(post_id=post_id, deleted_at=None).first()
         if not post:
             return jsonify({"error": "Post not found"}), 404
         
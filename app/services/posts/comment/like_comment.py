@@ -1,6 +1,7 @@
 from typing import Tuple
 from flask import Response, jsonify
 from app import db
+from app.utils.counters import increment_counter
 from app.models import Users, Posts, PostComments, PostCommentLikes, PostCommentLikeCounts
 
 
@@ -36,7 +37,7 @@ def like_comment(private_user_id: str, post_id: int, comment_id: int) -> Tuple[R
             return jsonify({"error": "User not found"}), 404
         
         # Check if the post exists
-        post = Posts.query.get(post_id)
+        post = Posts.query.filter_by(post_id=post_id, deleted_at=None).first()
         if not post:
             return jsonify({"error": "Post not found"}), 404
         
@@ -57,8 +58,7 @@ def like_comment(private_user_id: str, post_id: int, comment_id: int) -> Tuple[R
         db.session.add(new_like)
 
         # Increment the like count for the comment
-        like_count = PostCommentLikeCounts.query.filter_by(post_comment_id=comment_id).first()
-        like_count.post_comment_like_count += 1
+        increment_counter(PostCommentLikeCounts.post_comment_like_count, PostCommentLikeCounts.post_comment_id == comment_id)
 
         # Commit the changes to the database
         db.session.commit()
@@ -1,8 +1,14 @@
 from app import db
 from typing import Tuple
-from flask import jsonify, Response
+from flask import current_app, jsonify, Response
+from app.types.enum import PostType
+from app.services.feed.timeline import schedule_fan_out
+from app.utils.cache import mark_user_changed
+from app.utils.counters import increment_counter
+from app.utils.id_generation import generate_uuid
 from app.utils.validation import validate_required_fields
-from app.models import Users, UserStats, HashTags, PostCategories, PostMedia, Posts, PostHashTags, PostReactionCounts, PostReactionTypes
+from app.models import Users, UserStats, HashTags, PostCategories, PostMedia, Posts, PostHashTags
+from app.models.post.hashtags import normalize_hashtag_name, valid_hashtag_name
 
 def create_post(private_user_id: str, post_data: dict) -> Tuple[Response, int]:
     """
@@ -33,11 +39,11 @@ def create_post(private_user_id: str, post_data: dict) -> Tuple[Response, int]:
     Process:
         1. Validates required fields using `validate_required_fields`.
         2. Checks if the specified user and category exist in the database.
-        3. Validates the post type.
-        4. Creates the post and increments the post count for the user.
-        5. Adds associated media to the post.
-        6. Adds associated hashtags to the post and increments the post count for each hashtag.
-        7. Commits the transaction to the database and returns a success message.
+        3. Validates the post type, the media and the hashtags, which are normalized and deduplicated.
+        4. Creates the post with its media. Reaction counts are sparse, so no rows are created for them.
+        5. Resolves the hashtags with `HashTags.resolve_names`, creating missing ones, and links them to the post.
+        6. Increments the post counts of the user and the hashtags with set-based `UPDATE` statements.
+        7. Commits everything in a single transaction and returns a success message.
 
     Raises:
         - ValidationError: If required fields are missing or invalid.
@@ -68,70 +74,61 @@ def create_post(private_user_id: str, post_data: dict) -> Tuple[Response, int]:
             return jsonify({"message": "Category not found"}), 404
         
         # Check if the post type is valid
-        if post_data["post_type"] not in Posts.PostType.__members__:
+        if post_data["post_type"] not in PostType.__members__:
             return jsonify({"message": "Invalid post type"}), 400
-        
+
+        # Check that the media are well formed
+        media_urls = post_data.get("media_urls") or []
+        if not isinstance(media_urls, list) or not all(isinstance(media, dict) and "url" in media and "size" in media for media in media_urls):
+            return jsonify({"message": "Each media item requires a 'url' and a 'size'"}), 400
+
+        # Normalize the hashtags, keeping the first occurrence of each
+        hashtags = post_data.get("hashtags") or []
+        if not isinstance(hashtags, list) or not all(isinstance(hashtag, str) for hashtag in hashtags):
+            return jsonify({"message": "'hashtags' must be a list of strings"}), 400
+        hashtag_names = list(dict.fromkeys(normalize_hashtag_name(hashtag) for hashtag in hashtags))
+        invalid_hashtags = [name for name in hashtag_names if not valid_hashtag_name(name)]
+        if invalid_hashtags:
+            return jsonify({"message": "Invalid hashtags", "hashtags": invalid_hashtags}), 400
+
         # Create the post
         new_post = Posts(
+            post_id=generate_uuid(),
             post_caption=post_data.get("post_caption"),
-            post_type=Posts.PostType[post_data["post_type"]],
+            post_type=PostType[post_data["post_type"]],
             post_category_id=post_data["post_category_id"],
             user_id=private_user_id,
+            # Summaries are only maintained while they are read
+            reaction_summary={} if current_app.config.get("REACTION_SUMMARY_ENABLED", False) else None,
         )
-
-        # Increment the post count for the user
-        user_stats = UserStats.query.filter_by(user_id=private_user_id).first()
-        user_stats.post_count += 1
-
-        # Save the post to the database first
         db.session.add(new_post)
+        # The post row must exist before the rows referencing it are inserted
+        db.session.flush()
+
+        # The unit of work batches rows of the same table into a single INSERT
+        db.session.add_all([
+            PostMedia(
+                post_id=new_post.post_id,
+                media_url=media["url"],
+                media_size_bytes=media["size"],
+                media_order=index
+            )
+            for index, media in enumerate(media_urls)
+        ])
 
-        # Get unique post reaction types
-        reaction_types = PostReactionTypes.query.all()
+        # Add the hashtags to the post
+        hashtag_ids = list(HashTags.resolve_names(hashtag_names).values())
+        db.session.add_all([PostHashTags(post_id=new_post.post_id, hashtag_id=hashtag_id) for hashtag_id in hashtag_ids])
 
-        # Create post reaction counts for each reaction type
-        for reaction_type in reaction_types:
-            post_reaction_count = PostReactionCounts(post_id=new_post.post_id, post_reaction_type=reaction_type.post_reaction_type)
-            db.session.add(post_reaction_count)
+        # Increment the post counts in the database rather than from values read earlier
+        increment_counter(UserStats.post_count, UserStats.user_id == private_user_id)
+        mark_user_changed(db.session, private_user_id)
+        if hashtag_ids:
+            increment_counter(HashTags.post_count, HashTags.hashtag_id.in_(hashtag_ids))
 
-        # Commit the initial post and reaction counts to the database
-        db.session.commit()
-        
-        # Add the media to the post if available
-        if "media_urls" in post_data:
-            for index, media_data in enumerate(post_data["media_urls"]):
-                media_url = media_data["url"]
-                media_size = media_data["size"]
-                media = PostMedia(
-                    post_id=new_post.post_id,
-                    media_url=media_url,
-                    media_size_bytes=media_size,
-                    media_order=index
-                )
-                db.session.add(media)
+        # Deliver the post to the followers' timelines in the background, unless the author is a celebrity
+        schedule_fan_out(new_post)
 
-        # Add the hashtags to the post
-        # TODO: Ensure hashtags are one word and lowercase
-        if "hashtags" in post_data:
-            for hashtag in post_data["hashtags"]:
-                hashtag = hashtag.lower().replace(" ", "")
-
-                # Check if the hashtag exists
-                hashtag_obj = HashTags.query.filter_by(hashtag_name=hashtag).first()
-                if not hashtag_obj:
-                    hashtag_obj = HashTags(hashtag_name=hashtag)
-                    db.session.add(hashtag_obj)
-                    db.session.commit()
-                
-                # Add the hashtag to the post
-                post_hashtag = PostHashTags(post_id=new_post.post_id, hashtag_id=hashtag_obj.hashtag_id)
-                db.session.add(post_hashtag)
-
-                # Increment the post count for the hashtag
-                hashtag_obj.post_count += 1
-                db.session.commit()
-        
-        # Commit all changes to the database after adding media and hashtags
         db.session.commit()
 
         return jsonify({"message": "Post created successfully", "post": new_post.to_dict()}), 201
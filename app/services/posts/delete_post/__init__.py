@@ -1,12 +1,21 @@
 from app import db
+from datetime import datetime
 from typing import Tuple
 from flask import jsonify, Response
-from app.models import Users, Posts, UserStats
+from app.models import Posts, UserStats, HashTags
+from app.services.feed.timeline import schedule_timeline_job
+from app.services.jobs import job, enqueue
+from app.utils.cache import mark_user_changed
+from app.utils.counters import increment_counter
 
 
 def delete_post(private_user_id: str, post_id: int) -> Tuple[Response, int]:
     """
-    Deletes a post from the database based on the post ID.
+    Deletes a post based on the post ID.
+
+    The post is marked deleted, which hides it at once, and the user's and hashtags'
+    post counts are updated. The post, its comments, reactions and hashtags are then
+    deleted by the `posts.delete` job, so the request does not wait for the cascade.
 
     Args:
         private_user_id (str): The private user ID of the user deleting the post.
@@ -14,12 +23,12 @@ def delete_post(private_user_id: str, post_id: int) -> Tuple[Response, int]:
 
     Returns:
         Tuple[Response, int]: A tuple containing the Flask response object and an HTTP status code.
-            - If the post is successfully deleted, returns a JSON response with a success message and a 200 status code.
+            - If the post is deleted, returns a JSON response with a success message and a 202 status code.
             - If the post is not found, returns a JSON response with an error message and a 404 status code.
-            - If an error occurs during deletion, returns a JSON response with an error message and a 500 status code.
+            - If an error occurs during the deletion, returns a JSON response with an error message and a 500 status code.
     """
     # Query the post from the database
-    post = Posts.query.filter_by(post_id=post_id).first()
+    post = Posts.query.filter_by(post_id=post_id, deleted_at=None).first()
 
     # Check if the post exists
     if post is None:
@@ -31,20 +40,44 @@ def delete_post(private_user_id: str, post_id: int) -> Tuple[Response, int]:
         return jsonify({"message": "Unauthorized to delete this post"}), 403
 
     try:
-        # Decrease the post count for the user
-        user = Users.query.filter_by(private_user_id=post.user_id).first()
-        if user is not None:
-            user_stats = UserStats.query.filter_by(user_id=user.private_user_id).first()
-            user_stats.post_count -= 1
-            db.session.commit()
-        
-        # Delete the post from the database
-        db.session.delete(post)
+        # Hide the post before the request returns
+        post.deleted_at = datetime.now()
+
+        # Decrease the post counts of the user and the post's hashtags
+        increment_counter(UserStats.post_count, UserStats.user_id == post.user_id, amount=-1)
+        mark_user_changed(db.session, post.user_id)
+        hashtag_ids = [post_hashtag.hashtag_id for post_hashtag in post.post_hashtags]
+        if hashtag_ids:
+            increment_counter(HashTags.post_count, HashTags.hashtag_id.in_(hashtag_ids), amount=-1)
+
+        # Delete the post and everything cascading from it in the background
+        enqueue("posts.delete", {"post_id": post_id}, idempotency_key=f"posts.delete:{post_id}")
         db.session.commit()
-        # Return a 200 OK status code with a success message
-        return jsonify({"message": "Post deleted"}), 200
+
+        # Return a 202 Accepted status code with a success message
+        return jsonify({"message": "Post deleted"}), 202
     except Exception as e:
         # Rollback the transaction in case of an error
         db.session.rollback()
         # Return a 500 Internal Server Error status code with error details
         return jsonify({"message": "Error deleting post", "error": str(e)}), 500
+
+@job("posts.delete")
+def delete_post_job(post_id: str) -> None:
+    """
+    Deletes a post marked deleted with its comments, reactions and hashtags.
+
+    Does nothing if the post is already gone, so a retried attempt is harmless.
+
+    Args:
+        post_id (str): The ID of the post to delete.
+    """
+    post = db.session.get(Posts, post_id)
+    if post is None or post.deleted_at is None:
+        return
+
+    # Delete the post from the database
+    db.session.delete(post)
+
+    # Remove the post from the timelines it was delivered to
+    schedule_timeline_job("timelines.remove_post", post_id=post_id)
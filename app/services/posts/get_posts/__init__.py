@@ -1,10 +1,24 @@
 from typing import Optional, Tuple
 from flask import Response, jsonify
-from app.models import Posts
+from app.models import Posts, PostReactions
+from app.utils.etag import conditional_response, make_etag
+from app.utils.counter_buffer import increment_counter_buffered
+from app.utils.io import PER_PAGE, keyset_paginate, InvalidCursorError
+from app.utils.query_tracking import query_budget
+from app.types.enum import CountStrategy
 
-def get_posts(post_id: Optional[int], private_user_id: Optional[str]) -> Tuple[Response, int]:
+# Newest posts first; post_id breaks ties so the order is unique
+POSTS_CURSOR_KEYS = [(Posts.created_at, "desc"), (Posts.post_id, "desc")]
+
+def get_posts(
+    post_id: Optional[int],
+    private_user_id: Optional[str],
+    cursor: Optional[str] = None,
+    per_page: int = PER_PAGE,
+    with_total: bool = False
+) -> Tuple[Response, int]:
     """
-    Fetches posts from the database, either a specific post by ID or all posts.
+    Fetches posts from the database, either a specific post by ID or a page of posts.
 
     This function performs the following tasks:
     - If a `post_id` is provided:
@@ -12,27 +26,76 @@ def get_posts(post_id: Optional[int], private_user_id: Optional[str]) -> Tuple[R
     - Returns a JSON response containing the post details if found.
     - If the post is not found, returns a JSON response with an error message and a 404 status code.
     - If no `post_id` is provided:
-    - Retrieves all posts from the database.
-    - Returns a JSON response containing a list of all posts.
+    - Retrieves a page of posts, newest first, using keyset pagination.
+    - Returns a JSON response containing the posts and pagination metadata.
 
     Args:
-        post_id (Optional[int]): The ID of the post to retrieve. If not provided, all posts are returned.
+        post_id (Optional[int]): The ID of the post to retrieve. If not provided, a page of posts is returned.
+        private_user_id (Optional[str]): The private ID of the viewing user, used for their reactions.
+        cursor (Optional[str]): The cursor of the page to retrieve. None or empty for the first page.
+        per_page (int): The number of posts per page.
+        with_total (bool): Whether to include an estimated total in `_meta`.
 
     Returns:
         Tuple[Response, int]: 
-            - Response: JSON response containing the post details or a list of all posts. 
-            - int: HTTP status code (200 for successful retrieval, 404 if a specific post is not found).
+            - Response: JSON response containing the post details or a page of posts. 
+            - int: HTTP status code (200 for successful retrieval, 400 for an invalid cursor, 404 if a specific post is not found).
 
     Raises:
         - 404 Not Found: If a specific post ID is provided but no matching post is found in the database.
     """
     # Get post by ID if post_id is provided
     if post_id:
-        post = Posts.query.get(post_id)
-        if not post:
+        stamp = Posts.version_stamp(post_id, user_id=private_user_id if private_user_id else None)
+        if stamp is None:
             return jsonify({"error": "Post not found"}), 404
-        return jsonify(post.to_dict(user_id=private_user_id if private_user_id else None)), 200
+
+        # Count the view without writing in this request; the buffer flushes it in the background
+        increment_counter_buffered(Posts.view_count, post_id)
+
+        def build() -> Tuple[Response, int]:
+            post = Posts.query.filter_by(post_id=post_id, deleted_at=None).first()
+            if not post:
+                return jsonify({"error": "Post not found"}), 404
+            # The ETag was stamped from the database, so render the poster from it too
+            return jsonify(post.to_dict(user_id=private_user_id if private_user_id else None, use_cache=False)), 200
+
+        # The representation includes the viewer's reaction, so it varies with the token
+        return conditional_response(make_etag("post", stamp), build, vary=("Authorization",))
     
-    # Get all posts if post_id is not provided
-    posts = Posts.query.all()
-    return jsonify([post.to_dict(user_id=private_user_id if private_user_id else None) for post in posts]), 200
\ No newline at end of file
+    # Get a page of posts if post_id is not provided
+    try:
+        return get_posts_page(private_user_id, cursor, per_page, with_total)
+    except InvalidCursorError as e:
+        return jsonify({"error": str(e)}), 400
+
+@query_budget(8)
+def get_posts_page(private_user_id: Optional[str], cursor: Optional[str], per_page: int, with_total: bool) -> Tuple[Response, int]:
+    """
+    Fetches a page of posts, newest first, with everything `Posts.to_dict` needs eagerly loaded.
+
+    The page is loaded with a fixed number of queries regardless of its size: one for the
+    posts with their category and poster, one per collection, one for the viewer's
+    reactions and the optional count.
+
+    Args:
+        private_user_id (Optional[str]): The private ID of the viewing user, used for their reactions.
+        cursor (Optional[str]): The cursor of the page to retrieve. None or empty for the first page.
+        per_page (int): The number of posts per page.
+        with_total (bool): Whether to include an estimated total in `_meta`.
+
+    Returns:
+        Tuple[Response, int]: JSON response containing the posts and `_meta`, and HTTP 200.
+    """
+    user_id = private_user_id if private_user_id else None
+    data = keyset_paginate(
+        query=Posts.query.filter_by(deleted_at=None).options(*Posts.to_dict_loader_options()),
+        keys=POSTS_CURSOR_KEYS,
+        cursor=cursor,
+        per_page=per_page,
+        items_name="posts",
+        prepare=lambda posts: PostReactions.load_viewer_reactions(user_id, [post.post_id for post in posts]) if user_id else {},
+        to_representation=lambda post, viewer_reactions: post.to_dict(user_id=user_id, viewer_reactions=viewer_reactions),
+        count_strategy=CountStrategy.ESTIMATED if with_total else CountStrategy.NONE
+    )
+    return jsonify(data), 200
\ No newline at end of file
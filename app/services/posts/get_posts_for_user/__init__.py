@@ -17,13 +17,13 @@ def get_posts_for_user(public_user_id: str) -> Tuple[Response, int]:
     """
     try:
         # Check if the user exists in the database
-        user = Users.query.filter_by(public_user_id=public_user_id).first()
+        user = Users.query.filter_by(public_user_id=public_user_id, deleted_at=None).first()
 
         if user is None:
             return jsonify({"message": "User not found"}), 404
         
         # Query posts for the specified user
-        posts = Posts.query.filter_by(user_id=user.private_user_id).all()
+        posts = Posts.query.filter_by(user_id=user.private_user_id, deleted_at=None).all()
 
         # Return posts
         return jsonify([post.to_dict(exclude_fields=["user"]) for post in posts]), 200
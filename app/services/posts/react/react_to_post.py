@@ -35,36 +35,23 @@ def react_to_post(private_user_id: str, post_id: int, reaction: str) -> Tuple[Re
             return jsonify({"message": "User not found"}), 404
         
         # Check if the post exists
-        post = Posts.query.filter_by(post_id=post_id).first()
+        post = Posts.query.filter_by(post_id=post_id, deleted_at=None).first()
         if post is None:
             return jsonify({"message": "Post not found"}), 404
         
         # Check if the reaction is valid
-        post_reaction = PostReactionTypes.query.filter_by(post_reaction_type=reaction).first()
-        if post_reaction is None:
+        if reaction not in PostReactionTypes.names():
             return jsonify({"message": "Invalid reaction type"}), 400
 
         # Check if the user has already reacted to the post
         existing_reaction = PostReactions.query.filter_by(post_id=post_id, user_id=private_user_id).first()
         if existing_reaction:
-            # Decrement the old reaction count
-            reaction_count = PostReactionCounts.query.filter_by(post_id=post_id, post_reaction_type=existing_reaction.post_reaction_type).first()
-            reaction_count.reaction_count -= 1
+            if existing_reaction.post_reaction_type == reaction:
+                return jsonify({"message": f"Successfully reacted to post"}), 200
 
-            # Delete the existing reaction
-            db.session.delete(existing_reaction)
-
-            # Create a new reaction
-            new_reaction = PostReactions(
-                post_id=post_id,
-                user_id=private_user_id,
-                post_reaction_type=reaction
-            )
-            db.session.add(new_reaction)
-
-            # Increment the new reaction count
-            new_reaction_count = PostReactionCounts.query.filter_by(post_id=post_id, post_reaction_type=reaction).first()
-            new_reaction_count.reaction_count += 1
+            # Decrement the old reaction count and switch the reaction
+            PostReactionCounts.decrement(post_id, existing_reaction.post_reaction_type)
+            existing_reaction.post_reaction_type = reaction
         else:
             # Create a new reaction
             new_reaction = PostReactions(
@@ -74,9 +61,8 @@ def react_to_post(private_user_id: str, post_id: int, reaction: str) -> Tuple[Re
             )
             db.session.add(new_reaction)
 
-            # Update the reaction count
-            reaction_count = PostReactionCounts.query.filter_by(post_id=post_id, post_reaction_type=reaction).first()
-            reaction_count.reaction_count += 1   
+        # Increment the reaction count, creating its row on the first reaction of this type
+        PostReactionCounts.increment(post_id, reaction)
 
         db.session.commit()  
         
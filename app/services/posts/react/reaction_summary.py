@@ -0,0 +1,75 @@
+from flask import Flask, current_app
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+from app import db
+from app.models import Posts
+from app.models.post.posts import REACTION_SUMMARY_STALE_KEY
+from app.services.jobs import job, enqueue, release_idempotency_key
+
+
+def _summary_key(post_id: str) -> str:
+    return f"posts.reaction_summary:{post_id}"
+
+
+@job("posts.refresh_reaction_summary")
+def refresh_reaction_summary_job(post_id: str) -> None:
+    """
+    Recomputes a post's reaction summary from its reaction count rows.
+
+    The job's idempotency key is released first, so reactions committed from then on
+    schedule another refresh, while those committed before share this one.
+
+    Args:
+        post_id (str): The post.
+    """
+    release_idempotency_key(_summary_key(post_id))
+    db.session.commit()
+    Posts.refresh_reaction_summary(post_id)
+
+
+def _enqueue_refreshes(session: Session) -> None:
+    post_ids = session.info.pop(REACTION_SUMMARY_STALE_KEY, None)
+    if not post_ids:
+        return
+    delay = current_app.config.get("REACTION_SUMMARY_REFRESH_DELAY_SECONDS", 1.0)
+    for post_id in sorted(post_ids):
+        enqueue("posts.refresh_reaction_summary", {"post_id": post_id}, idempotency_key=_summary_key(post_id), delay=delay, session=session)
+
+
+def _discard_refreshes(session: Session) -> None:
+    session.info.pop(REACTION_SUMMARY_STALE_KEY, None)
+
+
+def init_reaction_summary(app: Flask) -> None:
+    """
+    Refreshes the reaction summaries of posts whose reaction counts changed, if `REACTION_SUMMARY_ENABLED`.
+
+    Each commit that changed a post's count rows enqueues a `posts.refresh_reaction_summary`
+    job in the same transaction, due `REACTION_SUMMARY_REFRESH_DELAY_SECONDS` later. Changes
+    to the same post share one pending job. Summaries are not maintained while the setting
+    is off, so run `flask posts refresh-reaction-summaries` after turning it on.
+
+    Args:
+        app (Flask): The application.
+    """
+    app.config.setdefault("REACTION_SUMMARY_ENABLED", False)
+    app.config.setdefault("REACTION_SUMMARY_REFRESH_DELAY_SECONDS", 1.0)
+
+    @app.cli.group("posts")
+    def posts_cli():
+        """Post commands."""
+
+    @posts_cli.command("refresh-reaction-summaries")
+    def refresh_reaction_summaries_command():
+        """Recompute the reaction summary of every post from its reaction count rows."""
+        post_ids = db.session.execute(select(Posts.post_id)).scalars().all()
+        db.session.rollback()
+        for post_id in post_ids:
+            Posts.refresh_reaction_summary(post_id)
+            db.session.commit()
+        print(f"Refreshed the reaction summaries of {len(post_ids)} posts.")
+
+    if not app.config["REACTION_SUMMARY_ENABLED"] or event.contains(Session, "before_commit", _enqueue_refreshes):
+        return
+    event.listen(Session, "before_commit", _enqueue_refreshes)
+    event.listen(Session, "after_rollback", _discard_refreshes)
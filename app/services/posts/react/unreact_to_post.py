@@ -32,7 +32,7 @@ def unreact_to_post(private_user_id: str, post_id: int) -> Tuple[Response, int]:
             return jsonify({"message": "User not found"}), 404
         
         # Check if the post exists
-        post = Posts.query.filter_by(post_id=post_id).first()
+        post = Posts.query.filter_by(post_id=post_id, deleted_at=None).first()
         if post is None:
             return jsonify({"message": "Post not found"}), 404
 
@@ -40,8 +40,7 @@ def unreact_to_post(private_user_id: str, post_id: int) -> Tuple[Response, int]:
         existing_reaction = PostReactions.query.filter_by(post_id=post_id, user_id=private_user_id).first()
         if existing_reaction:
             # Update the reaction count
-            reaction_count = PostReactionCounts.query.filter_by(post_id=post_id, post_reaction_type=existing_reaction.post_reaction_type).first()
-            reaction_count.reaction_count -= 1
+            PostReactionCounts.decrement(post_id, existing_reaction.post_reaction_type)
 
             # Delete the existing reaction
             db.session.delete(existing_reaction)
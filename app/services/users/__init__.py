@@ -9,6 +9,7 @@ from app.services.users.follow_user import follow_user
 from app.services.users.unfollow_user import unfollow_user
 from app.services.users.get_user_followers import get_user_followers
 from app.services.users.get_user_following import get_user_following
+from app.utils.io import get_pagination_params, get_cursor_params
 
 # ----------------- CREATE USER ----------------- #
 def create_user_service(user_data: dict) -> Tuple[Response, int]:
@@ -103,20 +104,20 @@ def update_user_service(private_user_id: str, user_data: dict) -> Tuple[Response
     return update_user(private_user_id, user_data)
 
 # ----------------- DELETE USER ----------------- #
-def delete_user_service(public_user_id: str) -> Tuple[Response, int]:
+def delete_user_service(private_user_id: str) -> Tuple[Response, int]:
 
     """
-    Deletes a user from the database based on the user ID.
+    Schedules the deletion of a user based on the user ID.
 
     Args:
-        user_id (int): The ID of the user to delete.
+        private_user_id (str): The private ID of the user to delete.
 
     Returns:
         Tuple[Response, int]: A tuple containing the Flask response object and an HTTP status code.
-            - If the user is successfully deleted, returns a 204 status code.
+            - If the deletion is scheduled, returns a JSON response with a success message and a 202 status code.
             - If the user is not found, returns a JSON response with an error message and a 404 status code.
     """
-    return delete_user(public_user_id)
+    return delete_user(private_user_id)
 
 # ----------------- GET USER FOLLOWERS ----------------- #
 def get_user_followers_service(public_user_id: str) -> Tuple[Response, int]:
@@ -129,9 +130,12 @@ def get_user_followers_service(public_user_id: str) -> Tuple[Response, int]:
     Returns:
         Tuple[Response, int]: A tuple containing the Flask response object and an HTTP status code.
             - 200 OK: If the followers are successfully retrieved.
+            - 400 Bad Request: If the pagination cursor is invalid.
             - 404 Not Found: If the user with the specified public_user_id is not found.
     """
-    return get_user_followers(public_user_id)
+    page, per_page = get_pagination_params()
+    cursor, with_total = get_cursor_params()
+    return get_user_followers(public_user_id, page=page, per_page=per_page, cursor=cursor, with_total=with_total)
 
 # ----------------- GET USER FOLLOWING ----------------- #
 def get_user_following_service(public_user_id: str) -> Tuple[Response, int]:
@@ -1,37 +1,81 @@
 from app import db
+from datetime import datetime
 from flask import jsonify
 from typing import Tuple
 from flask import Response
-from app.models import Users
+from sqlalchemy import update
+from app.models import Users, Posts
+from app.services.auth.token_generation import forget_token_generation
+from app.services.feed.timeline import schedule_timeline_job
+from app.services.jobs import job, enqueue
+from app.utils.counters import increment_counter
 
 
-def delete_user(public_user_id: str) -> Tuple[Response, int] :
+def delete_user(private_user_id: str) -> Tuple[Response, int] :
     """
-    Deletes a user from the database based on the user ID.
+    Deletes a user based on the user ID.
+
+    The user and their posts are marked deleted, which hides them at once, and the
+    user's token generation is incremented, which revokes every token issued to them.
+    The user and everything cascading from it are then deleted by the `users.delete`
+    job, so the request does not wait for the cascade.
 
     Args:
-        user_id (int): The ID of the user to delete.
+        private_user_id (str): The private ID of the user to delete.
 
     Returns:
         Tuple[Response, int]: A tuple containing the Flask response object and an HTTP status code.
-            - If the user is successfully deleted, returns a JSON response with a success message and a 200 status code.
+            - If the user is deleted, returns a JSON response with a success message and a 202 status code.
             - If the user is not found, returns a JSON response with an error message and a 404 status code.
+            - If an error occurs during the deletion, returns a JSON response with an error message and a 500 status code.
     """
     # Query the user from the database
-    user = Users.query.filter_by(public_user_id=public_user_id).first()
+    user = Users.query.filter_by(private_user_id=private_user_id, deleted_at=None).first()
 
     if user is None:
         # If the user is not found, return a 404 error
         return jsonify({"message": "User not found"}), 404
 
     try:
-        # Delete the user from the database
-        db.session.delete(user)
+        # Hide the user and their posts, and log them out, before the request returns
+        deleted_at = datetime.now()
+        user.deleted_at = deleted_at
+        db.session.execute(
+            update(Posts)
+            .where(Posts.user_id == private_user_id, Posts.deleted_at.is_(None))
+            .values(deleted_at=deleted_at)
+        )
+        increment_counter(Users.token_generation, Users.private_user_id == private_user_id)
+
+        # Delete the user and everything cascading from it in the background
+        enqueue("users.delete", {"private_user_id": private_user_id}, idempotency_key=f"users.delete:{private_user_id}")
         db.session.commit()
-        # Return a 200 OK status code with a success message
-        return jsonify({"message": "User deleted"}), 200
+
+        forget_token_generation(private_user_id)
+
+        # Return a 202 Accepted status code with a success message
+        return jsonify({"message": "User deleted"}), 202
     except Exception as e:
         # Rollback the transaction in case of an error
         db.session.rollback()
         # Return a 500 Internal Server Error status code with error details
-        return jsonify({"message": "Error deleting user", "error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"message": "Error deleting user", "error": str(e)}), 500
+
+@job("users.delete")
+def delete_user_job(private_user_id: str) -> None:
+    """
+    Deletes a user marked deleted and everything cascading from it.
+
+    Does nothing if the user is already gone, so a retried attempt is harmless.
+
+    Args:
+        private_user_id (str): The private ID of the user to delete.
+    """
+    user = db.session.get(Users, private_user_id)
+    if user is None or user.deleted_at is None:
+        return
+
+    db.session.delete(user)
+
+    # Remove the user's timeline
+    schedule_timeline_job("timelines.clear", private_user_id=private_user_id)
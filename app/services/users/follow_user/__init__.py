@@ -1,7 +1,10 @@
 from app import db
 from typing import Tuple
 from flask import Response, jsonify
-from app.models import Users, UserFollowers
+from app.models import Users, UserFollowers, UserStats
+from app.utils.cache import mark_user_changed
+from app.utils.counters import increment_counter, increment_sharded
+from app.services.feed.timeline import schedule_timeline_job
 
 
 def follow_user(follower_private_user_id: str, followee_public_user_id: str) -> Tuple[Response, int]:
@@ -25,7 +28,7 @@ def follow_user(follower_private_user_id: str, followee_public_user_id: str) ->
         return jsonify({"message": "Follower not found"}), 404
     
     # Check if the followee exists in the database
-    followee = Users.query.filter_by(public_user_id=followee_public_user_id).first()
+    followee = Users.query.filter_by(public_user_id=followee_public_user_id, deleted_at=None).first()
     if not followee:
         return jsonify({"message": "Followee not found"}), 404
     
@@ -45,8 +48,14 @@ def follow_user(follower_private_user_id: str, followee_public_user_id: str) ->
         db.session.add(new_follow)
 
         # Update the follower and followee stats
-        follower.stats.following_count += 1
-        followee.stats.follower_count += 1
+        increment_counter(UserStats.following_count, UserStats.user_id == follower.private_user_id)
+        if not increment_sharded(UserStats.follower_count, followee.private_user_id):
+            increment_counter(UserStats.follower_count, UserStats.user_id == followee.private_user_id)
+        mark_user_changed(db.session, follower.private_user_id)
+        mark_user_changed(db.session, followee.private_user_id)
+
+        # Deliver the followee's latest posts to the follower's timeline in the background
+        schedule_timeline_job("timelines.backfill", private_user_id=follower.private_user_id, author_id=followee.private_user_id)
 
         db.session.commit()
         return jsonify({"message": "User followed successfully"}), 200
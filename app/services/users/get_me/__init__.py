@@ -5,7 +5,7 @@ from flask import jsonify, Response
 def get_me(private_user_id: str) -> Tuple[Response, int]:
     try:
         # Check if the user exists
-        user = Users.query.filter_by(private_user_id=private_user_id).first()
+        user = Users.query.filter_by(private_user_id=private_user_id, deleted_at=None).first()
         if not user:
             return jsonify({"error": "User not found"}), 404
         
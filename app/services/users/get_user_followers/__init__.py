@@ -1,39 +1,75 @@
-from typing import Tuple
+from typing import Optional, Tuple
 from flask import Response, jsonify
 from app.models import Users, UserFollowers
-from app.utils.io import PAGE, PER_PAGE, paginate_query
+from app.types.enum import CountStrategy
+from app.utils.io import PAGE, PER_PAGE, paginate_query, keyset_paginate, InvalidCursorError
 
-def get_user_followers(public_user_id: str, page: int = PAGE, per_page: int = PER_PAGE) -> Tuple[Response, int]:
+# Newest followers first; follow_id breaks ties so the order is unique
+FOLLOWERS_CURSOR_KEYS = [(UserFollowers.followed_at, "desc"), (UserFollowers.follow_id, "desc")]
+
+def get_user_followers(
+    public_user_id: str,
+    page: int = PAGE,
+    per_page: int = PER_PAGE,
+    cursor: Optional[str] = None,
+    with_total: bool = False
+) -> Tuple[Response, int]:
     """
     Retrieve the list of followers for a user.
 
     Args:
         public_user_id (str): The public user ID of the user whose followers are to be retrieved.
+        page (int): The page number, used when no cursor is given.
+        per_page (int): The number of followers per page.
+        cursor (Optional[str]): A keyset pagination cursor. An empty string requests the first page,
+                                None uses page numbers instead.
+        with_total (bool): Whether to count the followers when paginating with a cursor.
+                           Counts are cached briefly, since celebrities have very many followers.
 
     Returns:
         Tuple[Response, int]: A tuple containing the Flask response object and an HTTP status code.
             - 200 OK: If the followers are successfully retrieved.
+            - 400 Bad Request: If the cursor is invalid.
             - 404 Not Found: If the user with the specified public_user_id is not found.
     """
     try:
         # Check if the user exists
-        user = Users.query.filter_by(public_user_id=public_user_id).first()
+        user = Users.query.filter_by(public_user_id=public_user_id, deleted_at=None).first()
         if not user:
             return jsonify({"error": "User not found"}), 404
         
         # Get the list of followers
-        followers = UserFollowers.query.filter_by(followee_user_id=user.private_user_id)
+        followers = (
+            UserFollowers.query
+            .join(Users, Users.private_user_id == UserFollowers.follower_user_id)
+            .filter(UserFollowers.followee_user_id == user.private_user_id, Users.deleted_at.is_(None))
+        )
+        to_representation = lambda follower: follower.to_dict(exclude_fields=[UserFollowers.DictKeys.FOLLOWEE])
 
         # Paginate the list of followers
-        data = paginate_query(
-            query=followers,
-            per_page=per_page,
-            page=page,
-            items_name="followers",
-            to_representation=lambda follower: follower.to_dict(exclude_fields=[UserFollowers.DictKeys.FOLLOWEE])
-        )
+        if cursor is not None:
+            data = keyset_paginate(
+                query=followers,
+                keys=FOLLOWERS_CURSOR_KEYS,
+                cursor=cursor,
+                per_page=per_page,
+                items_name="followers",
+                to_representation=to_representation,
+                count_strategy=CountStrategy.CACHED if with_total else CountStrategy.NONE
+            )
+        else:
+            data = paginate_query(
+                query=followers.order_by(*[column.desc() for column, _ in FOLLOWERS_CURSOR_KEYS]),
+                per_page=per_page,
+                page=page,
+                items_name="followers",
+                to_representation=to_representation,
+                cursor_keys=FOLLOWERS_CURSOR_KEYS
+            )
 
         # Return the list of followers
         return jsonify(data), 200
+    except InvalidCursorError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": str(e)}), 500
@@ -15,12 +15,17 @@ def get_user_following(public_user_id: str) -> Tuple[Response, int]:
             - 404 Not Found: If the user with the specified public_user_id is not found.
     """
     # Check if the user exists
-    user = Users.query.filter_by(public_user_id=public_user_id).first()
+    user = Users.query.filter_by(public_user_id=public_user_id, deleted_at=None).first()
     if not user:
         return jsonify({"error": "User not found"}), 404
     
     # Get the list of users that the user is following
-    following = UserFollowers.query.filter_by(follower_user_id=user.private_user_id).all()
+    following = (
+        UserFollowers.query
+        .join(Users, Users.private_user_id == UserFollowers.followee_user_id)
+        .filter(UserFollowers.follower_user_id == user.private_user_id, Users.deleted_at.is_(None))
+        .all()
+    )
 
     # Return the list of users that the user is following
-    return jsonify([followee.to_dict(exclude_fields=["follower"]) for followee in following]), 200
+    return jsonify([followee.to_dict(exclude_fields=[UserFollowers.DictKeys.FOLLOWER]) for followee in following]), 200
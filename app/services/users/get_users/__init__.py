@@ -1,6 +1,7 @@
 from flask import jsonify, Response
 from typing import Optional, Tuple
 from app.models import Users
+from app.utils.etag import conditional_response, make_etag
 
 def get_users(public_user_id: Optional[str] = None) -> Tuple[Response, int]:
     """
@@ -24,18 +25,25 @@ def get_users(public_user_id: Optional[str] = None) -> Tuple[Response, int]:
         - 200 OK: When a user or list of users is successfully retrieved from the database.
     """
     if public_user_id:
-        # Query the user from the database using the public_user_id
-        user = Users.query.filter_by(public_user_id=public_user_id).first()
+        # Stamp the user's current version without loading the full object graph
+        stamp = Users.version_stamp(public_user_id=public_user_id)
 
         # If the user is not found, return a 404 error
-        if user is None:
+        if stamp is None:
             return jsonify({"message": "User not found"}), 404
 
-        # Return the user as JSON
-        return jsonify(user.to_dict()), 200
+        def build() -> Tuple[Response, int]:
+            user = Users.query.filter_by(public_user_id=public_user_id, deleted_at=None).first()
+            if user is None:
+                return jsonify({"message": "User not found"}), 404
+            # The ETag was stamped from the database, so render the body from it too
+            return jsonify(user.to_dict(use_cache=False)), 200
+
+        # Return 304 if the client's copy is current, otherwise the user as JSON
+        return conditional_response(make_etag("user", stamp), build)
     else:
         # Query all the users from the database
-        users = Users.query.all()
+        users = Users.query.filter_by(deleted_at=None).all()
 
         # Convert the users to a list of dictionaries
         users_list = [user.to_dict() for user in users]
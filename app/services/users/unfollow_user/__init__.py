@@ -1,7 +1,10 @@
 from app import db
 from typing import Tuple
 from flask import Response, jsonify
-from app.models import Users, UserFollowers
+from app.models import Users, UserFollowers, UserStats
+from app.utils.cache import mark_user_changed
+from app.utils.counters import increment_counter, increment_sharded
+from app.services.feed.timeline import schedule_timeline_job
 
 
 def unfollow_user(unfollower_private_user_id: str, unfollowee_public_user_id: str) -> Tuple[Response, int]:
@@ -25,7 +28,7 @@ def unfollow_user(unfollower_private_user_id: str, unfollowee_public_user_id: st
         return jsonify({"message": "Unfollower not found"}), 404
     
     # Check if the unfollowee exists in the database
-    unfollowee = Users.query.filter_by(public_user_id=unfollowee_public_user_id).first()
+    unfollowee = Users.query.filter_by(public_user_id=unfollowee_public_user_id, deleted_at=None).first()
     if not unfollowee:
         return jsonify({"message": "Unfollowee not found"}), 404
     
@@ -43,8 +46,14 @@ def unfollow_user(unfollower_private_user_id: str, unfollowee_public_user_id: st
         db.session.delete(follow)
         
         # Update the unfollower and unfollowee stats
-        unfollower.stats.following_count -= 1
-        unfollowee.stats.follower_count -= 1
+        increment_counter(UserStats.following_count, UserStats.user_id == unfollower.private_user_id, amount=-1)
+        if not increment_sharded(UserStats.follower_count, unfollowee.private_user_id, -1):
+            increment_counter(UserStats.follower_count, UserStats.user_id == unfollowee.private_user_id, amount=-1)
+        mark_user_changed(db.session, unfollower.private_user_id)
+        mark_user_changed(db.session, unfollowee.private_user_id)
+
+        # Remove the unfollowee's posts from the unfollower's timeline in the background
+        schedule_timeline_job("timelines.remove_author", private_user_id=unfollower.private_user_id, author_id=unfollowee.private_user_id)
         
         db.session.commit()
         return jsonify({"message": "User unfollowed successfully"}), 200
@@ -1,2 +1,4 @@
 PAGE_PARAM = 'p'
-PER_PAGE_PARAM = 'pp'
\ No newline at end of file
+PER_PAGE_PARAM = 'pp'
+CURSOR_PARAM = 'c'
+COUNT_PARAM = 'count'
\ No newline at end of file
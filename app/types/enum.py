@@ -117,3 +117,47 @@ class CommentStatus(Enum):
     HIDDEN = "HIDDEN"
     FLAGGED = "FLAGGED"
 #endregion ------------------ POST COMMENTS ------------------------- #
+
+
+#region ---------------------- PAGINATION ---------------------------- #
+class CountStrategy(Enum):
+    """Defines how a paginated listing computes its total item count.
+
+    This enum class defines the strategies accepted by `paginate_query` and
+    `keyset_paginate`. The strategy that was used is reported in `_meta.count_strategy`.
+
+    Attributes:
+        EXACT (str): Runs `SELECT COUNT(*)` over the whole filtered set on every request.
+        CACHED (str): Runs the exact count and reuses it for identical queries for a short TTL.
+        ESTIMATED (str): Uses the database's row estimate for the query. Falls back to CACHED
+                         on databases without one.
+        NONE (str): Skips counting; `total` and `pages` are null.
+
+    Returns:
+        None
+    """
+    EXACT = "exact"
+    CACHED = "cached"
+    ESTIMATED = "estimated"
+    NONE = "none"
+#endregion ------------------- PAGINATION ---------------------------- #
+
+
+#region ---------------------- JOBS ---------------------------------- #
+class JobStatus(Enum):
+    """Enumeration of the states of a background job in the Jobs model.
+
+    Attributes:
+        PENDING (str): Waiting to run at or after its `run_at`, including retries after a failed attempt.
+        RUNNING (str): Claimed by a worker.
+        SUCCEEDED (str): Finished without an error.
+        FAILED (str): Failed its last allowed attempt, or has no registered handler.
+
+    Returns:
+        None
+    """
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+#endregion ------------------- JOBS ---------------------------------- #
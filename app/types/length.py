@@ -67,4 +67,13 @@ POST_COMMENT_ID_LENGTH: int = 36
 PARENT_POST_COMMENT_ID_LENGTH: int = POST_COMMENT_ID_LENGTH
 
 # POST COMMENT LIKES
-POST_COMMENT_LIKE_ID_LENGTH: int = 36
\ No newline at end of file
+POST_COMMENT_LIKE_ID_LENGTH: int = 36
+# COUNTER SHARDS
+COUNTER_SHARD_NAME_LENGTH: int = 64
+COUNTER_SHARD_KEY_LENGTH: int = 128
+
+# JOBS
+JOB_ID_LENGTH: int = 36
+JOB_NAME_LENGTH: int = 64
+JOB_IDEMPOTENCY_KEY_LENGTH: int = 128
+JOB_WORKER_ID_LENGTH: int = 64
@@ -0,0 +1,54 @@
+import hashlib
+import math
+
+
+class BloomFilter:
+    """
+    A fixed-size set of strings that answers "definitely absent" or "possibly present".
+
+    Uses `bits` bits and `hashes` bit positions per item, derived from one BLAKE2b
+    digest by double hashing. There are no false negatives; the false-positive rate
+    stays near `error_rate` until more than `capacity` items are added. Items cannot
+    be removed, so rebuild the filter to drop them.
+
+    Attributes:
+        capacity (int): The number of items the filter is sized for.
+        error_rate (float): The target false-positive rate at `capacity` items.
+        bits (int): Size of the bit array.
+        hashes (int): Bit positions set per item.
+        count (int): Number of items added.
+    """
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        if capacity <= 0 or not 0 < error_rate < 1:
+            raise ValueError("A Bloom filter needs a positive capacity and an error rate between 0 and 1.")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.bits / capacity * math.log(2)))
+        self.count = 0
+        self._array = bytearray((self.bits + 7) // 8)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        # An odd step is never zero, so the positions do not all coincide
+        second = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (first + i * second) % self.bits
+
+    def add(self, item: str) -> None:
+        """Adds `item` to the filter. Adding an item it possibly contains does not change `count`."""
+        added = False
+        for position in self._positions(item):
+            mask = 1 << (position & 7)
+            if not self._array[position >> 3] & mask:
+                self._array[position >> 3] |= mask
+                added = True
+        if added:
+            self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._array[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
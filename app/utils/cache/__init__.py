@@ -0,0 +1,218 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Set
+from flask import Flask, current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.utils.metrics import register_gauge_callback
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    A thread-safe, bounded cache with least-recently-used eviction and a per-entry time to live.
+
+    Expired entries are dropped lazily when they are read or when room is needed.
+
+    Attributes:
+        maxsize (int): The maximum number of entries.
+        ttl (float): Seconds an entry stays valid after it is stored.
+        hits (int): Number of lookups answered from the cache.
+        misses (int): Number of lookups that found no valid entry.
+        evictions (int): Number of entries dropped to make room.
+        expirations (int): Number of entries dropped because they expired.
+        invalidations (int): Number of entries removed with `delete` or `clear`.
+    """
+    def __init__(self, maxsize: int, ttl: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Returns the cached value for `key`, or `default` if it is missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING:
+                expires_at, value = entry
+                if expires_at > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Stores `value` under `key`, evicting the least recently used entries if the cache is full."""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        """Removes `key` from the cache if present."""
+        with self._lock:
+            if self._entries.pop(key, _MISSING) is not _MISSING:
+                self.invalidations += 1
+
+    def delete_many(self, keys: Iterable[Hashable]) -> None:
+        """Removes every key in `keys` from the cache."""
+        with self._lock:
+            for key in keys:
+                if self._entries.pop(key, _MISSING) is not _MISSING:
+                    self.invalidations += 1
+
+    def clear(self) -> None:
+        """Removes every entry."""
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the cache's configuration and counters.
+
+        Returns:
+            Dict[str, Any]: Size, limits, counters and the hit ratio (None before the first lookup).
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+
+# ----------------- USER SUMMARY CACHE ----------------- #
+# Marks a session whose pending changes touched a table every cached summary may depend on
+_INVALIDATE_ALL = "*"
+_SESSION_KEY = "user_cache_changed"
+
+
+def get_user_cache() -> Optional[TTLCache]:
+    """
+    Returns the current application's cache of rendered `Users.to_dict()` summaries.
+
+    Returns:
+        Optional[TTLCache]: The cache keyed by `private_user_id`, or None outside an
+        application context or when `USER_CACHE_ENABLED` is off.
+    """
+    if not has_app_context():
+        return None
+    return current_app.extensions.get("user_cache")
+
+
+def mark_user_changed(session: Session, private_user_id: Optional[str]) -> None:
+    """
+    Evicts a user's cached summary when `session` commits.
+
+    Changes to `Users`, `UserStats`, `UserProfileAccessories`, `OwnedAccessories` and
+    `ProfileAccessories` made through the ORM are detected automatically; call this
+    for changes made with bulk `UPDATE`/`DELETE` statements or raw SQL.
+
+    Args:
+        session (Session): The session that makes the change.
+        private_user_id (Optional[str]): The user, or None to evict every summary.
+    """
+    session.info.setdefault(_SESSION_KEY, set()).add(private_user_id if private_user_id is not None else _INVALIDATE_ALL)
+
+
+def _affected_user_ids(instance: Any) -> Set[str]:
+    from app.models import Users, UserStats, UserProfileAccessories, OwnedAccessories, ProfileAccessories
+
+    if isinstance(instance, Users):
+        return {instance.private_user_id}
+    if isinstance(instance, (UserStats, UserProfileAccessories, OwnedAccessories)):
+        return {instance.user_id}
+    if isinstance(instance, ProfileAccessories):
+        # Any user with the accessory active renders it; finding them is not worth a query
+        return {_INVALIDATE_ALL}
+    return set()
+
+
+def _collect_changes(session: Session, flush_context: Any) -> None:
+    changed: Set[str] = set()
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        changed |= _affected_user_ids(instance)
+    changed.discard(None)
+    if changed:
+        session.info.setdefault(_SESSION_KEY, set()).update(changed)
+
+
+def _invalidate(session: Session) -> None:
+    changed = session.info.pop(_SESSION_KEY, None)
+    cache = get_user_cache()
+    if not changed or cache is None:
+        return
+    if _INVALIDATE_ALL in changed:
+        cache.clear()
+    else:
+        cache.delete_many(changed)
+
+
+def _register_session_listeners() -> None:
+    if event.contains(Session, "after_flush", _collect_changes):
+        return
+    event.listen(Session, "after_flush", _collect_changes)
+    # Summaries rendered inside a transaction that rolls back must not outlive it either
+    event.listen(Session, "after_commit", _invalidate)
+    event.listen(Session, "after_rollback", _invalidate)
+
+
+def init_user_cache(app: Flask) -> None:
+    """
+    Enables the in-process cache of rendered user summaries used by `Users.to_dict()`.
+
+    Entries are evicted when a commit changes the user's `Users`, `UserStats` or profile
+    accessory rows. Each worker process has its own cache, so a change committed by
+    another worker is only seen once the entry expires; keep `USER_CACHE_TTL_SECONDS` short.
+
+    Configured with `USER_CACHE_ENABLED`, `USER_CACHE_MAX_SIZE` and `USER_CACHE_TTL_SECONDS`.
+    Registers the `user_cache_entries` and `user_cache_operations` gauges.
+
+    Args:
+        app (Flask): The application.
+    """
+    app.config.setdefault("USER_CACHE_ENABLED", True)
+    app.config.setdefault("USER_CACHE_MAX_SIZE", 10000)
+    app.config.setdefault("USER_CACHE_TTL_SECONDS", 60)
+    if not app.config["USER_CACHE_ENABLED"]:
+        return
+
+    cache = TTLCache(maxsize=app.config["USER_CACHE_MAX_SIZE"], ttl=app.config["USER_CACHE_TTL_SECONDS"])
+    app.extensions["user_cache"] = cache
+    _register_session_listeners()
+
+    def collect_size():
+        yield {}, len(cache)
+    register_gauge_callback("user_cache_entries", "Number of user summaries in this worker's cache.", collect_size)
+
+    def collect_operations():
+        stats = cache.stats()
+        for result in ("hits", "misses", "evictions", "expirations", "invalidations"):
+            yield {"result": result}, stats[result]
+    register_gauge_callback("user_cache_operations", "User summary cache operations by result since the worker started.", collect_operations)
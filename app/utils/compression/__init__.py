@@ -0,0 +1,246 @@
+import zlib
+from itertools import chain
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+from flask import Flask
+
+Headers = List[Tuple[str, str]]
+
+# Preferred first when a client accepts several encodings with the same quality
+SUPPORTED_ENCODINGS: Tuple[str, ...] = ("gzip", "deflate")
+DEFAULT_MIMETYPES: Tuple[str, ...] = (
+    "application/json",
+    "text/plain",
+    "text/html",
+    "text/css",
+    "text/csv",
+    "application/javascript",
+)
+# Statuses that never carry a body
+_NO_BODY_STATUSES = {204, 304}
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Picks the best supported content coding for an `Accept-Encoding` header.
+
+    Quality values are honoured (`gzip;q=0` refuses gzip) and `*` applies to
+    codings not listed explicitly.
+
+    Args:
+        accept_encoding (str): The raw header value.
+
+    Returns:
+        Optional[str]: `gzip`, `deflate` or None if the response should not be compressed.
+    """
+    qualities = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding] = quality
+
+    best, best_quality = None, 0.0
+    for coding in SUPPORTED_ENCODINGS:
+        quality = qualities.get(coding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def _get_header(headers: Headers, name: str) -> Optional[str]:
+    name = name.lower()
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+
+def _without_header(headers: Headers, name: str) -> Headers:
+    name = name.lower()
+    return [(key, value) for key, value in headers if key.lower() != name]
+
+
+def _add_vary(headers: Headers) -> Headers:
+    vary = _get_header(headers, "Vary")
+    if vary is None:
+        return headers + [("Vary", "Accept-Encoding")]
+    values = [value.strip().lower() for value in vary.split(",")]
+    if "accept-encoding" in values or "*" in values:
+        return headers
+    return _without_header(headers, "Vary") + [("Vary", f"{vary}, Accept-Encoding")]
+
+
+def _compressor(encoding: str, level: int):
+    # gzip uses the gzip container; HTTP "deflate" is the zlib container
+    wbits = 16 + zlib.MAX_WBITS if encoding == "gzip" else zlib.MAX_WBITS
+    return zlib.compressobj(level, zlib.DEFLATED, wbits)
+
+
+class CompressionMiddleware:
+    """
+    WSGI middleware compressing responses with gzip or deflate.
+
+    A response is compressed when the client accepts a supported coding and the
+    response:
+
+    - is not a HEAD request and its status carries a body (not 1xx, 204 or 304);
+    - has a mimetype in `mimetypes` and no `Content-Encoding` yet;
+    - does not send `Cache-Control: no-transform`;
+    - is at least `min_size` bytes.
+
+    Buffered responses are compressed in one piece and get an exact `Content-Length`.
+    Streamed responses without a `Content-Length` are buffered until `min_size` bytes
+    are seen; if the stream ends first it is sent as is, otherwise every chunk
+    is compressed and flushed as it arrives, so streaming still delivers data
+    incrementally. `Vary: Accept-Encoding` is added to every response whose
+    mimetype is compressible, and strong ETags are weakened when the body is encoded.
+
+    Attributes:
+        app (Callable): The wrapped WSGI application.
+        level (int): zlib compression level, 1 (fastest) to 9 (smallest).
+        min_size (int): Minimum body size in bytes worth compressing.
+        mimetypes (Sequence[str]): Mimetypes eligible for compression.
+    """
+    def __init__(self, app: Callable, level: int = 6, min_size: int = 500, mimetypes: Sequence[str] = DEFAULT_MIMETYPES) -> None:
+        self.app = app
+        self.level = level
+        self.min_size = min_size
+        self.mimetypes = frozenset(mimetype.lower() for mimetype in mimetypes)
+
+    def __call__(self, environ: dict, start_response: Callable) -> Iterable[bytes]:
+        encoding = negotiate_encoding(environ.get("HTTP_ACCEPT_ENCODING", ""))
+        captured: dict = {}
+
+        def capture_start_response(status: str, headers: Headers, exc_info: Any = None):
+            if exc_info is not None and captured.get("sent"):
+                raise exc_info[1].with_traceback(exc_info[2])
+            captured.update(status=status, headers=list(headers), exc_info=exc_info)
+            # Legacy write() callables bypass the iterator; send such bodies unchanged
+            return lambda data: self._legacy_write(captured, start_response, data)
+
+        app_iter = self.app(environ, capture_start_response)
+        return self._respond(environ, encoding, captured, start_response, app_iter)
+
+    def _legacy_write(self, captured: dict, start_response: Callable, data: bytes) -> None:
+        if not captured.get("sent"):
+            captured["sent"] = True
+            captured["legacy_write"] = start_response(captured["status"], captured["headers"], captured["exc_info"])
+        captured["legacy_write"](data)
+
+    def _compressible_type(self, headers: Headers) -> bool:
+        content_type = _get_header(headers, "Content-Type")
+        if content_type is None:
+            return False
+        return content_type.split(";")[0].strip().lower() in self.mimetypes
+
+    def _respond(self, environ: dict, encoding: Optional[str], captured: dict, start_response: Callable, app_iter: Iterable[bytes]) -> Iterator[bytes]:
+        iterator = iter(app_iter)
+        try:
+            # Start responses may be deferred until the first chunk, so pull it before inspecting headers
+            first = next(iterator, None)
+            status, headers = captured["status"], captured["headers"]
+            chunks = iter([] if first is None else [first])
+
+            if captured.get("sent"):
+                # write() was used; the headers have gone out already
+                yield from chunks
+                yield from iterator
+                return
+
+            status_code = int(status.split(" ", 1)[0])
+            compressible_type = self._compressible_type(headers)
+            if compressible_type:
+                headers = _add_vary(headers)
+
+            cache_control = (_get_header(headers, "Cache-Control") or "").lower()
+            content_length = _get_header(headers, "Content-Length")
+            eligible = (
+                encoding is not None
+                and compressible_type
+                and environ.get("REQUEST_METHOD") != "HEAD"
+                and status_code >= 200 and status_code not in _NO_BODY_STATUSES
+                and _get_header(headers, "Content-Encoding") is None
+                and "no-transform" not in cache_control
+                and not (content_length is not None and content_length.isdigit() and int(content_length) < self.min_size)
+            )
+            if not eligible:
+                start_response(status, headers, captured["exc_info"])
+                yield from chunks
+                yield from iterator
+                return
+
+            # Buffer until the threshold is reached or the body ends
+            buffered: List[bytes] = []
+            size = 0
+            finished = True
+            for chunk in chain(chunks, iterator):
+                buffered.append(chunk)
+                size += len(chunk)
+                if size >= self.min_size:
+                    finished = False
+                    break
+
+            if size < self.min_size:
+                start_response(status, headers, captured["exc_info"])
+                yield b"".join(buffered)
+                return
+
+            headers = _without_header(headers, "Content-Length")
+            headers = _without_header(headers, "Content-Encoding") + [("Content-Encoding", encoding)]
+            etag = _get_header(headers, "ETag")
+            if etag is not None and not etag.startswith("W/"):
+                headers = _without_header(headers, "ETag") + [("ETag", f"W/{etag}")]
+
+            compressor = _compressor(encoding, self.level)
+            if finished or content_length is not None:
+                # The whole body is (or will be) known up front; compress it in one piece
+                body = compressor.compress(b"".join(buffered))
+                if not finished:
+                    body += b"".join(compressor.compress(chunk) for chunk in iterator)
+                body += compressor.flush()
+                start_response(status, headers + [("Content-Length", str(len(body)))], captured["exc_info"])
+                yield body
+                return
+
+            start_response(status, headers, captured["exc_info"])
+            yield compressor.compress(b"".join(buffered)) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            for chunk in iterator:
+                if chunk:
+                    yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            yield compressor.flush()
+        finally:
+            close = getattr(app_iter, "close", None)
+            if close is not None:
+                close()
+
+
+def init_compression(app: Flask) -> None:
+    """
+    Wraps the application's WSGI callable in `CompressionMiddleware` if `COMPRESSION_ENABLED`.
+
+    Configured with `COMPRESSION_LEVEL`, `COMPRESSION_MIN_SIZE` and `COMPRESSION_MIMETYPES`.
+
+    Args:
+        app (Flask): The application.
+    """
+    app.config.setdefault("COMPRESSION_ENABLED", True)
+    app.config.setdefault("COMPRESSION_LEVEL", 6)
+    app.config.setdefault("COMPRESSION_MIN_SIZE", 500)
+    app.config.setdefault("COMPRESSION_MIMETYPES", list(DEFAULT_MIMETYPES))
+    if not app.config["COMPRESSION_ENABLED"]:
+        return
+    app.wsgi_app = CompressionMiddleware(
+        app.wsgi_app,
+        level=app.config["COMPRESSION_LEVEL"],
+        min_size=app.config["COMPRESSION_MIN_SIZE"],
+        mimetypes=app.config["COMPRESSION_MIMETYPES"],
+    )
@@ -0,0 +1,231 @@
+import atexit
+import logging
+import os
+import threading
+from typing import Dict, Hashable, Optional
+from flask import Flask, current_app, has_app_context
+from sqlalchemy import bindparam, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm.attributes import InstrumentedAttribute
+from app import db
+from app.utils.metrics import registry, register_gauge_callback
+
+logger = logging.getLogger(__name__)
+
+COUNTER_FLUSHES = registry.counter(
+    "counter_buffer_flushes_total",
+    "Counter buffer flushes by result.",
+    ("result",),
+)
+COUNTER_INCREMENTS_FLUSHED = registry.counter(
+    "counter_buffer_increments_flushed_total",
+    "Buffered increments written to the database by counter column.",
+    ("counter",),
+)
+
+
+def _counter_name(column: InstrumentedAttribute) -> str:
+    return f"{column.class_.__tablename__}.{column.key}"
+
+
+class CounterBuffer:
+    """
+    Collects counter increments in memory and writes them to the database in batches.
+
+    Increments of the same row are summed, so a flush issues one
+    `UPDATE <table> SET <column> = <column> + :n WHERE <pk> = :id` per counter column,
+    executed with all pending rows as parameters, in its own short transaction on
+    the primary engine. Requests that count a view therefore never open a write
+    transaction or lock the counted row.
+
+    Loss bounds: increments are held only in the memory of the worker that received
+    them. A graceful shutdown flushes them; a crash or `SIGKILL` loses at most the last
+    `interval` seconds of increments of that worker. If a flush fails the increments
+    are put back and retried on the next flush, unless more than `max_keys` rows are
+    pending, in which case the failed batch is dropped and logged. Counters are
+    therefore eventually consistent and may undercount, but never overcount
+    unless a failed flush had in fact committed.
+
+    Attributes:
+        engine (Engine): The engine flushes are written with.
+        interval (float): Seconds between background flushes. 0 writes every increment immediately.
+        max_keys (int): Pending rows that trigger an early flush.
+    """
+    def __init__(self, engine: Engine, interval: float = 5.0, max_keys: int = 10000) -> None:
+        self.engine = engine
+        self.interval = interval
+        self.max_keys = max_keys
+        self._pending: Dict[InstrumentedAttribute, Dict[Hashable, int]] = {}
+        self._pending_keys = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    @property
+    def pending(self) -> int:
+        """Number of rows with unflushed increments."""
+        return self._pending_keys
+
+    def increment(self, column: InstrumentedAttribute, key: Hashable, amount: int = 1) -> None:
+        """
+        Adds `amount` to `column` of the row whose primary key is `key`.
+
+        Args:
+            column (InstrumentedAttribute): An integer column of a model with a single-column primary key, e.g. `Posts.view_count`.
+            key (Hashable): The primary key of the row.
+            amount (int): The increment.
+        """
+        with self._lock:
+            rows = self._pending.setdefault(column, {})
+            if key not in rows:
+                rows[key] = 0
+                self._pending_keys += 1
+            rows[key] += amount
+            full = self._pending_keys >= self.max_keys
+
+        if self.interval <= 0:
+            self.flush()
+            return
+        self._ensure_flusher()
+        if full:
+            self._wakeup.set()
+
+    def _take(self) -> Dict[InstrumentedAttribute, Dict[Hashable, int]]:
+        with self._lock:
+            pending, self._pending, self._pending_keys = self._pending, {}, 0
+        return pending
+
+    def _restore(self, batch: Dict[Hashable, int], column: InstrumentedAttribute) -> None:
+        with self._lock:
+            if self._pending_keys + len(batch) > self.max_keys:
+                logger.error("Dropping %d buffered increments of %s after a failed flush", len(batch), _counter_name(column))
+                return
+            rows = self._pending.setdefault(column, {})
+            for key, amount in batch.items():
+                if key not in rows:
+                    rows[key] = 0
+                    self._pending_keys += 1
+                rows[key] += amount
+
+    def flush(self) -> int:
+        """
+        Writes every pending increment to the database.
+
+        Returns:
+            int: Number of rows updated.
+        """
+        with self._flush_lock:
+            flushed = 0
+            for column, rows in self._take().items():
+                if not rows:
+                    continue
+                table = column.class_.__table__
+                primary_key = list(table.primary_key.columns)[0]
+                counter = table.c[column.key]
+                statement = (
+                    update(table)
+                    .where(primary_key == bindparam("_key"))
+                    .values({counter: counter + bindparam("_amount")})
+                )
+                try:
+                    with self.engine.begin() as connection:
+                        connection.execute(statement, [{"_key": key, "_amount": amount} for key, amount in rows.items()])
+                except Exception:
+                    logger.exception("Failed to flush %d buffered increments of %s", len(rows), _counter_name(column))
+                    COUNTER_FLUSHES.inc(result="error")
+                    self._restore(rows, column)
+                    continue
+                COUNTER_FLUSHES.inc(result="ok")
+                COUNTER_INCREMENTS_FLUSHED.inc(sum(rows.values()), counter=_counter_name(column))
+                flushed += len(rows)
+            return flushed
+
+    def _ensure_flusher(self) -> None:
+        # Worker processes forked after the buffer was created need their own thread
+        if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="counter-buffer-flusher", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def close(self) -> None:
+        """Stops the background flusher and writes the remaining increments."""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=max(self.interval, 1.0))
+        self.flush()
+
+
+def get_counter_buffer() -> Optional[CounterBuffer]:
+    """
+    Returns the current application's counter buffer.
+
+    Returns:
+        Optional[CounterBuffer]: The buffer, or None outside an application context or before `init_counter_buffer`.
+    """
+    if not has_app_context():
+        return None
+    return current_app.extensions.get("counter_buffer")
+
+
+def increment_counter_buffered(column: InstrumentedAttribute, key: Hashable, amount: int = 1) -> None:
+    """
+    Buffers an increment of `column` for the row `key`. See `CounterBuffer`.
+
+    Does nothing when the application has no counter buffer.
+
+    Args:
+        column (InstrumentedAttribute): The counter column, e.g. `Posts.view_count`.
+        key (Hashable): The primary key of the row.
+        amount (int): The increment.
+    """
+    buffer = get_counter_buffer()
+    if buffer is not None:
+        buffer.increment(column, key, amount)
+
+
+def init_counter_buffer(app: Flask) -> None:
+    """
+    Creates the application's counter buffer, flushed every `COUNTER_FLUSH_INTERVAL` seconds and at exit.
+
+    Configured with `COUNTER_BUFFER_ENABLED`, `COUNTER_FLUSH_INTERVAL` and `COUNTER_BUFFER_MAX_KEYS`.
+    Registers the `counter_buffer_pending_rows` gauge.
+    Must be called after `db.init_app`.
+
+    Args:
+        app (Flask): The application.
+    """
+    app.config.setdefault("COUNTER_BUFFER_ENABLED", True)
+    app.config.setdefault("COUNTER_FLUSH_INTERVAL", 5.0)
+    app.config.setdefault("COUNTER_BUFFER_MAX_KEYS", 10000)
+    if not app.config["COUNTER_BUFFER_ENABLED"]:
+        return
+
+    with app.app_context():
+        engine = db.engine
+    buffer = CounterBuffer(
+        engine,
+        interval=app.config["COUNTER_FLUSH_INTERVAL"],
+        max_keys=app.config["COUNTER_BUFFER_MAX_KEYS"],
+    )
+    app.extensions["counter_buffer"] = buffer
+    atexit.register(buffer.close)
+
+    def collect_pending():
+        yield {}, buffer.pending
+    register_gauge_callback("counter_buffer_pending_rows", "Rows with buffered, unflushed counter increments in this worker.", collect_pending)
+
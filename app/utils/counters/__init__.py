@@ -0,0 +1,554 @@
+import atexit
+import logging
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from flask import Flask, current_app, has_app_context
+from sqlalchemy import case, delete, func, insert, select, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import InstrumentedAttribute
+from app import db
+from app.utils.metrics import registry, register_gauge_callback
+
+logger = logging.getLogger(__name__)
+
+
+def increment_counter(column: InstrumentedAttribute, *criteria: Any, amount: int = 1, session: Optional[Session] = None) -> int:
+    """
+    Atomically adds `amount` to a counter column of the rows matching `criteria`.
+
+    Issues a single `UPDATE <table> SET <column> = <column> + :amount WHERE <criteria>`,
+    so the new value is computed by the database from the current row rather than from
+    a value read earlier. Concurrent increments therefore never overwrite each other and
+    the row lock is held only for the statement itself. Negative amounts stop at zero:
+    a counter never becomes negative even if a decrement races with the row's creation
+    or the counter had drifted.
+
+    The statement runs in the session's current transaction and bypasses the ORM, so
+    instances already loaded keep their old value until they are expired or refreshed,
+    and session listeners (such as user cache invalidation) do not see the change.
+
+    Args:
+        column (InstrumentedAttribute): The counter column, e.g. `UserStats.follower_count`.
+        *criteria (Any): Filters selecting the rows, e.g. `UserStats.user_id == user_id`.
+            Use `column.in_(...)` criteria to update many rows in one statement.
+        amount (int): The increment. Negative values decrement.
+        session (Session): The session to execute in. Defaults to `db.session`.
+
+    Returns:
+        int: The number of rows matched.
+    """
+    if not criteria:
+        raise ValueError("increment_counter requires criteria; refusing to update every row.")
+    table = column.class_.__table__
+    counter = table.c[column.key]
+    new_value = counter + amount
+    if amount < 0:
+        new_value = case((counter + amount < 0, 0), else_=new_value)
+    result = (session or db.session).execute(update(table).where(*criteria).values({counter: new_value}))
+    return result.rowcount
+
+
+def upsert_counter(column: InstrumentedAttribute, values: Dict[str, Any], amount: int = 1, session: Optional[Session] = None, **updates: Any) -> None:
+    """
+    Atomically adds `amount` to a counter column, creating the row if it does not exist yet.
+
+    Issues a single `INSERT ... ON DUPLICATE KEY UPDATE` on MySQL or `INSERT ... ON CONFLICT
+    DO UPDATE` on SQLite and PostgreSQL, so concurrent first increments of the same row do
+    not collide. Other databases fall back to an update followed by an insert in a savepoint.
+
+    Args:
+        column (InstrumentedAttribute): The counter column, e.g. `PostReactionCounts.reaction_count`.
+        values (Dict[str, Any]): The primary key (and any other required columns) of the row.
+        amount (int): The increment, and the initial value of a new row.
+        session (Session): The session to execute in. Defaults to `db.session`.
+        **updates (Any): Further columns to set when the row already exists, e.g. a timestamp.
+    """
+    session = session or db.session
+    table = column.class_.__table__
+    counter = table.c[column.key]
+    row = {**values, **updates, column.key: amount}
+    dialect = session.get_bind(clause=table).dialect.name
+    if dialect in ("mysql", "mariadb"):
+        session.execute(mysql.insert(table).values(row).on_duplicate_key_update({counter: counter + amount, **updates}))
+        return
+    if dialect in ("sqlite", "postgresql"):
+        dialect_insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        session.execute(dialect_insert(table).values(row).on_conflict_do_update(
+            index_elements=[primary_key.name for primary_key in table.primary_key.columns],
+            set_={column.key: counter + amount, **updates},
+        ))
+        return
+
+    criteria = [table.c[name] == value for name, value in values.items() if table.c[name].primary_key]
+    if session.execute(update(table).where(*criteria).values({counter: counter + amount, **updates})).rowcount:
+        return
+    try:
+        with session.begin_nested():
+            session.execute(insert(table).values(row))
+    except IntegrityError:
+        # Created concurrently since the update; count onto that row
+        session.execute(update(table).where(*criteria).values({counter: counter + amount, **updates}))
+
+
+# ----------------- SHARDED COUNTERS ----------------- #
+COUNTER_SHARD_INCREMENTS = registry.counter(
+    "counter_shard_increments_total",
+    "Increments written to counter shards instead of the counter row, by counter.",
+    ("counter",),
+)
+COUNTER_SHARDS_FOLDED = registry.counter(
+    "counter_shards_folded_total",
+    "Shard rows folded into their counter rows by the compactor, by counter.",
+    ("counter",),
+)
+
+
+def counter_name(column: InstrumentedAttribute) -> str:
+    """Returns the name a counter column is sharded under, e.g. `user_stats.follower_count`."""
+    return f"{column.class_.__tablename__}.{column.key}"
+
+
+def counter_key(*parts: Any) -> str:
+    """Builds the key of a counted row from its primary key values, e.g. `counter_key(post_id, reaction_type)`."""
+    return "|".join(str(part) for part in parts)
+
+
+class HotKeyDetector:
+    """
+    Decides which counter rows are hot enough to shard.
+
+    A key becomes hot once it receives `threshold` increments within `window` seconds
+    in this worker, and stays hot for `ttl` seconds after the last time it crossed the
+    threshold. Keys another worker has sharded (they have pending shard rows) are hot
+    as well, so all workers stop contending on the same row.
+
+    Attributes:
+        threshold (int): Increments per window that make a key hot. 0 makes every key hot.
+        window (float): Length of the counting window in seconds.
+        ttl (float): Seconds a key stays hot.
+        max_keys (int): Keys tracked at most; the oldest windows are dropped beyond it.
+    """
+    def __init__(self, threshold: int, window: float, ttl: float, max_keys: int = 10000, clock: Callable[[], float] = time.monotonic) -> None:
+        self.threshold = threshold
+        self.window = window
+        self.ttl = ttl
+        self.max_keys = max_keys
+        self._clock = clock
+        self._windows: "OrderedDict[Tuple[str, str], List[float]]" = OrderedDict()
+        self._hot: Dict[Tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+
+    def hit(self, name: str, key: str) -> bool:
+        """Records an increment of a key and returns whether the key is hot."""
+        if self.threshold <= 0:
+            return True
+        now = self._clock()
+        with self._lock:
+            entry = self._windows.get((name, key))
+            if entry is None or now - entry[0] >= self.window:
+                entry = [now, 0]
+                self._windows[(name, key)] = entry
+                self._windows.move_to_end((name, key))
+                while len(self._windows) > self.max_keys:
+                    self._windows.popitem(last=False)
+            entry[1] += 1
+            if entry[1] >= self.threshold:
+                self._hot[(name, key)] = now + self.ttl
+            hot_until = self._hot.get((name, key))
+            if hot_until is None:
+                return False
+            if hot_until <= now:
+                del self._hot[(name, key)]
+                return False
+            return True
+
+    def hot_keys(self) -> List[Tuple[str, str]]:
+        """Returns the keys currently hot in this worker."""
+        now = self._clock()
+        with self._lock:
+            for name_key in [name_key for name_key, hot_until in self._hot.items() if hot_until <= now]:
+                del self._hot[name_key]
+            return list(self._hot)
+
+
+class ShardedCounters:
+    """
+    Spreads increments of hot counter rows over shard rows and folds them back.
+
+    Without sharding, every follow of a celebrity account or reaction to a viral post
+    updates the same row, and concurrent requests queue on its row lock. For a hot key
+    an increment instead upserts `delta = delta + :n` into one of `shards` randomly chosen
+    rows of `counter_shards`, so up to `shards` writers proceed in parallel. Which keys
+    are hot is decided by a `HotKeyDetector`.
+
+    The value of a counter is its base row plus its pending shard deltas. Readers take
+    the deltas from a per-worker snapshot of all pending shard sums, refreshed with one
+    grouped query at most every `cache_ttl` seconds, so reads of sharded values may lag
+    by that long and reads of keys without shards cost nothing.
+
+    The compactor folds shards into their base rows every `compact_interval` seconds.
+    Each shard row is deleted with `WHERE delta = :seen` and folded only if the delete
+    matched, in the same transaction, so concurrent compactors in several workers and
+    concurrent increments never lose or double count a delta.
+
+    Attributes:
+        shards (int): Shard rows per hot key.
+        detector (HotKeyDetector): Decides which keys are sharded.
+        cache_ttl (float): Seconds a snapshot of pending deltas is reused.
+        compact_interval (float): Seconds between background compactions. 0 disables the compactor thread.
+    """
+    def __init__(self, app: Flask, shards: int, detector: HotKeyDetector, cache_ttl: float, compact_interval: float) -> None:
+        self.app = app
+        self.shards = shards
+        self.detector = detector
+        self.cache_ttl = cache_ttl
+        self.compact_interval = compact_interval
+        self._folds: Dict[str, Callable[[str, int], None]] = {}
+        self._deltas: Dict[str, Dict[str, int]] = {}
+        self._grouped_deltas: Dict[str, Dict[str, Dict[str, int]]] = {}
+        self._deltas_loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    def register(self, column: InstrumentedAttribute, fold: Callable[[str, int], None]) -> None:
+        """
+        Allows a counter column to be sharded.
+
+        Args:
+            column (InstrumentedAttribute): The counter column.
+            fold (function): Called as `fold(key, delta)` inside the compaction transaction to
+                apply a folded delta to the base row of `key`.
+        """
+        self._folds[counter_name(column)] = fold
+
+    def increment(self, column: InstrumentedAttribute, key: str, amount: int = 1) -> bool:
+        """
+        Adds `amount` to a shard of the counter if the key is hot.
+
+        Args:
+            column (InstrumentedAttribute): A registered counter column.
+            key (str): The counted row, from `counter_key()`.
+            amount (int): The increment. Negative values decrement.
+
+        Returns:
+            bool: True if the increment went to a shard; False if the caller must update the base row itself.
+        """
+        from app.models import CounterShards
+
+        name = counter_name(column)
+        if name not in self._folds:
+            return False
+        # Evaluate the detector first so it sees every increment of the key
+        hot = self.detector.hit(name, key)
+        if not hot and key not in self.pending(column):
+            return False
+
+        upsert_counter(
+            CounterShards.delta,
+            {"counter_name": name, "counter_key": key, "shard": random.randrange(self.shards)},
+            amount,
+            updated_at=datetime.now(),
+        )
+        COUNTER_SHARD_INCREMENTS.inc(counter=name)
+        self._ensure_compactor()
+        return True
+
+    def pending(self, column: InstrumentedAttribute) -> Dict[str, int]:
+        """
+        Returns the pending shard deltas of a counter by key, from the worker's snapshot.
+
+        Args:
+            column (InstrumentedAttribute): The counter column.
+
+        Returns:
+            Dict[str, int]: Deltas by key. Keys without shards are absent.
+        """
+        now = time.monotonic()
+        if self._deltas_loaded_at is None or now - self._deltas_loaded_at >= self.cache_ttl:
+            self._load_deltas(now)
+        return self._deltas.get(counter_name(column), {})
+
+    def pending_group(self, column: InstrumentedAttribute, head: Any) -> Dict[str, int]:
+        """
+        Returns the pending shard deltas of the keys starting with `head`, by the rest of the key.
+
+        The snapshot is indexed by the first key part once per refresh, so looking up the
+        rows of one post, e.g. its reaction counts by type, does not scan every pending key.
+
+        Args:
+            column (InstrumentedAttribute): The counter column.
+            head (Any): The first part of the keys, e.g. the post ID for `counter_key(post_id, reaction_type)`.
+
+        Returns:
+            Dict[str, int]: Deltas by the remainder of the key. Keys without shards are absent.
+        """
+        name = counter_name(column)
+        self.pending(column)
+        with self._lock:
+            groups = self._grouped_deltas.get(name)
+            if groups is None:
+                groups = {}
+                for key, delta in self._deltas.get(name, {}).items():
+                    first, _, rest = key.partition("|")
+                    groups.setdefault(first, {})[rest] = delta
+                self._grouped_deltas[name] = groups
+        return groups.get(str(head), {})
+
+    def _load_deltas(self, now: float) -> None:
+        from app.models import CounterShards
+
+        rows = db.session.execute(
+            select(CounterShards.counter_name, CounterShards.counter_key, func.sum(CounterShards.delta))
+            .group_by(CounterShards.counter_name, CounterShards.counter_key)
+        )
+        deltas: Dict[str, Dict[str, int]] = {}
+        for name, key, delta in rows:
+            deltas.setdefault(name, {})[key] = int(delta or 0)
+        with self._lock:
+            self._deltas, self._grouped_deltas, self._deltas_loaded_at = deltas, {}, now
+
+    def invalidate(self) -> None:
+        """Drops the worker's snapshot of pending deltas; the next read reloads it."""
+        with self._lock:
+            self._deltas_loaded_at = None
+
+    def compact(self, limit: int = 1000) -> int:
+        """
+        Folds pending shards into their base rows. Must run inside an application context.
+
+        All shards of a counter row are folded together in one transaction, so a negative
+        shard is never applied (and clamped at zero) before the positive shards it offsets.
+
+        Args:
+            limit (int): Shard rows folded at most in this call.
+
+        Returns:
+            int: The number of shard rows folded.
+        """
+        from app.models import CounterShards
+
+        rows = db.session.execute(
+            select(CounterShards.counter_name, CounterShards.counter_key, CounterShards.shard, CounterShards.delta)
+            .order_by(CounterShards.updated_at)
+            .limit(limit)
+        ).all()
+        db.session.rollback()
+        by_key: Dict[Tuple[str, str], List[Tuple[int, int]]] = {}
+        for name, key, shard, delta in rows:
+            by_key.setdefault((name, key), []).append((shard, delta))
+
+        folded = 0
+        for (name, key), shards in by_key.items():
+            fold = self._folds.get(name)
+            if fold is None:
+                continue
+            try:
+                deleted, total = 0, 0
+                for shard, delta in shards:
+                    # A shard incremented since it was read keeps its row until the next compaction
+                    if db.session.execute(
+                        delete(CounterShards.__table__).where(
+                            CounterShards.counter_name == name,
+                            CounterShards.counter_key == key,
+                            CounterShards.shard == shard,
+                            CounterShards.delta == delta,
+                        )
+                    ).rowcount:
+                        deleted += 1
+                        total += delta
+                if total:
+                    fold(key, total)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                logger.exception("Failed to fold the shards of %s %s", name, key)
+                continue
+            folded += deleted
+            COUNTER_SHARDS_FOLDED.inc(deleted, counter=name)
+        if folded:
+            self.invalidate()
+        return folded
+
+    def _ensure_compactor(self) -> None:
+        if self.compact_interval <= 0:
+            return
+        # Worker processes forked after the counters were created need their own thread
+        if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="counter-shard-compactor", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.compact_interval):
+            with self.app.app_context():
+                try:
+                    self.compact()
+                except Exception:
+                    logger.exception("Counter shard compaction failed")
+                finally:
+                    db.session.remove()
+
+    def close(self) -> None:
+        """Stops the background compactor."""
+        self._stopped.set()
+
+
+def get_sharded_counters() -> Optional[ShardedCounters]:
+    """
+    Returns the current application's sharded counters.
+
+    Returns:
+        Optional[ShardedCounters]: The counters, or None outside an application context or when `COUNTER_SHARDING_ENABLED` is off.
+    """
+    if not has_app_context():
+        return None
+    return current_app.extensions.get("sharded_counters")
+
+
+def increment_sharded(column: InstrumentedAttribute, key: str, amount: int = 1) -> bool:
+    """
+    Sends an increment to a counter shard if sharding is enabled and the key is hot.
+
+    Callers update the base row themselves when this returns False, e.g.::
+
+        if not increment_sharded(UserStats.follower_count, user_id):
+            increment_counter(UserStats.follower_count, UserStats.user_id == user_id)
+
+    Args:
+        column (InstrumentedAttribute): The counter column.
+        key (str): The counted row, from `counter_key()`.
+        amount (int): The increment. Negative values decrement.
+
+    Returns:
+        bool: True if the increment was written to a shard.
+    """
+    counters = get_sharded_counters()
+    return counters is not None and counters.increment(column, key, amount)
+
+
+def sharded_delta(column: InstrumentedAttribute, key: str) -> int:
+    """
+    Returns the pending shard delta of a counter row, 0 when sharding is disabled.
+
+    Add it to the base row's value when reading a shardable counter.
+
+    Args:
+        column (InstrumentedAttribute): The counter column.
+        key (str): The counted row, from `counter_key()`.
+
+    Returns:
+        int: The delta not yet folded into the base row.
+    """
+    counters = get_sharded_counters()
+    if counters is None:
+        return 0
+    return counters.pending(column).get(key, 0)
+
+
+def _fold_user_stats(column: InstrumentedAttribute) -> Callable[[str, int], None]:
+    def fold(user_id: str, delta: int) -> None:
+        from app.models import UserStats
+        from app.utils.cache import mark_user_changed
+
+        increment_counter(column, UserStats.user_id == user_id, amount=delta)
+        mark_user_changed(db.session, user_id)
+    return fold
+
+
+def _fold_reaction_count(key: str, delta: int) -> None:
+    from app.models import PostReactionCounts
+
+    post_id, post_reaction_type = key.split("|", 1)
+    PostReactionCounts.add(post_id, post_reaction_type, delta)
+
+
+def init_counter_shards(app: Flask) -> None:
+    """
+    Enables sharded counters for user follower counts and post reaction counts if `COUNTER_SHARDING_ENABLED`.
+
+    Configured with `COUNTER_SHARDS`, `COUNTER_HOT_THRESHOLD`, `COUNTER_HOT_WINDOW_SECONDS`,
+    `COUNTER_HOT_TTL_SECONDS`, `COUNTER_SHARD_CACHE_TTL_SECONDS` and `COUNTER_COMPACT_INTERVAL`.
+    Registers the `flask counters compact` and `flask counters status` commands.
+    Must be called after `db.init_app`.
+
+    Args:
+        app (Flask): The application.
+    """
+    app.config.setdefault("COUNTER_SHARDING_ENABLED", False)
+    app.config.setdefault("COUNTER_SHARDS", 16)
+    app.config.setdefault("COUNTER_HOT_THRESHOLD", 50)
+    app.config.setdefault("COUNTER_HOT_WINDOW_SECONDS", 10.0)
+    app.config.setdefault("COUNTER_HOT_TTL_SECONDS", 600.0)
+    app.config.setdefault("COUNTER_SHARD_CACHE_TTL_SECONDS", 5.0)
+    app.config.setdefault("COUNTER_COMPACT_INTERVAL", 30.0)
+
+    @app.cli.group("counters")
+    def counters_cli():
+        """Sharded counter commands."""
+
+    @counters_cli.command("compact")
+    def compact_command():
+        """Fold every pending counter shard into its counter row."""
+        counters = get_sharded_counters()
+        if counters is None:
+            print("Counter sharding is disabled.")
+            return
+        total = 0
+        while True:
+            folded = counters.compact()
+            total += folded
+            if not folded:
+                break
+        print(f"Folded {total} shard rows.")
+
+    @counters_cli.command("status")
+    def status_command():
+        """Print the counters that currently have pending shards."""
+        from app.models import CounterShards
+
+        rows = db.session.execute(
+            select(CounterShards.counter_name, CounterShards.counter_key, func.count(), func.sum(CounterShards.delta))
+            .group_by(CounterShards.counter_name, CounterShards.counter_key)
+            .order_by(CounterShards.counter_name, CounterShards.counter_key)
+        )
+        for name, key, shards, delta in rows:
+            print(f"{name}  {key}  shards={shards}  pending={delta}")
+
+    if not app.config["COUNTER_SHARDING_ENABLED"]:
+        return
+
+    from app.models import UserStats, PostReactionCounts
+
+    counters = ShardedCounters(
+        app,
+        shards=app.config["COUNTER_SHARDS"],
+        detector=HotKeyDetector(
+            threshold=app.config["COUNTER_HOT_THRESHOLD"],
+            window=app.config["COUNTER_HOT_WINDOW_SECONDS"],
+            ttl=app.config["COUNTER_HOT_TTL_SECONDS"],
+        ),
+        cache_ttl=app.config["COUNTER_SHARD_CACHE_TTL_SECONDS"],
+        compact_interval=app.config["COUNTER_COMPACT_INTERVAL"],
+    )
+    counters.register(UserStats.follower_count, _fold_user_stats(UserStats.follower_count))
+    counters.register(PostReactionCounts.reaction_count, _fold_reaction_count)
+    app.extensions["sharded_counters"] = counters
+    atexit.register(counters.close)
+
+    def collect_hot_keys():
+        yield {}, len(counters.detector.hot_keys())
+    register_gauge_callback("counter_hot_keys", "Counter rows this worker currently shards.", collect_hot_keys)
@@ -0,0 +1,164 @@
+import time
+import threading
+from typing import Any, Dict
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+from flask import Flask
+from app import db
+from app.utils.metrics import registry, register_gauge_callback
+
+POOL_WAIT_SECONDS = registry.histogram(
+    "db_pool_wait_seconds",
+    "Time spent waiting for a pooled connection when the pool was exhausted.",
+    ("engine",),
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0),
+)
+
+
+class TimedQueuePool(QueuePool):
+    """
+    A `QueuePool` that measures how long checkouts wait for a free connection.
+
+    A checkout is counted as a wait when the pool had no idle connection and no
+    overflow left at the time of the request, i.e. when it had to block until
+    another request returned a connection. Checkouts that are served immediately
+    or open a new overflow connection are not counted. The check is made without
+    the pool's lock, so under heavy contention a few borderline checkouts may be
+    misclassified; totals are accurate enough to spot exhaustion.
+
+    Attributes:
+        waits (int): Number of checkouts that had to wait.
+        wait_time_total (float): Total seconds spent waiting.
+        wait_time_max (float): The longest single wait in seconds.
+        timeouts (int): Number of checkouts that gave up after `pool_timeout`.
+    """
+    # Defaults live on the class: create_engine introspects __init__ to route pool_* arguments, so it is not overridden
+    waits: int = 0
+    wait_time_total: float = 0.0
+    wait_time_max: float = 0.0
+    timeouts: int = 0
+    engine_name: str = "default"
+    _stats_lock = threading.Lock()
+
+    def _do_get(self):
+        exhausted = self._max_overflow > -1 and self._overflow >= self._max_overflow and self._pool.empty()
+        if not exhausted:
+            return super()._do_get()
+
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            with self._stats_lock:
+                self.waits += 1
+                self.wait_time_total += waited
+                self.wait_time_max = max(self.wait_time_max, waited)
+            POOL_WAIT_SECONDS.observe(waited, engine=self.engine_name)
+
+    def recreate(self) -> "TimedQueuePool":
+        pool = super().recreate()
+        pool.engine_name = self.engine_name
+        return pool
+
+
+def build_engine_options(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Builds `SQLALCHEMY_ENGINE_OPTIONS` from the `DB_POOL_*` settings.
+
+    In-memory SQLite databases live inside a single connection, so no pool
+    options are returned for them.
+
+    Args:
+        config (dict): The application config.
+
+    Returns:
+        Dict[str, Any]: Engine options; keys already present in `SQLALCHEMY_ENGINE_OPTIONS` take precedence.
+    """
+    url = make_url(config["SQLALCHEMY_DATABASE_URI"])
+    options: Dict[str, Any] = {}
+    if not (url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")):
+        options = {
+            "poolclass": TimedQueuePool,
+            "pool_size": config["DB_POOL_SIZE"],
+            "max_overflow": config["DB_MAX_OVERFLOW"],
+            "pool_timeout": config["DB_POOL_TIMEOUT"],
+            "pool_recycle": config["DB_POOL_RECYCLE"],
+            "pool_pre_ping": config["DB_POOL_PRE_PING"],
+        }
+    options.update(config.get("SQLALCHEMY_ENGINE_OPTIONS") or {})
+    return options
+
+
+def get_pool_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Returns the state of every engine's connection pool. Must be called within an app context.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Stats keyed by engine name (`default` for the primary database).
+            Wait statistics are only present for pools created with `TimedQueuePool`.
+    """
+    stats = {}
+    for name, engine in db.engines.items():
+        pool = engine.pool
+        entry: Dict[str, Any] = {"pool_class": type(pool).__name__}
+        if isinstance(pool, QueuePool):
+            entry.update({
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+                "max_overflow": pool._max_overflow,
+                "timeout": pool.timeout(),
+            })
+        if isinstance(pool, TimedQueuePool):
+            entry.update({
+                "waits": pool.waits,
+                "wait_time_total_ms": round(pool.wait_time_total * 1000, 3),
+                "wait_time_max_ms": round(pool.wait_time_max * 1000, 3),
+                "timeouts": pool.timeouts,
+            })
+        stats[name or "default"] = entry
+    return stats
+
+
+def init_db_pool(app: Flask) -> None:
+    """
+    Names the timed pools of every engine, registers pool wait gauges and the `flask pool stats` command.
+
+    Must be called after `db.init_app`.
+
+    Args:
+        app (Flask): The application.
+    """
+    with app.app_context():
+        engines = {name or "default": engine for name, engine in db.engines.items()}
+    for name, engine in engines.items():
+        if isinstance(engine.pool, TimedQueuePool):
+            engine.pool.engine_name = name
+
+    def collect_waits():
+        for name, engine in engines.items():
+            pool = engine.pool
+            if isinstance(pool, TimedQueuePool):
+                yield {"engine": name, "stat": "waits"}, pool.waits
+                yield {"engine": name, "stat": "timeouts"}, pool.timeouts
+                yield {"engine": name, "stat": "wait_time_max_seconds"}, pool.wait_time_max
+    register_gauge_callback("db_pool_wait_stats", "SQLAlchemy pool wait statistics by stat.", collect_waits)
+
+    @app.cli.group("pool")
+    def pool_cli():
+        """Connection pool commands."""
+
+    @pool_cli.command("stats")
+    def pool_stats_command():
+        """Print this process's connection pool configuration and statistics."""
+        for name, entry in get_pool_stats().items():
+            print(f"[{name}]")
+            for key, value in entry.items():
+                print(f"  {key}: {value}")
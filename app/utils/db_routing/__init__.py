@@ -0,0 +1,162 @@
+import time
+import random
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+from sqlalchemy.sql import Select, CompoundSelect
+from flask import Flask, Response, current_app, g, has_request_context, request
+from flask_sqlalchemy.session import Session
+from flask_jwt_extended import get_jwt_identity
+
+READ_ONLY_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+REPLICA_BIND_PREFIX = "replica_"
+
+
+class StickinessMap:
+    """
+    Remembers, per user, until when reads must go to the primary.
+
+    The map lives in the worker process. With several workers a user's next
+    read may land on another worker that has not seen the write, so keep
+    `REPLICA_STICKINESS_SECONDS` above the typical replication lag and rely on
+    it only as a best effort for read-your-writes.
+    """
+    def __init__(self, max_entries: int = 100_000) -> None:
+        self.max_entries = max_entries
+        self._until: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def mark(self, identity: str, seconds: float) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if len(self._until) >= self.max_entries:
+                self._until = {key: until for key, until in self._until.items() if until > now}
+            self._until[identity] = now + seconds
+
+    def is_sticky(self, identity: str) -> bool:
+        until = self._until.get(identity)
+        if until is None:
+            return False
+        if until <= time.monotonic():
+            with self._lock:
+                self._until.pop(identity, None)
+            return False
+        return True
+
+
+stickiness = StickinessMap()
+
+
+def _current_identity() -> Optional[str]:
+    try:
+        identity = get_jwt_identity()
+    except Exception:
+        # No verified JWT in this request
+        return None
+    return str(identity) if identity is not None else None
+
+
+@contextmanager
+def use_primary() -> Iterator[None]:
+    """
+    Context manager forcing every read inside the block to the primary database.
+
+    Use it for reads that must never see replication lag, such as token revocation checks.
+    """
+    previous = g.get("db_force_primary", False)
+    g.db_force_primary = True
+    try:
+        yield
+    finally:
+        g.db_force_primary = previous
+
+
+def _reads_may_use_replica() -> bool:
+    if not has_request_context() or request.method not in READ_ONLY_METHODS:
+        return False
+    if g.get("db_force_primary"):
+        return False
+    identity = _current_identity()
+    return identity is None or not stickiness.is_sticky(identity)
+
+
+def _request_replica(replicas: List[str]) -> str:
+    # Replicas lag by different amounts, so all reads of a request use the same one
+    replica = g.get("db_replica")
+    if replica not in replicas:
+        replica = g.db_replica = random.choice(replicas)
+    return replica
+
+
+class RoutingSession(Session):
+    """
+    A Flask-SQLAlchemy session that sends the reads of read-only requests to a replica.
+
+    A statement goes to the request's replica when all of the following hold,
+    otherwise it uses the normal bind resolution (the primary):
+
+    - replicas are configured (`SQLALCHEMY_REPLICA_URIS`);
+    - it is a plain SELECT (no `FOR UPDATE`) and the session is not flushing;
+    - the request is a GET, HEAD or OPTIONS request;
+    - the user has not written within the last `REPLICA_STICKINESS_SECONDS`;
+    - the code is not inside `use_primary()`.
+
+    Each request picks one replica at random and sends all of its replica reads there,
+    so related reads (an ETag's stamp and its body, a page and its count) do not see
+    replicas at different points of the replication stream.
+    """
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and _is_plain_select(clause):
+            replicas: List[str] = current_app.extensions.get("db_routing", {}).get("replicas", [])
+            if replicas and _reads_may_use_replica():
+                return self._db.engines[_request_replica(replicas)]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def _is_plain_select(clause: Any) -> bool:
+    if isinstance(clause, CompoundSelect):
+        return True
+    return isinstance(clause, Select) and clause._for_update_arg is None
+
+
+def _mark_writer_sticky(response: Response) -> Response:
+    if request.method not in READ_ONLY_METHODS and response.status_code < 400:
+        identity = _current_identity()
+        if identity is not None:
+            stickiness.mark(identity, current_app.config["REPLICA_STICKINESS_SECONDS"])
+    return response
+
+
+def configure_replica_binds(app: Flask) -> None:
+    """
+    Adds one `replica_<n>` bind per URI in `SQLALCHEMY_REPLICA_URIS`.
+
+    Must be called before `db.init_app`. Replicas share `SQLALCHEMY_ENGINE_OPTIONS`
+    with the primary, including the connection pool settings.
+
+    Args:
+        app (Flask): The application.
+    """
+    uris = app.config.get("SQLALCHEMY_REPLICA_URIS") or []
+    if isinstance(uris, str):
+        uris = [uri.strip() for uri in uris.split(",") if uri.strip()]
+    binds = dict(app.config.get("SQLALCHEMY_BINDS") or {})
+    names = []
+    for index, uri in enumerate(uris):
+        name = f"{REPLICA_BIND_PREFIX}{index}"
+        binds[name] = uri
+        names.append(name)
+    app.config["SQLALCHEMY_BINDS"] = binds
+    app.extensions["db_routing"] = {"replicas": names}
+
+
+def init_db_routing(app: Flask) -> None:
+    """
+    Enables read-your-writes stickiness when replicas are configured.
+
+    Args:
+        app (Flask): The application.
+    """
+    app.config.setdefault("REPLICA_STICKINESS_SECONDS", 5)
+    if app.extensions.get("db_routing", {}).get("replicas"):
+        app.after_request(_mark_writer_sticky)
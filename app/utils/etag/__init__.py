@@ -0,0 +1,81 @@
+import hashlib
+from typing import Any, Callable, Iterable, Optional, Tuple
+from flask import Response, request
+
+# Bump whenever the JSON representation of a resource changes shape, so cached ETags stop matching
+REPRESENTATION_VERSION: int = 1
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Builds a weak ETag from a version stamp.
+
+    ETags are weak because they are derived from the data behind a representation,
+    not from its bytes; the body may differ in encoding or key order and still be
+    semantically the same.
+
+    Args:
+        *parts (Any): Values identifying the version of the resource. Their `repr` is hashed.
+
+    Returns:
+        str: The ETag, e.g. `W/"3f2c..."`.
+    """
+    digest = hashlib.blake2b(repr((REPRESENTATION_VERSION,) + parts).encode("utf-8"), digest_size=16).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _opaque_tag(etag: str) -> str:
+    etag = etag.strip()
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def etag_matches(etag: str, if_none_match: Optional[str]) -> bool:
+    """
+    Checks an `If-None-Match` header against an ETag using weak comparison.
+
+    Args:
+        etag (str): The current ETag of the resource.
+        if_none_match (Optional[str]): The raw header value, e.g. `W/"a", "b"` or `*`.
+
+    Returns:
+        bool: True if the client's copy is current.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    current = _opaque_tag(etag)
+    return any(_opaque_tag(candidate) == current for candidate in if_none_match.split(","))
+
+
+def _with_validators(response: Response, etag: str, vary: Iterable[str]) -> Response:
+    response.headers["ETag"] = etag
+    response.headers.setdefault("Cache-Control", "private, no-cache")
+    for header in vary:
+        response.vary.add(header)
+    return response
+
+
+def conditional_response(etag: str, build: Callable[[], Tuple[Response, int]], vary: Iterable[str] = ()) -> Tuple[Response, int]:
+    """
+    Answers a GET with `304 Not Modified` when the client already holds the current version.
+
+    Otherwise calls `build` to render the full response and attaches the ETag to it.
+    Responses are marked `Cache-Control: private, no-cache` so clients keep them but
+    revalidate before reuse.
+
+    Args:
+        etag (str): The current ETag, usually from `make_etag` over a model's version stamp.
+        build (function): Renders the full response as `(response, status_code)`.
+        vary (Iterable[str]): Request headers the representation depends on, e.g. `Authorization`.
+
+    Returns:
+        Tuple[Response, int]: Either an empty 304 response or the built response.
+    """
+    if etag_matches(etag, request.headers.get("If-None-Match")):
+        return _with_validators(Response(status=304), etag, vary), 304
+
+    response, status_code = build()
+    if status_code == 200:
+        _with_validators(response, etag, vary)
+    return response, status_code
@@ -1,15 +1,22 @@
+import json
 from math import ceil
-from flask import request
-from datetime import datetime
+from flask import current_app, request
+from datetime import date, datetime
+from itsdangerous import BadSignature, URLSafeSerializer
+from sqlalchemy import and_, or_
 from sqlalchemy.sql import func
 from sqlalchemy.orm import aliased
 from sqlalchemy.orm.attributes import InstrumentedAttribute
-from typing import Optional, Tuple, Dict, Any, List, Callable
+from typing import Optional, Sequence, Tuple, Dict, Any, List, Callable
 from sqlalchemy.orm.query import Query
 from app.types.consts import (
     PAGE_PARAM,
-    PER_PAGE_PARAM
+    PER_PAGE_PARAM,
+    CURSOR_PARAM,
+    COUNT_PARAM
 )
+from app.types.enum import CountStrategy
+from app.utils.cache import TTLCache
 from app.types.length import (
     PAGE,
     PER_PAGE,
@@ -36,8 +43,9 @@ def get_filter_params() -> Dict[str, Any]:
     filters = {}
 
     # Iterate through the request body parameters
-    if request.json and 'filter' in request.json:
-        for filter_item in request.json['filter']:
+    body = request.get_json(silent=True)
+    if body and 'filter' in body:
+        for filter_item in body['filter']:
             for key, value in filter_item.items():
                     filters[key] = value
     return filters
@@ -51,8 +59,9 @@ def get_sort_params():
     sort_parms = {}
 
     # Check if the request body contains the "sort" object
-    if request.json and 'sort' in request.json:
-        for sort_item in request.json['sort']:
+    body = request.get_json(silent=True)
+    if body and 'sort' in body:
+        for sort_item in body['sort']:
             for key, value in sort_item.items():
                 sort_parms[key] = value
     return sort_parms
@@ -108,12 +117,100 @@ def get_pagination_params() -> Tuple[int, int]:
     # Return page number and number of items per page
     return page, per_page
 
+def get_cursor_params() -> Tuple[Optional[str], bool]:
+    """
+    Helper function to get keyset pagination parameters from the request query string.
+
+    :return: Tuple with the cursor (None if the client asked for offset pagination) and whether the total count is requested.
+             An empty cursor parameter requests the first page.
+    """
+    cursor = request.args.get(CURSOR_PARAM, None, type=str)
+    with_total = request.args.get(COUNT_PARAM, "false", type=str).lower() == "true"
+    return cursor, with_total
+
+#region COUNTING
+def _count_cache() -> TTLCache:
+    cache = current_app.extensions.get("count_cache")
+    if cache is None:
+        cache = current_app.extensions.setdefault("count_cache", TTLCache(
+            maxsize=current_app.config.get("COUNT_CACHE_MAX_SIZE", 1024),
+            ttl=current_app.config.get("COUNT_CACHE_TTL_SECONDS", 30),
+        ))
+    return cache
+
+def _compile(query: Query):
+    statement = query.order_by(None).statement
+    return statement.compile(dialect=query.session.get_bind().dialect)
+
+def _cached_count(query: Query) -> int:
+    compiled = _compile(query)
+    key = (str(compiled), repr(sorted(compiled.params.items())))
+    cache = _count_cache()
+    total = cache.get(key)
+    if total is None:
+        total = query.order_by(None).count()
+        cache.set(key, total)
+    return total
+
+def _estimated_count(query: Query) -> Optional[int]:
+    """
+    Asks the database to estimate how many rows the query returns, without running it.
+
+    :return: The estimate, or None if the database cannot provide one.
+    """
+    dialect = query.session.get_bind().dialect.name
+    if dialect not in ("mysql", "mariadb", "postgresql"):
+        return None
+
+    compiled = _compile(query)
+    parameters = tuple(compiled.params[name] for name in compiled.positiontup) if compiled.positional else compiled.params
+    connection = query.session.connection()
+    if dialect == "postgresql":
+        plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", parameters).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    # MySQL estimates rows per table. Joined and dependent subquery rows are per outer row and
+    # do not multiply into a result size, so only single-table plans are estimated
+    rows = connection.exec_driver_sql(f"EXPLAIN {compiled}", parameters).mappings().all()
+    if len(rows) != 1 or rows[0].get("rows") is None:
+        return None
+    return int(round(float(rows[0]["rows"]) * float(rows[0].get("filtered") or 100) / 100))
+
+def count_query(query: Query, strategy: CountStrategy = CountStrategy.EXACT) -> Tuple[Optional[int], CountStrategy]:
+    """
+    Helper function to count the rows of a SQLAlchemy query with the given strategy.
+
+    Cached counts are keyed by the query's compiled SQL and parameters and live for
+    `COUNT_CACHE_TTL_SECONDS`. Estimates come from the query plan (MySQL/PostgreSQL table
+    statistics) and can be far off for selective filters; where no estimate is available,
+    including MySQL plans reading more than one table, the cached exact count is used instead.
+
+    :param query: SQLAlchemy query object.
+    :param strategy: The counting strategy.
+    :return: Tuple with the total (None for `CountStrategy.NONE`) and the strategy that was used.
+    """
+    if strategy == CountStrategy.NONE:
+        return None, strategy
+    if strategy == CountStrategy.ESTIMATED:
+        estimate = _estimated_count(query)
+        if estimate is not None:
+            return estimate, strategy
+        strategy = CountStrategy.CACHED
+    if strategy == CountStrategy.CACHED:
+        return _cached_count(query), strategy
+    return query.order_by(None).count(), CountStrategy.EXACT
+#endregion
+
 def paginate_query(
     query: Query,
     page: int = PAGE,
     per_page: int = PER_PAGE,
     items_name: str = 'items',
-    to_representation: Optional[Callable] = None
+    to_representation: Optional[Callable] = None,
+    cursor_keys: Optional[Sequence[Tuple[InstrumentedAttribute, str]]] = None,
+    count_strategy: CountStrategy = CountStrategy.EXACT
 ) -> Dict[str, Any]:
     """
     Helper function to paginate a SQLAlchemy query.
@@ -123,32 +220,268 @@ def paginate_query(
     :param per_page: Number of items per page. Defaults to 20.
     :param items_name: Key for the items in the response. Defaults to 'items'.
     :param to_representation: Function to represent the object. Defaults to None (to_dict method will be used).
+    :param cursor_keys: The keys the query is ordered by, as for `keyset_paginate`. If given, `_meta` also
+                        contains cursors so clients can switch to keyset pagination from any page.
+    :param count_strategy: How `total` is computed, see `CountStrategy`. Defaults to an exact count.
     :return: Dictionary with paginated results and metadata.
     """
     # Total number of items
-    total = query.count()
+    total, count_strategy = count_query(query, count_strategy)
     
     # Calculate the number of pages
-    total_pages = ceil(total / per_page)
+    total_pages = ceil(total / per_page) if total is not None else None
 
     # Apply limit and offset to the query for pagination
-    items = query.limit(per_page).offset((page - 1) * per_page).all()
+    if count_strategy == CountStrategy.EXACT:
+        items = query.limit(per_page).offset((page - 1) * per_page).all()
+        has_next = page < total_pages
+    else:
+        # The total may be stale, approximate or missing, so fetch one extra row to learn whether there is another page
+        items = query.limit(per_page + 1).offset((page - 1) * per_page).all()
+        has_next = len(items) > per_page
+        items = items[:per_page]
 
     # Use the specified function or fallback to to_dict if not provided
     if to_representation is None:
         to_representation = lambda obj: obj.to_dict()
 
     # Return paginated data and metadata
-    return {
+    result = {
         items_name: [to_representation(i) for i in items],  # Paginated items
         "_meta" : {
             'total': total,               # Total number of items
             'pages': total_pages,         # Total number of pages
             'current_page': page,         # Current page number
-            'next_page': page + 1 if page < total_pages else None,  # Next page number or None
-            'prev_page': page - 1 if page > 1 else None  # Previous page number or None
+            'next_page': page + 1 if has_next else None,  # Next page number or None
+            'prev_page': page - 1 if page > 1 else None,  # Previous page number or None
+            'count_strategy': count_strategy.value  # How the total was computed
+        }
+    }
+
+    if cursor_keys is not None:
+        salt = _cursor_salt(items_name, cursor_keys)
+        result["_meta"]['next_cursor'] = _encode_cursor(_row_key(items[-1], cursor_keys), "next", salt) if items and has_next else None
+        result["_meta"]['prev_cursor'] = _encode_cursor(_row_key(items[0], cursor_keys), "prev", salt) if items and page > 1 else None
+
+    return result
+
+#region KEYSET PAGINATION
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor is malformed, tampered with or belongs to another listing."""
+
+def _cursor_serializer(salt: str) -> URLSafeSerializer:
+    return URLSafeSerializer(current_app.config["SECRET_KEY"], salt=salt)
+
+def _cursor_salt(items_name: str, keys: Sequence[Tuple[InstrumentedAttribute, str]]) -> str:
+    # Binds cursors to the listing and its ordering, so they cannot be replayed elsewhere
+    return "keyset:" + items_name + ":" + ",".join(f"{column.class_.__tablename__}.{column.key}:{direction}" for column, direction in keys)
+
+def _dump_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    return value
+
+def _load_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        raise ValueError("Unknown cursor value")
+    return value
+
+def _encode_cursor(values: Sequence[Any], direction: str, salt: str) -> str:
+    return _cursor_serializer(salt).dumps({"k": [_dump_value(value) for value in values], "d": direction})
+
+def _decode_cursor(cursor: str, salt: str, key_count: int) -> Tuple[List[Any], str]:
+    try:
+        payload = _cursor_serializer(salt).loads(cursor)
+        values = [_load_value(value) for value in payload["k"]]
+        direction = payload["d"]
+    except (BadSignature, KeyError, TypeError, ValueError):
+        raise InvalidCursorError("Invalid pagination cursor.")
+    if len(values) != key_count or direction not in ("next", "prev"):
+        raise InvalidCursorError("Invalid pagination cursor.")
+    return values, direction
+
+def _row_key(row: Any, keys: Sequence[Tuple[InstrumentedAttribute, str]]) -> List[Any]:
+    return [getattr(row, column.key) for column, _ in keys]
+
+def _after(keys: Sequence[Tuple[InstrumentedAttribute, str]], values: Sequence[Any], backward: bool):
+    """
+    Builds `(k1, k2, ...) > (v1, v2, ...)` in the given ordering, expanded to
+    `k1 > v1 OR (k1 = v1 AND k2 > v2) ...` so each key may have its own direction.
+    """
+    conditions = []
+    for index, (column, direction) in enumerate(keys):
+        ascending = (direction == "asc") != backward
+        comparison = column > values[index] if ascending else column < values[index]
+        equalities = [keys[i][0] == values[i] for i in range(index)]
+        conditions.append(and_(*equalities, comparison) if equalities else comparison)
+    return or_(*conditions)
+
+def keyset_paginate(
+    query: Query,
+    keys: Sequence[Tuple[InstrumentedAttribute, str]],
+    cursor: Optional[str] = None,
+    per_page: int = PER_PAGE,
+    items_name: str = 'items',
+    to_representation: Optional[Callable] = None,
+    count_strategy: CountStrategy = CountStrategy.NONE,
+    prepare: Optional[Callable[[List[Any]], Any]] = None
+) -> Dict[str, Any]:
+    """
+    Helper function to paginate a SQLAlchemy query with keyset (cursor) pagination.
+
+    Instead of `OFFSET`, each page continues after the key of the last row of the previous
+    page, so deep pages cost the same as the first one when an index covers the keys.
+    Cursors are opaque and signed with the application's `SECRET_KEY`.
+
+    :param query: SQLAlchemy query object. It must not be ordered; the keys define the order.
+    :param keys: The ordering as `(column, 'asc' | 'desc')` pairs, e.g. `[(Model.created_at, 'desc'), (Model.id, 'desc')]`.
+                 Together the columns must be unique and non-null, and belong to the queried entity.
+    :param cursor: A `next_cursor` or `prev_cursor` from a previous page. None or empty for the first page.
+    :param per_page: Number of items per page. Defaults to 20.
+    :param items_name: Key for the items in the response. Defaults to 'items'.
+    :param to_representation: Function to represent the object. Defaults to None (to_dict method will be used).
+    :param count_strategy: How `total` and `pages` are computed, see `CountStrategy`. Defaults to not counting.
+    :param prepare: Called with the page's rows before they are represented, e.g. to batch-load data
+                    `to_representation` needs. Its return value is passed to `to_representation` as a second argument.
+    :return: Dictionary with paginated results and metadata. `_meta` has the same keys as `paginate_query`
+             (page numbers are None) plus `next_cursor` and `prev_cursor`.
+    :raises InvalidCursorError: If the cursor is malformed or was issued for another listing.
+    """
+    salt = _cursor_salt(items_name, keys)
+    values, direction = _decode_cursor(cursor, salt, len(keys)) if cursor else (None, "next")
+    backward = direction == "prev"
+
+    total, count_strategy = count_query(query, count_strategy)
+
+    # Fetch one extra row to learn whether there is another page
+    rows = _keyset_rows(query, keys, values, backward, per_page + 1)
+    return _keyset_page(rows, keys, values, backward, per_page, salt, total, count_strategy, items_name, to_representation, prepare)
+
+def keyset_paginate_merged(
+    sources: Sequence[Tuple[Query, Sequence[Tuple[InstrumentedAttribute, str]]]],
+    cursor: Optional[str] = None,
+    per_page: int = PER_PAGE,
+    items_name: str = 'items',
+    to_representation: Optional[Callable] = None,
+    count_strategy: CountStrategy = CountStrategy.NONE,
+    prepare: Optional[Callable[[List[Any]], Any]] = None
+) -> Dict[str, Any]:
+    """
+    Helper function to paginate the merge of several queries with keyset (cursor) pagination.
+
+    Each source is paged on its own keys with the same cursor, so each runs as its own
+    indexed query of at most `per_page + 1` rows, and the rows are merged in key order.
+    Rows with the same key in several sources are returned once.
+
+    :param sources: The queries as `(query, keys)` pairs, see `keyset_paginate`. The queries must return
+                    the same entity, and every source's keys must have the same directions and attribute
+                    names as the first's, e.g. a denormalized copy of the entity's ordering columns.
+    :param cursor: A `next_cursor` or `prev_cursor` from a previous page. None or empty for the first page.
+    :param per_page: Number of items per page. Defaults to 20.
+    :param items_name: Key for the items in the response. Defaults to 'items'.
+    :param to_representation: Function to represent the object. Defaults to None (to_dict method will be used).
+    :param count_strategy: How `total` and `pages` are computed, see `CountStrategy`. The total is the sum
+                           of the sources' totals and counts rows in several sources more than once. It is
+                           reported as estimated if any source's total was estimated.
+    :param prepare: Called with the page's rows before they are represented, see `keyset_paginate`.
+    :return: Dictionary with paginated results and metadata, as returned by `keyset_paginate`.
+    :raises ValueError: If `sources` is empty.
+    :raises InvalidCursorError: If the cursor is malformed or was issued for another listing.
+    """
+    if not sources:
+        raise ValueError("At least one source is required.")
+    keys = sources[0][1]
+    salt = _cursor_salt(items_name, keys)
+    values, direction = _decode_cursor(cursor, salt, len(keys)) if cursor else (None, "next")
+    backward = direction == "prev"
+
+    total = None
+    strategies = set()
+    for query, _ in sources:
+        source_total, strategy = count_query(query, count_strategy)
+        strategies.add(strategy)
+        if source_total is not None:
+            total = (total or 0) + source_total
+    # Sources without a row estimate fall back to cached counts; the sum is only as exact as its least exact part
+    count_strategy = CountStrategy.ESTIMATED if CountStrategy.ESTIMATED in strategies else strategies.pop()
+
+    merged: Dict[Tuple[Any, ...], Any] = {}
+    for query, source_keys in sources:
+        for row in _keyset_rows(query, source_keys, values, backward, per_page + 1):
+            merged.setdefault(tuple(_row_key(row, keys)), row)
+    rows = list(merged.values())
+    # Sort on the least significant key first; each stable sort keeps the order of the keys after it
+    for column, order in reversed(keys):
+        rows.sort(key=lambda row: getattr(row, column.key), reverse=(order == "desc") != backward)
+    return _keyset_page(rows[:per_page + 1], keys, values, backward, per_page, salt, total, count_strategy, items_name, to_representation, prepare)
+
+def _keyset_rows(
+    query: Query,
+    keys: Sequence[Tuple[InstrumentedAttribute, str]],
+    values: Optional[List[Any]],
+    backward: bool,
+    limit: int
+) -> List[Any]:
+    """Fetches up to `limit` rows after the cursor `values`, in page order (reversed when going back)."""
+    if values is not None:
+        query = query.filter(_after(keys, values, backward))
+    ordering = [
+        column.asc() if (order == "asc") != backward else column.desc()
+        for column, order in keys
+    ]
+    return query.order_by(*ordering).limit(limit).all()
+
+def _keyset_page(
+    rows: List[Any],
+    keys: Sequence[Tuple[InstrumentedAttribute, str]],
+    values: Optional[List[Any]],
+    backward: bool,
+    per_page: int,
+    salt: str,
+    total: Optional[int],
+    count_strategy: CountStrategy,
+    items_name: str,
+    to_representation: Optional[Callable],
+    prepare: Optional[Callable[[List[Any]], Any]]
+) -> Dict[str, Any]:
+    """Builds a page and its cursors from up to `per_page + 1` rows fetched by `_keyset_rows`."""
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if backward:
+        rows.reverse()
+
+    # Going forward there is a previous page whenever we came from a cursor; going back, a next page always exists
+    has_next = has_more if not backward else True
+    has_prev = (values is not None) if not backward else has_more
+
+    if to_representation is None:
+        to_representation = lambda obj: obj.to_dict()
+    if prepare is not None:
+        context = prepare(rows)
+        items = [to_representation(row, context) for row in rows]
+    else:
+        items = [to_representation(row) for row in rows]
+
+    return {
+        items_name: items,
+        "_meta": {
+            'total': total,
+            'pages': ceil(total / per_page) if total is not None else None,
+            'current_page': None,
+            'next_page': None,
+            'prev_page': None,
+            'next_cursor': _encode_cursor(_row_key(rows[-1], keys), "next", salt) if rows and has_next else None,
+            'prev_cursor': _encode_cursor(_row_key(rows[0], keys), "prev", salt) if rows and has_prev else None,
+            'count_strategy': count_strategy.value
         }
     }
+#endregion
 
 def build_sort_conditions(
     model,
@@ -0,0 +1,97 @@
+import json
+import uuid
+import decimal
+import dataclasses
+from enum import Enum
+from datetime import date, datetime, time
+from typing import Any, Union
+from flask import Flask, Response
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+ORJSON_OPTIONS: int = orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+
+def _default(o: Any) -> Any:
+    """
+    Converts values neither encoder handles natively.
+
+    datetimes, dates and times become ISO-8601 strings and enums their value, so
+    the output is the same whether or not orjson is installed.
+    """
+    if isinstance(o, (datetime, date, time)):
+        return o.isoformat()
+    if isinstance(o, Enum):
+        return o.value
+    if isinstance(o, (decimal.Decimal, uuid.UUID)):
+        return str(o)
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    if hasattr(o, "__html__"):
+        return str(o.__html__())
+    if isinstance(o, (set, frozenset)):
+        return list(o)
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    A JSON provider that encodes responses with orjson when it is installed.
+
+    Compared to Flask's default provider:
+
+    - datetimes and dates are emitted as ISO-8601 (`2024-01-01T12:30:00`) instead of HTTP dates;
+    - enums are emitted as their value;
+    - keys are not sorted and output is never pretty-printed;
+    - responses are built straight from the encoded bytes.
+
+    Without orjson the same output is produced with the standard library `json` module.
+    """
+    sort_keys = False
+    compact = True
+    ensure_ascii = False
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if orjson is not None and not kwargs:
+            try:
+                return orjson.dumps(obj, default=_default, option=ORJSON_OPTIONS).decode("utf-8")
+            except TypeError:
+                # e.g. integers above 64 bits; the standard library handles them
+                pass
+        kwargs.setdefault("default", _default)
+        kwargs.setdefault("ensure_ascii", self.ensure_ascii)
+        kwargs.setdefault("sort_keys", self.sort_keys)
+        kwargs.setdefault("separators", (",", ":"))
+        return json.dumps(obj, **kwargs)
+
+    def dumps_bytes(self, obj: Any) -> bytes:
+        """Encodes `obj` to UTF-8 JSON bytes, skipping the str round trip when orjson is available."""
+        if orjson is not None:
+            try:
+                return orjson.dumps(obj, default=_default, option=ORJSON_OPTIONS)
+            except TypeError:
+                pass
+        return self.dumps(obj).encode("utf-8")
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj) + b"\n", mimetype=self.mimetype)
+
+
+def init_json_provider(app: Flask) -> None:
+    """
+    Installs `FastJSONProvider` as the application's JSON provider.
+
+    Args:
+        app (Flask): The application.
+    """
+    app.json = FastJSONProvider(app)
@@ -0,0 +1,518 @@
+import os
+import re
+import hmac
+import json
+import time
+import atexit
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from sqlalchemy import event
+from flask import Flask, Response, current_app, g, jsonify, request
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from app import db
+
+LATENCY_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS: Tuple[float, ...] = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+GaugeCallback = Callable[[], Iterable[Tuple[Dict[str, str], float]]]
+
+
+# ----------------- METRIC TYPES ----------------- #
+class Metric:
+    """
+    Base class for a named metric family with a fixed set of label names.
+
+    Attributes:
+        name (str): The metric name, e.g. `http_requests_total`.
+        help (str): The description rendered in the `# HELP` line.
+        labelnames (Tuple[str, ...]): The label names, in order.
+    """
+    type: str = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"Metric '{self.name}' expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            values = [[list(key), value if not isinstance(value, list) else [list(value[0]), value[1], value[2]]]
+                      for key, value in self._values.items()]
+        return {"type": self.type, "help": self.help, "labelnames": list(self.labelnames), "values": values}
+
+
+class Counter(Metric):
+    """A monotonically increasing value."""
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Histogram(Metric):
+    """
+    Counts observations into cumulative buckets and tracks their sum.
+
+    Attributes:
+        buckets (Tuple[float, ...]): Upper bounds of the buckets, excluding `+Inf`.
+    """
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                # [per-bucket counts (last one is +Inf), sum, count]
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        data = super().snapshot()
+        data["buckets"] = list(self.buckets)
+        return data
+
+
+# ----------------- REGISTRY ----------------- #
+class MetricsRegistry:
+    """
+    Holds the metrics of the current process.
+
+    Counters and histograms are created once and updated in place. Gauges are
+    collected lazily from callbacks when a snapshot is taken, so values such as
+    pool sizes or cache occupancy never go stale.
+    """
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Metric] = {}
+        self._gauges: Dict[str, Tuple[str, GaugeCallback]] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Returns the counter called `name`, creating it on first use."""
+        return self._get_or_create(Counter, name, help, labelnames)
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        """Returns the histogram called `name`, creating it on first use."""
+        return self._get_or_create(Histogram, name, help, labelnames, buckets=buckets)
+
+    def register_gauge_callback(self, name: str, help: str, callback: GaugeCallback) -> None:
+        """
+        Registers a gauge whose samples are produced by `callback` at collection time.
+
+        Args:
+            name (str): The gauge name.
+            help (str): The description rendered in the `# HELP` line.
+            callback (function): Returns an iterable of `(labels, value)` pairs. Every pair must use
+                the same label names. Exceptions are swallowed so a failing gauge cannot break `/metrics`.
+        """
+        with self._lock:
+            self._gauges[name] = (help, callback)
+
+    def _get_or_create(self, cls, name: str, help: str, labelnames: Sequence[str], **kwargs) -> Any:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help, labelnames, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric '{name}' is already registered as a {metric.type}")
+            return metric
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns a JSON-serializable snapshot of every metric in this process.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+            gauges = list(self._gauges.items())
+
+        data = {metric.name: metric.snapshot() for metric in metrics}
+        for name, (help, callback) in gauges:
+            try:
+                samples = list(callback())
+            except Exception:
+                continue
+            labelnames = sorted(samples[0][0]) if samples else []
+            data[name] = {
+                "type": "gauge",
+                "help": help,
+                "labelnames": labelnames,
+                "values": [[[str(labels[label]) for label in labelnames], value] for labels, value in samples],
+            }
+        return data
+
+
+def merge_snapshots(snapshots: Iterable[Dict[str, Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Merges snapshots from several processes into one.
+
+    Counters, histograms and gauges are all summed per label set, so gauges
+    such as checked-out connections report the total across workers.
+
+    Args:
+        snapshots (Iterable[dict]): Snapshots as returned by `MetricsRegistry.snapshot`.
+
+    Returns:
+        dict: The merged snapshot.
+    """
+    merged: Dict[str, Dict[str, Any]] = {}
+    for snapshot in snapshots:
+        for name, family in snapshot.items():
+            target = merged.get(name)
+            if target is None:
+                target = merged[name] = {key: value for key, value in family.items() if key != "values"}
+                target["values"] = {}
+            if family.get("buckets") != target.get("buckets") or family["labelnames"] != target["labelnames"]:
+                # A worker running a different version of the code; skip rather than mix incompatible series
+                continue
+            for labels, value in family["values"]:
+                key = tuple(labels)
+                current = target["values"].get(key)
+                if family["type"] == "histogram":
+                    if current is None:
+                        current = target["values"][key] = [[0] * len(value[0]), 0.0, 0]
+                    current[0] = [a + b for a, b in zip(current[0], value[0])]
+                    current[1] += value[1]
+                    current[2] += value[2]
+                else:
+                    target["values"][key] = (current or 0) + value
+
+    for family in merged.values():
+        family["values"] = [[list(key), value] for key, value in family["values"].items()]
+    return merged
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames: Sequence[str], labelvalues: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(zip(labelnames, labelvalues))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label_value(str(value))}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def render_text(snapshot: Dict[str, Dict[str, Any]]) -> str:
+    """
+    Renders a snapshot in the Prometheus text exposition format (version 0.0.4).
+
+    Args:
+        snapshot (dict): A snapshot as returned by `MetricsRegistry.snapshot` or `merge_snapshots`.
+
+    Returns:
+        str: The rendered metrics.
+    """
+    lines: List[str] = []
+    for name in sorted(snapshot):
+        family = snapshot[name]
+        labelnames = family["labelnames"]
+        lines.append(f"# HELP {name} {family['help']}")
+        lines.append(f"# TYPE {name} {family['type']}")
+        for labelvalues, value in sorted(family["values"], key=lambda item: item[0]):
+            if family["type"] == "histogram":
+                bucket_counts, total, count = value
+                cumulative = 0
+                for bound, bucket_count in zip(list(family["buckets"]) + [float("inf")], bucket_counts):
+                    cumulative += bucket_count
+                    lines.append(f"{name}_bucket{_format_labels(labelnames, labelvalues, ('le', _format_value(bound)))} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labelnames, labelvalues)} {_format_value(total)}")
+                lines.append(f"{name}_count{_format_labels(labelnames, labelvalues)} {count}")
+            else:
+                lines.append(f"{name}{_format_labels(labelnames, labelvalues)} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+REQUESTS_TOTAL = registry.counter("http_requests_total", "Total HTTP requests.", ("method", "route", "status"))
+REQUEST_DURATION = registry.histogram("http_request_duration_seconds", "HTTP request latency in seconds.", ("method", "route"))
+RESPONSE_SIZE = registry.histogram("http_response_size_bytes", "HTTP response body size in bytes.", ("method", "route"), buckets=SIZE_BUCKETS)
+POOL_CHECKOUTS = registry.counter("db_pool_checkouts_total", "Connections checked out of the SQLAlchemy pool.", ("engine",))
+POOL_CHECKINS = registry.counter("db_pool_checkins_total", "Connections returned to the SQLAlchemy pool.", ("engine",))
+POOL_CONNECTS = registry.counter("db_pool_connections_created_total", "New DBAPI connections opened by the SQLAlchemy pool.", ("engine",))
+
+
+def register_gauge_callback(name: str, help: str, callback: GaugeCallback) -> None:
+    """
+    Registers a gauge on the process-wide registry. See `MetricsRegistry.register_gauge_callback`.
+    """
+    registry.register_gauge_callback(name, help, callback)
+
+
+# ----------------- MULTI-PROCESS ----------------- #
+class _SnapshotWriter:
+    """
+    Periodically writes this worker's snapshot to `<directory>/<pid>.json`.
+
+    Files are replaced atomically, so a scrape never reads a partial file. When a
+    worker exits, its counters and histograms are folded into `<directory>/exited.json`
+    and its file is removed, so the merged counters never go backwards and the
+    directory does not grow with every worker recycle. Gauges of exited workers no
+    longer describe anything and are dropped. Files left by workers that died
+    without running their exit handlers are folded by the next scrape.
+    """
+    def __init__(self, directory: str, interval: float) -> None:
+        self.directory = directory
+        self.interval = interval
+        self._last_write = 0.0
+        self._closed = False
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        atexit.register(self.close)
+
+    def _path(self, pid: int) -> str:
+        return os.path.join(self.directory, f"{pid}.json")
+
+    def maybe_write(self) -> None:
+        if time.monotonic() - self._last_write >= self.interval:
+            self.write()
+
+    def write(self) -> None:
+        with self._lock:
+            if self._closed:
+                # The file was folded; writing it again would count this worker twice
+                return
+            self._last_write = time.monotonic()
+            _write_json(self._path(os.getpid()), registry.snapshot())
+
+    def close(self) -> None:
+        """Folds this worker's counters into the exited workers' totals and removes its file."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            try:
+                with self._exited_lock():
+                    self._fold_exited({self._path(os.getpid()): registry.snapshot()})
+            except OSError:
+                # The directory was removed, e.g. by a deployment cleaning up; nothing to fold into
+                pass
+
+    @contextmanager
+    def _exited_lock(self) -> Iterator[None]:
+        # POSIX only, like the multi-process servers this directory is meant for
+        import fcntl
+
+        # Held while folding and while scraping, so a scrape never counts a worker both
+        # in its own file and in the exited totals, and a dead worker is folded only once
+        with open(os.path.join(self.directory, "exited.lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            yield
+
+    def _fold_exited(self, snapshots: Dict[str, Optional[Dict[str, Dict[str, Any]]]]) -> None:
+        folded = []
+        for path, snapshot in snapshots.items():
+            if snapshot is None:
+                snapshot = _read_json(path)
+                if snapshot is None:
+                    continue
+            folded.append({name: family for name, family in snapshot.items() if family["type"] != "gauge"})
+        if folded:
+            exited_path = os.path.join(self.directory, "exited.json")
+            _write_json(exited_path, merge_snapshots([_read_json(exited_path) or {}, *folded]))
+        for path in snapshots:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def read_all(self) -> List[Dict[str, Dict[str, Any]]]:
+        snapshots, exited = [], {}
+        with self._exited_lock():
+            for filename in os.listdir(self.directory):
+                if not filename.endswith(".json") or not filename[:-len(".json")].isdigit():
+                    continue
+                path = os.path.join(self.directory, filename)
+                if not _process_alive(int(filename[:-len(".json")])):
+                    exited[path] = None
+                    continue
+                snapshot = _read_json(path)
+                if snapshot is not None:
+                    snapshots.append(snapshot)
+            if exited:
+                self._fold_exited(exited)
+            snapshot = _read_json(os.path.join(self.directory, "exited.json"))
+        if snapshot is not None:
+            snapshots.append(snapshot)
+        return snapshots
+
+
+def _write_json(path: str, data: Any) -> None:
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        json.dump(data, handle)
+    os.replace(tmp_path, path)
+
+
+def _read_json(path: str) -> Optional[Any]:
+    try:
+        with open(path, encoding="utf-8") as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return None
+
+
+_writer: Optional[_SnapshotWriter] = None
+
+
+def _process_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        # The process exists but belongs to another user
+        return True
+    return True
+
+
+# ----------------- REQUEST HOOKS ----------------- #
+_CONVERTER_PATTERN = re.compile(r"<(?:[^<>:]+:)?([^<>]+)>")
+
+
+def route_template(rule: str, prefix: str = "") -> str:
+    """
+    Normalizes a URL rule into a low-cardinality route label.
+
+    Example:
+        `/api/v1/posts/<string:post_id>` with prefix `/api/v1` becomes `/posts/<post_id>`.
+    """
+    if prefix and rule.startswith(prefix):
+        rule = rule[len(prefix):] or "/"
+    return _CONVERTER_PATTERN.sub(r"<\1>", rule)
+
+
+def _start_timer() -> None:
+    if current_app.extensions["metrics"]["blueprint"] in request.blueprints:
+        g.metrics_start_time = time.perf_counter()
+
+
+def _record_request(response: Response) -> Response:
+    start = g.pop("metrics_start_time", None)
+    if start is None or request.url_rule is None:
+        return response
+
+    route = route_template(request.url_rule.rule, current_app.extensions["metrics"]["route_prefix"])
+    method = request.method
+    REQUESTS_TOTAL.inc(method=method, route=route, status=response.status_code)
+    REQUEST_DURATION.observe(time.perf_counter() - start, method=method, route=route)
+    if not response.is_streamed:
+        RESPONSE_SIZE.observe(response.calculate_content_length() or 0, method=method, route=route)
+
+    if _writer is not None:
+        _writer.maybe_write()
+    return response
+
+
+def _pool_gauges(engines: Dict[str, Any]) -> GaugeCallback:
+    def collect():
+        for engine_name, engine in engines.items():
+            pool = engine.pool
+            for stat in ("size", "checkedout", "checkedin", "overflow"):
+                method = getattr(pool, stat, None)
+                if callable(method):
+                    yield {"engine": engine_name, "stat": stat}, method()
+    return collect
+
+
+def _instrument_pool(engine_name: str, engine) -> None:
+    event.listen(engine, "checkout", lambda *args: POOL_CHECKOUTS.inc(engine=engine_name))
+    event.listen(engine, "checkin", lambda *args: POOL_CHECKINS.inc(engine=engine_name))
+    event.listen(engine, "connect", lambda *args: POOL_CONNECTS.inc(engine=engine_name))
+
+
+def _metrics_authorized() -> bool:
+    token = current_app.config["METRICS_TOKEN"]
+    if token:
+        scheme, _, credentials = request.headers.get("Authorization", "").partition(" ")
+        return scheme.lower() == "bearer" and hmac.compare_digest(credentials.encode(), token.encode())
+    api_key = current_app.config.get("API_KEY")
+    return bool(api_key) and hmac.compare_digest(request.headers.get("x-api-key", "").encode(), api_key.encode())
+
+
+def metrics_view() -> Response:
+    """
+    Serves the metrics of this process, or of every worker when `METRICS_MULTIPROC_DIR` is set.
+
+    Requires `Authorization: Bearer <METRICS_TOKEN>`, or the API key in `x-api-key`
+    when `METRICS_TOKEN` is not set.
+    """
+    if not _metrics_authorized():
+        return jsonify({"message": "Forbidden or Invalid API key"}), 403
+    if _writer is not None:
+        _writer.write()
+        snapshot = merge_snapshots(_writer.read_all())
+    else:
+        snapshot = registry.snapshot()
+    return Response(render_text(snapshot), mimetype="text/plain; version=0.0.4; charset=utf-8")
+
+
+def init_metrics(app: Flask, blueprint: str, route_prefix: str = "") -> None:
+    """
+    Instruments the requests handled by `blueprint` (and its nested blueprints) and serves `/metrics`.
+
+    Per request, the method, route template and status code are recorded together
+    with latency and response size. SQLAlchemy pool checkouts, checkins and new
+    connections are counted for every engine and pool occupancy is exposed as gauges.
+
+    Set `METRICS_MULTIPROC_DIR` when running several worker processes: each worker
+    then writes its snapshot to that directory at most every `METRICS_FLUSH_INTERVAL`
+    seconds, and `/metrics` merges all of them. Scrapers authenticate with
+    `METRICS_TOKEN` as a bearer token, or with the API key if no token is set.
+
+    Args:
+        app (Flask): The application.
+        blueprint (str): The name of the blueprint to instrument, e.g. `api_v1`.
+        route_prefix (str, optional): The URL prefix to strip from route labels, e.g. `/api/v1`.
+    """
+    global _writer
+    app.config.setdefault("METRICS_ENABLED", True)
+    app.config.setdefault("METRICS_MULTIPROC_DIR", None)
+    app.config.setdefault("METRICS_FLUSH_INTERVAL", 1.0)
+    app.config.setdefault("METRICS_TOKEN", None)
+    if not app.config["METRICS_ENABLED"]:
+        return
+
+    app.extensions["metrics"] = {"blueprint": blueprint, "route_prefix": route_prefix}
+    app.before_request(_start_timer)
+    app.after_request(_record_request)
+
+    with app.app_context():
+        engines = {name or "default": engine for name, engine in db.engines.items()}
+    for engine_name, engine in engines.items():
+        _instrument_pool(engine_name, engine)
+    register_gauge_callback("db_pool_connections", "SQLAlchemy pool occupancy by stat.", _pool_gauges(engines))
+
+    if app.config["METRICS_MULTIPROC_DIR"] and _writer is None:
+        _writer = _SnapshotWriter(app.config["METRICS_MULTIPROC_DIR"], float(app.config["METRICS_FLUSH_INTERVAL"]))
+
+    app.add_url_rule("/metrics", "metrics", metrics_view, methods=["GET"])
@@ -0,0 +1,171 @@
+import os
+import sys
+import time
+import uuid
+import random
+import cProfile
+import threading
+from functools import wraps
+from collections import Counter
+from typing import Callable, Dict
+from flask import Flask, current_app, g, request
+from flask_jwt_extended import get_jwt, verify_jwt_in_request
+from app.types.enum import UserType
+
+# Guards the collapsed-stack files, which are read, merged and rewritten by every profiled request
+_collapsed_lock = threading.Lock()
+
+
+class StackSampler:
+    """
+    Samples the call stack of one thread at a fixed interval from a background thread.
+
+    Samples are kept in the collapsed-stack format used by flame graph tools:
+    `outermost;...;innermost count`.
+
+    Attributes:
+        thread_id (int): The thread to sample.
+        interval (float): Seconds between samples.
+        stacks (Counter): Collapsed stack -> number of samples.
+    """
+    def __init__(self, thread_id: int, interval: float) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(names))] += 1
+
+
+def _should_profile() -> bool:
+    config = current_app.config
+    if request.headers.get(config["PROFILING_HEADER"]):
+        # Explicit requests are honoured for admins only
+        try:
+            verify_jwt_in_request(optional=True)
+            if get_jwt().get("role") == UserType.ADMIN.value:
+                return True
+        except Exception:
+            pass
+    rate = config["PROFILING_SAMPLE_RATE"]
+    return rate > 0 and random.random() < rate
+
+
+def _merge_collapsed(path: str, stacks: Counter) -> None:
+    with _collapsed_lock:
+        merged: Counter = Counter()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as handle:
+                for line in handle:
+                    stack, _, count = line.rstrip("\n").rpartition(" ")
+                    if stack and count.isdigit():
+                        merged[stack] += int(count)
+        merged.update(stacks)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            for stack, count in merged.most_common():
+                handle.write(f"{stack} {count}\n")
+        os.replace(tmp_path, path)
+
+
+def _enforce_retention(directory: str, retention: int) -> None:
+    profiles = [os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(".pstats")]
+    if len(profiles) <= retention:
+        return
+    profiles.sort(key=lambda path: os.path.getmtime(path))
+    for path in profiles[:len(profiles) - retention]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _profiled_view(endpoint: str, view: Callable) -> Callable:
+    @wraps(view)
+    def decorated_function(*args, **kwargs):
+        if not _should_profile():
+            return view(*args, **kwargs)
+
+        config = current_app.config
+        directory = config["PROFILING_DIR"]
+        os.makedirs(directory, exist_ok=True)
+
+        profiler = cProfile.Profile()
+        sampler = StackSampler(threading.get_ident(), config["PROFILING_SAMPLE_INTERVAL"])
+        sampler.start()
+        profiler.enable()
+        try:
+            return view(*args, **kwargs)
+        finally:
+            profiler.disable()
+            sampler.stop()
+
+            profile_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{endpoint}-{uuid.uuid4().hex[:8]}"
+            profiler.dump_stats(os.path.join(directory, f"{profile_id}.pstats"))
+            if sampler.stacks:
+                _merge_collapsed(os.path.join(directory, f"{endpoint}.collapsed"), sampler.stacks)
+            _enforce_retention(directory, config["PROFILING_RETENTION"])
+            g.profile_id = profile_id
+    return decorated_function
+
+
+def _add_profile_header(response):
+    profile_id = g.get("profile_id")
+    if profile_id:
+        response.headers["X-Profile-Id"] = profile_id
+    return response
+
+
+def init_profiling(app: Flask) -> None:
+    """
+    Wraps every registered view in an on-demand profiler.
+
+    Nothing is installed unless `PROFILING_ENABLED` is set, so the hook costs
+    nothing when disabled. When enabled, a request is profiled if it carries the
+    `PROFILING_HEADER` header with an admin access token, or at random with
+    probability `PROFILING_SAMPLE_RATE`. For each profiled request:
+
+    - a cProfile dump is written to `PROFILING_DIR/<id>.pstats` (the id is returned
+      in the `X-Profile-Id` header), keeping at most `PROFILING_RETENTION` files;
+    - stack samples taken every `PROFILING_SAMPLE_INTERVAL` seconds are merged into
+      `PROFILING_DIR/<endpoint>.collapsed`, which can be fed to flamegraph.pl or speedscope.
+
+    Must be called after all blueprints have been registered.
+
+    Args:
+        app (Flask): The application.
+    """
+    app.config.setdefault("PROFILING_ENABLED", False)
+    if not app.config["PROFILING_ENABLED"]:
+        return
+
+    app.config.setdefault("PROFILING_SAMPLE_RATE", 0.0)
+    app.config.setdefault("PROFILING_DIR", "profiles")
+    app.config.setdefault("PROFILING_RETENTION", 100)
+    app.config.setdefault("PROFILING_HEADER", "X-Profile")
+    app.config.setdefault("PROFILING_SAMPLE_INTERVAL", 0.005)
+
+    views: Dict[str, Callable] = app.view_functions
+    for endpoint, view in list(views.items()):
+        if endpoint == "static":
+            continue
+        views[endpoint] = _profiled_view(endpoint, view)
+    app.after_request(_add_profile_header)
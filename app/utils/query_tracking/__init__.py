@@ -0,0 +1,211 @@
+import time
+from functools import wraps
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, List, Optional, Tuple
+from sqlalchemy import event
+from flask import Flask, Response, current_app, g, request
+from app import db
+
+# Trackers currently collecting statements in this context (request and/or test assertions)
+_active_trackers: ContextVar[Tuple["QueryTracker", ...]] = ContextVar("active_query_trackers", default=())
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a block of code or a view issues more SQL statements than its budget allows."""
+
+
+class QueryTracker:
+    """
+    Collects the SQL statements executed while it is active.
+
+    Attributes:
+        count (int): The number of statements executed.
+        total_time_ms (float): The combined execution time of those statements in milliseconds.
+        statements (Counter): How many times each distinct statement was executed. Statements are
+            compared with their bound parameters stripped, so a lazy load repeated for every row
+            of a result shows up as a single statement with a high count.
+    """
+    def __init__(self) -> None:
+        self.count: int = 0
+        self.total_time_ms: float = 0.0
+        self.statements: Counter = Counter()
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_time_ms += elapsed_ms
+        self.statements[statement] += 1
+
+    def n_plus_one_suspects(self, threshold: int) -> List[Tuple[str, int]]:
+        """
+        Returns the statements executed at least `threshold` times, most repeated first.
+
+        Args:
+            threshold (int): The minimum number of repetitions for a statement to be reported.
+
+        Returns:
+            List[Tuple[str, int]]: (statement, count) pairs.
+        """
+        if threshold <= 0:
+            return []
+        return [(statement, count) for statement, count in self.statements.most_common() if count >= threshold]
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryTracker]:
+    """
+    Context manager that yields a `QueryTracker` recording every statement executed inside the block.
+
+    Trackers nest: statements are recorded by every tracker that is active.
+    """
+    tracker = QueryTracker()
+    token = _active_trackers.set(_active_trackers.get() + (tracker,))
+    try:
+        yield tracker
+    finally:
+        _active_trackers.reset(token)
+
+
+@contextmanager
+def assert_max_queries(budget: int) -> Iterator[QueryTracker]:
+    """
+    Context manager for tests that fails when the block executes more than `budget` statements.
+
+    Example:
+        with assert_max_queries(6):
+            client.get("/api/v1/posts", headers=headers)
+
+    Args:
+        budget (int): The maximum number of statements allowed.
+
+    Raises:
+        QueryBudgetExceeded: If the budget is exceeded. The message lists the most repeated statements.
+    """
+    with track_queries() as tracker:
+        yield tracker
+    if tracker.count > budget:
+        raise QueryBudgetExceeded(_budget_message(f"Expected at most {budget} queries", tracker))
+
+
+def query_budget(budget: int) -> Callable:
+    """
+    Decorator declaring the maximum number of SQL statements a view may execute.
+
+    When the budget is exceeded a warning is logged; if `QUERY_BUDGET_STRICT` is set
+    (it defaults to on when `TESTING` is) `QueryBudgetExceeded` is raised instead so the test fails.
+
+    Args:
+        budget (int): The maximum number of statements the view may execute, including serialization.
+
+    Returns:
+        function: The decorator.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            with track_queries() as tracker:
+                response = f(*args, **kwargs)
+            if tracker.count > budget:
+                message = _budget_message(f"{request.method} {request.path} exceeded its budget of {budget} queries", tracker)
+                strict = current_app.config.get("QUERY_BUDGET_STRICT")
+                if strict is None:
+                    strict = current_app.config.get("TESTING", False)
+                if strict:
+                    raise QueryBudgetExceeded(message)
+                current_app.logger.warning(message)
+            return response
+        decorated_function.query_budget = budget
+        return decorated_function
+    return decorator
+
+
+def _budget_message(prefix: str, tracker: QueryTracker) -> str:
+    lines = [f"{prefix}, executed {tracker.count}."]
+    for statement, count in tracker.statements.most_common(5):
+        lines.append(f"  {count}x {statement}")
+    return "\n".join(lines)
+
+
+# ----------------- ENGINE EVENTS ----------------- #
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _active_trackers.get():
+        context._query_tracking_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    trackers = _active_trackers.get()
+    if not trackers:
+        return
+    started = getattr(context, "_query_tracking_start", None)
+    elapsed_ms = (time.perf_counter() - started) * 1000 if started is not None else 0.0
+    for tracker in trackers:
+        tracker.record(statement, elapsed_ms)
+
+
+def _register_engine_events(engine) -> None:
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# ----------------- REQUEST HOOKS ----------------- #
+def _start_request_tracking() -> None:
+    tracker = QueryTracker()
+    g.query_tracker = tracker
+    g.query_tracker_token = _active_trackers.set(_active_trackers.get() + (tracker,))
+
+
+def _finish_request_tracking(response: Response) -> Response:
+    tracker: Optional[QueryTracker] = g.get("query_tracker")
+    if tracker is None:
+        return response
+
+    response.headers["X-DB-Query-Count"] = str(tracker.count)
+    response.headers["X-DB-Time-Ms"] = f"{tracker.total_time_ms:.2f}"
+
+    suspects = tracker.n_plus_one_suspects(current_app.config["N_PLUS_ONE_THRESHOLD"])
+    if suspects:
+        response.headers["X-DB-N-Plus-One-Suspects"] = str(len(suspects))
+        for statement, count in suspects:
+            current_app.logger.warning(
+                "Possible N+1 on %s %s: statement executed %d times: %s",
+                request.method, request.path, count, statement
+            )
+    return response
+
+
+def _stop_request_tracking(exception: Optional[BaseException] = None) -> None:
+    token = g.pop("query_tracker_token", None)
+    if token is not None:
+        try:
+            _active_trackers.reset(token)
+        except ValueError:
+            # The token was created in a different context; nothing left to unwind here
+            pass
+
+
+def init_query_tracking(app: Flask) -> None:
+    """
+    Installs SQL statement tracking for the application.
+
+    Engine listeners are always installed so `assert_max_queries` and `query_budget`
+    work in every environment. Per-request counting, the `X-DB-Query-Count` and
+    `X-DB-Time-Ms` response headers and the N+1 warnings are only enabled when
+    `QUERY_TRACKING_ENABLED` is set.
+
+    Args:
+        app (Flask): The application.
+    """
+    app.config.setdefault("QUERY_TRACKING_ENABLED", False)
+    app.config.setdefault("N_PLUS_ONE_THRESHOLD", 5)
+
+    with app.app_context():
+        for engine in db.engines.values():
+            _register_engine_events(engine)
+
+    if app.config["QUERY_TRACKING_ENABLED"]:
+        app.before_request(_start_request_tracking)
+        app.after_request(_finish_request_tracking)
+        app.teardown_request(_stop_request_tracking)
+
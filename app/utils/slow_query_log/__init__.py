@@ -0,0 +1,178 @@
+import os
+import sys
+import json
+import time
+import logging
+import threading
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+from typing import Any, Dict, List, Optional
+from sqlalchemy import event
+from flask import Flask, has_request_context, request
+from app import db
+
+logger = logging.getLogger("app.slow_query")
+
+# Statements EXPLAIN can describe without side effects
+_EXPLAINABLE_PREFIXES = ("SELECT", "WITH", "UPDATE", "DELETE")
+_MAX_PARAMETER_LENGTH = 200
+
+
+class SlowQueryLog:
+    """
+    Logs every statement slower than a threshold as one JSON object per line.
+
+    Each entry contains the SQL, its bound parameters, the duration, the service
+    function that issued it, the request it belongs to and, for statements that
+    support it, the database's EXPLAIN output.
+
+    Attributes:
+        threshold_ms (float): Statements taking at least this long are logged.
+        explain (bool): Whether to capture EXPLAIN output.
+        explain_interval (float): Minimum seconds between two EXPLAINs of the same statement,
+            so a slow query on a hot path does not double its own cost on every execution.
+    """
+    def __init__(self, threshold_ms: float, explain: bool = True, explain_interval: float = 60.0) -> None:
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self.explain_interval = explain_interval
+        self._last_explained: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        context._slow_query_start = time.perf_counter()
+
+    def after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_slow_query_start", None)
+        if started is None:
+            return
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if elapsed_ms < self.threshold_ms:
+            return
+
+        entry: Dict[str, Any] = {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "duration_ms": round(elapsed_ms, 3),
+            "statement": statement,
+            "parameters": _format_parameters(parameters, executemany),
+            "executemany": executemany,
+            "origin": _find_origin(),
+            "dialect": conn.dialect.name,
+        }
+        if has_request_context():
+            entry["request"] = {"method": request.method, "path": request.path, "endpoint": request.endpoint}
+        if self.explain and not executemany and self._should_explain(statement):
+            entry["explain"] = _explain(conn, statement, parameters)
+
+        logger.warning(json.dumps(entry, default=str))
+
+    def _should_explain(self, statement: str) -> bool:
+        if not statement.lstrip().upper().startswith(_EXPLAINABLE_PREFIXES):
+            return False
+        now = time.monotonic()
+        with self._lock:
+            last = self._last_explained.get(statement)
+            if last is not None and now - last < self.explain_interval:
+                return False
+            self._last_explained[statement] = now
+        return True
+
+
+def _format_parameters(parameters: Any, executemany: bool) -> Any:
+    if executemany:
+        # Only the first parameter set; the rest add volume but rarely insight
+        return {"first": _format_parameters(parameters[0], False) if parameters else None, "count": len(parameters)}
+    if isinstance(parameters, dict):
+        return {key: _truncate(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_truncate(value) for value in parameters]
+    return _truncate(parameters)
+
+
+def _truncate(value: Any) -> Any:
+    if isinstance(value, (bytes, bytearray)):
+        return f"<{len(value)} bytes>"
+    if isinstance(value, str) and len(value) > _MAX_PARAMETER_LENGTH:
+        return value[:_MAX_PARAMETER_LENGTH] + "..."
+    return value
+
+
+def _find_origin() -> Optional[str]:
+    """
+    Returns the innermost `app.services` function on the stack, falling back to
+    the innermost function anywhere else in `app`, e.g. `app.services.posts.get_posts.get_posts`.
+    """
+    fallback = None
+    frame = sys._getframe(2)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith("app.services."):
+            return f"{module}.{frame.f_code.co_name}"
+        if fallback is None and module.startswith("app.") and not module.startswith("app.utils.slow_query_log"):
+            fallback = f"{module}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return fallback
+
+
+def _explain(conn, statement: str, parameters: Any) -> List[Any]:
+    """
+    Runs EXPLAIN for `statement` on a raw cursor of the same DBAPI connection.
+
+    A raw cursor bypasses SQLAlchemy's events, so the EXPLAIN itself is never
+    timed or logged, and it needs no second pooled connection.
+    """
+    prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+    try:
+        cursor = conn.connection.dbapi_connection.cursor()
+        try:
+            cursor.execute(prefix + statement, parameters)
+            columns = [column[0] for column in cursor.description or []]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+    except Exception as e:
+        return [{"error": str(e)}]
+
+
+def init_slow_query_log(app: Flask) -> None:
+    """
+    Installs the slow-query log on every engine of the application.
+
+    Controlled by:
+        SLOW_QUERY_LOG_ENABLED: Turns the log on or off.
+        SLOW_QUERY_THRESHOLD_MS: Statements at least this slow are logged.
+        SLOW_QUERY_LOG_FILE: The log file; rotated at SLOW_QUERY_LOG_MAX_BYTES keeping
+            SLOW_QUERY_LOG_BACKUP_COUNT old files.
+        SLOW_QUERY_EXPLAIN: Whether to capture EXPLAIN output.
+
+    Args:
+        app (Flask): The application.
+    """
+    app.config.setdefault("SLOW_QUERY_LOG_ENABLED", False)
+    if not app.config["SLOW_QUERY_LOG_ENABLED"]:
+        return
+    app.config.setdefault("SLOW_QUERY_THRESHOLD_MS", 200.0)
+    app.config.setdefault("SLOW_QUERY_LOG_FILE", os.path.join("logs", "slow_queries.log"))
+    app.config.setdefault("SLOW_QUERY_LOG_MAX_BYTES", 10 * 1024 * 1024)
+    app.config.setdefault("SLOW_QUERY_LOG_BACKUP_COUNT", 5)
+    app.config.setdefault("SLOW_QUERY_EXPLAIN", True)
+
+    path = os.path.abspath(app.config["SLOW_QUERY_LOG_FILE"])
+    if not any(getattr(handler, "baseFilename", None) == path for handler in logger.handlers):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        handler = RotatingFileHandler(
+            path,
+            maxBytes=app.config["SLOW_QUERY_LOG_MAX_BYTES"],
+            backupCount=app.config["SLOW_QUERY_LOG_BACKUP_COUNT"],
+            delay=True,
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+    logger.setLevel(logging.WARNING)
+    logger.propagate = False
+
+    slow_query_log = SlowQueryLog(float(app.config["SLOW_QUERY_THRESHOLD_MS"]), bool(app.config["SLOW_QUERY_EXPLAIN"]))
+    with app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, "before_cursor_execute", slow_query_log.before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", slow_query_log.after_cursor_execute)
@@ -0,0 +1,15 @@
+"""
+Endpoint benchmark suite for the Avabuzz API.
+
+The suite seeds a synthetic but realistic dataset (power-law follower counts,
+posts with media, hashtags, reactions and comment trees), drives every route
+in `app/api/v1` through the Flask test client and writes per-endpoint latency,
+throughput and SQL statement counts to a JSON file so that two runs can be
+compared.
+
+Usage:
+    python -m benchmarks run --output before.json
+    python -m benchmarks run --output after.json
+    python -m benchmarks compare before.json after.json
+    python -m benchmarks counters --writers 8 --increments 200
+"""
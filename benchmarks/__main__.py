@@ -0,0 +1,77 @@
+import argparse
+import json
+import sys
+from benchmarks.dataset import DatasetSizes
+from benchmarks.runner import DEFAULT_DATABASE_URI, run_benchmarks, write_results, compare_results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Avabuzz API endpoint benchmarks.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Seed a fresh database and benchmark every endpoint.")
+    run.add_argument("--output", "-o", default="benchmark_results.json", help="Where to write the JSON results.")
+    run.add_argument("--database-uri", default=DEFAULT_DATABASE_URI, help="Database to benchmark against. It is DROPPED and recreated.")
+    run.add_argument("--seed", type=int, default=42)
+    run.add_argument("--iterations", type=int, default=50, help="Measured requests per endpoint.")
+    run.add_argument("--warmup", type=int, default=5, help="Unmeasured requests per endpoint.")
+    run.add_argument("--users", type=int, default=DatasetSizes.users)
+    run.add_argument("--posts", type=int, default=DatasetSizes.posts)
+    run.add_argument("--hashtags", type=int, default=DatasetSizes.hashtags)
+    run.add_argument("--only", action="append", help="Glob over scenario names, e.g. 'posts.*'. Repeatable.")
+
+    json_bench = commands.add_parser("json", help="Microbenchmark JSON encoding of a large post list.")
+    json_bench.add_argument("--posts", type=int, default=1000)
+    json_bench.add_argument("--repeat", type=int, default=30)
+
+    counters = commands.add_parser("counters", help="Stress denormalized counters with concurrent writers and check for lost increments.")
+    counters.add_argument("--database-uri", default=DEFAULT_DATABASE_URI, help="Database to use. It is DROPPED and recreated.")
+    counters.add_argument("--writers", type=int, default=8, help="Concurrent writer threads.")
+    counters.add_argument("--increments", type=int, default=200, help="Increments per writer and counter.")
+    counters.add_argument("--naive", action="store_true", help="Use read-modify-write instead of atomic increments.")
+    counters.add_argument("--sharded", action="store_true", help="Increment follower and reaction counts through counter shards.")
+
+    compare = commands.add_parser("compare", help="Compare two result files.")
+    compare.add_argument("before")
+    compare.add_argument("after")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        sizes = DatasetSizes(users=args.users, posts=args.posts, hashtags=args.hashtags)
+        results = run_benchmarks(
+            database_uri=args.database_uri,
+            seed=args.seed,
+            sizes=sizes,
+            iterations=args.iterations,
+            warmup=args.warmup,
+            only=args.only,
+        )
+        write_results(results, args.output)
+        print(f"Wrote {len(results['endpoints'])} endpoint results to {args.output}")
+        return 0
+
+    if args.command == "json":
+        from benchmarks.json_encoding import run_json_benchmark
+        results = run_json_benchmark(posts=args.posts, repeat=args.repeat)
+        baseline = results["flask_default"]["median_ms"]
+        for name, result in results.items():
+            print(f"{name:<14} median {result['median_ms']:>9.3f} ms  p95 {result['p95_ms']:>9.3f} ms  "
+                  f"{result['bytes']:>9} bytes  {baseline / result['median_ms']:.2f}x")
+        return 0
+
+    if args.command == "counters":
+        from benchmarks.counter_stress import run_counter_stress
+        results = run_counter_stress(database_uri=args.database_uri, writers=args.writers, increments=args.increments, naive=args.naive, sharded=args.sharded)
+        for name, result in results.items():
+            print(f"{name:<50} expected {result['expected']:>7}  final {result['final']:>7}  "
+                  f"lost {result['lost']:>6}  retries {result['failed_attempts']:>6}")
+        return 1 if any(result["lost"] for result in results.values()) else 0
+
+    with open(args.before, encoding="utf-8") as before, open(args.after, encoding="utf-8") as after:
+        print(compare_results(json.load(before), json.load(after)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
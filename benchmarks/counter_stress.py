@@ -0,0 +1,144 @@
+import threading
+import time
+from typing import Any, Callable, Dict, List, Tuple
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+from app import create_app, db
+from app.utils.counters import counter_key, get_sharded_counters, increment_counter, increment_sharded
+from benchmarks.dataset import DatasetSizes, seed_dataset
+from benchmarks.runner import DEFAULT_DATABASE_URI, make_config
+
+# Attempts per increment before a writer gives up on a busy database (SQLite allows one writer at a time)
+MAX_ATTEMPTS = 50
+
+
+def _counter_targets() -> List[Tuple[str, Any, Tuple[Any, ...], str]]:
+    from app.models import UserStats, HashTags, PostReactionCounts, PostCommentLikeCounts
+
+    targets = []
+    for column, model in (
+        (UserStats.follower_count, UserStats),
+        (HashTags.post_count, HashTags),
+        (PostReactionCounts.reaction_count, PostReactionCounts),
+        (PostCommentLikeCounts.post_comment_like_count, PostCommentLikeCounts),
+    ):
+        primary_key = list(model.__table__.primary_key.columns)
+        row = db.session.execute(select(*primary_key)).first()
+        if row is None:
+            continue
+        criteria = tuple(key_column == value for key_column, value in zip(primary_key, row))
+        targets.append((f"{model.__tablename__}.{column.key}", column, criteria, counter_key(*row)))
+    return targets
+
+
+def _read(column: Any, criteria: Tuple[Any, ...]) -> int:
+    return db.session.execute(select(column).where(*criteria)).scalar_one()
+
+
+def _read_modify_write(column: Any, criteria: Tuple[Any, ...], amount: int) -> None:
+    # The pattern the services used before: read the value into Python and write it back
+    instance = db.session.query(column.class_).filter(*criteria).one()
+    setattr(instance, column.key, getattr(instance, column.key) + amount)
+
+
+def run_counter_stress(
+    database_uri: str = DEFAULT_DATABASE_URI,
+    writers: int = 8,
+    increments: int = 200,
+    naive: bool = False,
+    sharded: bool = False,
+) -> Dict[str, Dict[str, int]]:
+    """
+    Hammers one row of every denormalized counter with concurrent writers and checks that no increment is lost.
+
+    Each writer thread runs its own application context, and therefore its own session
+    and connection, and commits every increment separately. For every counter the final
+    value must equal the initial value plus the number of committed increments.
+
+    Args:
+        database_uri (str): The database to use. All tables are dropped first.
+        writers (int): Concurrent writer threads.
+        increments (int): Increments per writer and counter.
+        naive (bool): Use read-modify-write instead of `increment_counter`, to show the lost updates it causes.
+        sharded (bool): Enable counter sharding with every key hot, so shardable counters are
+            incremented through counter shards while the compactor folds them concurrently.
+            Shards are folded before the final values are read.
+
+    Returns:
+        Dict[str, Dict[str, int]]: Per counter the initial, expected and final value, committed
+        increments, failed attempts and lost increments (expected minus final).
+    """
+    config = make_config(database_uri)
+    config.SQLALCHEMY_ENGINE_OPTIONS = {"connect_args": {"timeout": 30}} if database_uri.startswith("sqlite") else {}
+    if sharded:
+        config.COUNTER_SHARDING_ENABLED = True
+        config.COUNTER_HOT_THRESHOLD = 0
+        config.COUNTER_COMPACT_INTERVAL = 0.05
+    app = create_app(config)
+
+    with app.app_context():
+        import app.models as _models  # noqa: F401  (register every table on the metadata)
+        db.drop_all()
+        db.create_all()
+        seed_dataset(1, DatasetSizes(users=20, posts=20, hashtags=5))
+        targets = _counter_targets()
+        initial = {name: _read(column, criteria) for name, column, criteria, _ in targets}
+        db.session.remove()
+
+    committed = {name: 0 for name, _, _, _ in targets}
+    failures = {name: 0 for name, _, _, _ in targets}
+    lock = threading.Lock()
+    start = threading.Barrier(writers)
+
+    def write(name: str, apply: Callable[[], None]) -> None:
+        for _ in range(MAX_ATTEMPTS):
+            try:
+                apply()
+                db.session.commit()
+            except OperationalError:
+                db.session.rollback()
+                with lock:
+                    failures[name] += 1
+                time.sleep(0.001)
+                continue
+            with lock:
+                committed[name] += 1
+            return
+
+    def writer() -> None:
+        with app.app_context():
+            start.wait()
+            for _ in range(increments):
+                for name, column, criteria, key in targets:
+                    if naive:
+                        write(name, lambda: _read_modify_write(column, criteria, 1))
+                    else:
+                        write(name, lambda: increment_sharded(column, key) or increment_counter(column, *criteria))
+            db.session.remove()
+
+    threads = [threading.Thread(target=writer, name=f"counter-writer-{index}") for index in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    results = {}
+    with app.app_context():
+        counters = get_sharded_counters()
+        if counters is not None:
+            counters.close()
+            while counters.compact():
+                pass
+        for name, column, criteria, _ in targets:
+            final = _read(column, criteria)
+            expected = initial[name] + committed[name]
+            results[name] = {
+                "initial": initial[name],
+                "expected": expected,
+                "final": final,
+                "committed": committed[name],
+                "failed_attempts": failures[name],
+                "lost": expected - final,
+            }
+        db.session.remove()
+    return results
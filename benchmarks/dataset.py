@@ -0,0 +1,359 @@
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Set, Tuple
+from sqlalchemy import insert
+from werkzeug.security import generate_password_hash
+from app import db
+from app.types.enum import (
+    PostType,
+    UserType,
+    CommentStatus,
+    ProfileType,
+    OwnershipType,
+    ProfileAccessoryType
+)
+from app.models import (
+    Users,
+    UserStats,
+    UserPublicId,
+    UserFollowers,
+    BlockedUsers,
+    OwnedAccessories,
+    UserProfileAccessories,
+    ProfileAccessories,
+    Posts,
+    PostMedia,
+    PostCategories,
+    PostReactionTypes,
+    PostReactions,
+    PostReactionCounts,
+    PostComments,
+    PostCommentLikeCounts,
+    HashTags,
+    PostHashTags
+)
+
+# Password shared by every seeded user so the login scenario can authenticate.
+BENCHMARK_PASSWORD: str = "benchmark-password"
+
+# Every seeded row is timestamped relative to this instant so runs are reproducible.
+BASE_TIME: datetime = datetime(2024, 1, 1)
+
+REACTION_TYPES: List[str] = ["like", "love", "laugh", "wow", "sad", "angry"]
+REACTION_WEIGHTS: List[int] = [60, 20, 10, 5, 3, 2]
+CATEGORY_NAMES: List[str] = ["General", "Gaming", "Music", "Sports", "Art", "Tech"]
+
+
+@dataclass
+class DatasetSizes:
+    """Controls how large the seeded dataset is.
+
+    Attributes:
+        users (int): Number of users to create.
+        posts (int): Number of posts to create.
+        hashtags (int): Size of the hashtag vocabulary.
+        follower_alpha (float): Pareto shape for follower counts; lower values give heavier tails.
+        max_media_per_post (int): Upper bound for media attachments per post.
+        max_hashtags_per_post (int): Upper bound for hashtags per post.
+        block_ratio (float): Fraction of users that block one other user.
+    """
+    users: int = 200
+    posts: int = 1000
+    hashtags: int = 100
+    follower_alpha: float = 1.2
+    max_media_per_post: int = 4
+    max_hashtags_per_post: int = 5
+    block_ratio: float = 0.05
+
+
+@dataclass
+class Dataset:
+    """Identifiers of the seeded rows that scenarios need to build requests."""
+    user_ids: List[str] = field(default_factory=list)
+    public_ids: Dict[str, str] = field(default_factory=dict)
+    emails: Dict[str, str] = field(default_factory=dict)
+    admin_id: str = ""
+    post_ids: List[str] = field(default_factory=list)
+    post_authors: Dict[str, str] = field(default_factory=dict)
+    comment_ids: Dict[str, List[str]] = field(default_factory=dict)
+    hashtag_names: List[str] = field(default_factory=list)
+    category_ids: List[str] = field(default_factory=list)
+    accessory_ids: List[str] = field(default_factory=list)
+    follows: Set[Tuple[str, str]] = field(default_factory=set)
+    blocks: Set[Tuple[str, str]] = field(default_factory=set)
+    counts: Dict[str, int] = field(default_factory=dict)
+
+
+def _public_id(index: int) -> str:
+    """Builds a deterministic public identifier in the `XXX-XXX` format."""
+    alphabet = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    chars = []
+    for _ in range(6):
+        index, remainder = divmod(index, len(alphabet))
+        chars.append(alphabet[remainder])
+    code = "".join(reversed(chars))
+    return f"{code[:3]}-{code[3:]}"
+
+
+def _uuid(rng: random.Random) -> str:
+    """Generates a UUID4-formatted string from the seeded random generator."""
+    value = "%032x" % rng.getrandbits(128)
+    return f"{value[:8]}-{value[8:12]}-4{value[13:16]}-a{value[17:20]}-{value[20:32]}"
+
+
+def _pareto(rng: random.Random, alpha: float, cap: int) -> int:
+    """Draws a heavy-tailed integer in `[0, cap]`."""
+    return min(int(rng.paretovariate(alpha)) - 1, cap)
+
+
+def _bulk_insert(model, rows: List[dict]) -> None:
+    """Inserts rows through Core in one executemany, bypassing the ORM unit of work."""
+    if rows:
+        db.session.execute(insert(model.__table__), rows)
+
+
+def seed_dataset(seed: int = 42, sizes: DatasetSizes = DatasetSizes()) -> Dataset:
+    """Seeds the current database with a synthetic, reproducible dataset.
+
+    The caller must be inside an application context with an empty schema.
+    Follower counts follow a power law, so a handful of "celebrity" accounts
+    receive most follows, which is what exposes per-row costs on follower
+    listings and counter updates.
+
+    Args:
+        seed (int): Seed for the random generator; identical seeds produce identical data.
+        sizes (DatasetSizes): Controls the size of the dataset.
+
+    Returns:
+        Dataset: The identifiers of the seeded rows.
+    """
+    rng = random.Random(seed)
+    data = Dataset()
+    password_hash = generate_password_hash(BENCHMARK_PASSWORD)
+
+    # REACTION TYPES AND CATEGORIES
+    _bulk_insert(PostReactionTypes, [{"post_reaction_type": reaction} for reaction in REACTION_TYPES])
+    category_rows = [
+        {"post_category_id": _uuid(rng), "post_category_name": name, "post_category_description": f"{name} posts"}
+        for name in CATEGORY_NAMES
+    ]
+    _bulk_insert(PostCategories, category_rows)
+    data.category_ids = [row["post_category_id"] for row in category_rows]
+
+    # PROFILE ACCESSORIES
+    accessory_rows = []
+    for accessory_type in (ProfileAccessoryType.USER_BANNER, ProfileAccessoryType.PROFILE_PICTURE_BORDER, ProfileAccessoryType.BADGE):
+        for index in range(5):
+            accessory_rows.append({
+                "accessory_id": _uuid(rng),
+                "accessory_name": f"{accessory_type.name.title()} {index}",
+                "accessory_description": "Seeded accessory",
+                "bits": rng.randint(0, 500),
+                "media_url": f"https://cdn.example.com/accessories/{accessory_type.name.lower()}/{index}.png",
+                "profile_accessory_type": accessory_type,
+                "profile_type": ProfileType.USER_PROFILE,
+                "ownership_type": OwnershipType.USER,
+                "available": True,
+                "owner_count": 0,
+                "created_at": BASE_TIME,
+            })
+    _bulk_insert(ProfileAccessories, accessory_rows)
+    data.accessory_ids = [row["accessory_id"] for row in accessory_rows]
+    accessories_by_type = {
+        accessory_type: [row["accessory_id"] for row in accessory_rows if row["profile_accessory_type"] == accessory_type]
+        for accessory_type in (ProfileAccessoryType.USER_BANNER, ProfileAccessoryType.PROFILE_PICTURE_BORDER, ProfileAccessoryType.BADGE)
+    }
+
+    # USERS
+    user_rows, public_id_rows = [], []
+    for index in range(sizes.users):
+        user_id = _uuid(rng)
+        public_id = _public_id(index)
+        email = f"bench{index}@example.com"
+        user_rows.append({
+            "private_user_id": user_id,
+            "public_user_id": public_id,
+            "username": f"bench_{index:05d}",
+            "email": email,
+            "password_hash": password_hash,
+            "profile_picture_url": "https://placehold.co/400",
+            "biography": "Seeded benchmark user",
+            "user_type": UserType.ADMIN if index == 0 else UserType.USER,
+            "created_at": BASE_TIME + timedelta(minutes=index),
+        })
+        public_id_rows.append({"public_id": public_id})
+        data.user_ids.append(user_id)
+        data.public_ids[user_id] = public_id
+        data.emails[user_id] = email
+    data.admin_id = data.user_ids[0]
+    _bulk_insert(Users, user_rows)
+    _bulk_insert(UserPublicId, public_id_rows)
+
+    # OWNED AND ACTIVE ACCESSORIES (roughly half the users wear something)
+    owned_rows, active_rows = [], []
+    for user_id in data.user_ids:
+        active = {"user_id": user_id, "active_banner_id": None, "active_profile_picture_border_id": None, "active_badge_id": None}
+        if rng.random() < 0.5:
+            for accessory_type, column in (
+                (ProfileAccessoryType.USER_BANNER, "active_banner_id"),
+                (ProfileAccessoryType.PROFILE_PICTURE_BORDER, "active_profile_picture_border_id"),
+                (ProfileAccessoryType.BADGE, "active_badge_id"),
+            ):
+                owned_id = _uuid(rng)
+                owned_rows.append({
+                    "owned_accessory_id": owned_id,
+                    "user_id": user_id,
+                    "accessory_id": rng.choice(accessories_by_type[accessory_type]),
+                    "created_at": BASE_TIME,
+                })
+                active[column] = owned_id
+        active_rows.append(active)
+    _bulk_insert(OwnedAccessories, owned_rows)
+    _bulk_insert(UserProfileAccessories, active_rows)
+
+    # FOLLOWERS (power-law in-degree)
+    follower_counts = {user_id: 0 for user_id in data.user_ids}
+    following_counts = {user_id: 0 for user_id in data.user_ids}
+    follow_rows = []
+    for followee in data.user_ids:
+        wanted = _pareto(rng, sizes.follower_alpha, sizes.users - 1)
+        candidates = rng.sample(data.user_ids, min(wanted + 1, sizes.users))
+        for follower in candidates:
+            if follower == followee or (follower, followee) in data.follows:
+                continue
+            data.follows.add((follower, followee))
+            follower_counts[followee] += 1
+            following_counts[follower] += 1
+            follow_rows.append({
+                "follow_id": _uuid(rng),
+                "follower_user_id": follower,
+                "followee_user_id": followee,
+                "followed_at": BASE_TIME + timedelta(seconds=len(follow_rows)),
+            })
+    _bulk_insert(UserFollowers, follow_rows)
+
+    # BLOCKS
+    block_rows = []
+    for blocker in rng.sample(data.user_ids, int(sizes.users * sizes.block_ratio)):
+        blocked = rng.choice(data.user_ids)
+        if blocked == blocker or (blocker, blocked) in data.blocks:
+            continue
+        data.blocks.add((blocker, blocked))
+        block_rows.append({
+            "blocked_users_id": _uuid(rng),
+            "blocker_id": blocker,
+            "blocked_id": blocked,
+            "blocked_at": BASE_TIME,
+        })
+    _bulk_insert(BlockedUsers, block_rows)
+
+    # HASHTAGS (Zipf-like popularity)
+    hashtag_rows = [
+        {"hashtag_id": _uuid(rng), "hashtag_name": f"tag{index}", "views": 0, "post_count": 0}
+        for index in range(sizes.hashtags)
+    ]
+    hashtag_weights = [1.0 / (rank + 1) for rank in range(sizes.hashtags)]
+    data.hashtag_names = [row["hashtag_name"] for row in hashtag_rows]
+
+    # POSTS, MEDIA, HASHTAG LINKS, REACTIONS AND COMMENTS
+    post_counts = {user_id: 0 for user_id in data.user_ids}
+    author_weights = [1 + follower_counts[user_id] for user_id in data.user_ids]
+    post_rows, media_rows, post_hashtag_rows = [], [], []
+    reaction_rows, reaction_count_rows = [], []
+    comment_rows, comment_like_count_rows = [], []
+    for index in range(sizes.posts):
+        post_id = _uuid(rng)
+        author = rng.choices(data.user_ids, weights=author_weights)[0]
+        created_at = BASE_TIME + timedelta(days=90) - timedelta(seconds=rng.randint(0, 90 * 24 * 3600))
+        media_count = rng.randint(0, sizes.max_media_per_post)
+        post_rows.append({
+            "post_id": post_id,
+            "post_caption": f"Benchmark post {index}",
+            "post_type": PostType.IMAGE if media_count else PostType.POST,
+            "post_category_id": rng.choice(data.category_ids),
+            "user_id": author,
+            "view_count": _pareto(rng, 1.1, 100000),
+            "created_at": created_at,
+        })
+        data.post_ids.append(post_id)
+        data.post_authors[post_id] = author
+        post_counts[author] += 1
+
+        for order in range(media_count):
+            media_rows.append({
+                "post_media_id": _uuid(rng),
+                "post_id": post_id,
+                "media_url": f"https://cdn.example.com/media/{post_id}/{order}.jpg",
+                "media_size_bytes": rng.randint(10_000, 5_000_000),
+                "media_order": order + 1,
+                "created_at": created_at,
+            })
+
+        tag_indexes = set(rng.choices(range(sizes.hashtags), weights=hashtag_weights, k=rng.randint(0, sizes.max_hashtags_per_post)))
+        for tag_index in tag_indexes:
+            post_hashtag_rows.append({"post_id": post_id, "hashtag_id": hashtag_rows[tag_index]["hashtag_id"]})
+            hashtag_rows[tag_index]["post_count"] += 1
+
+        reaction_totals = {reaction: 0 for reaction in REACTION_TYPES}
+        reactors = rng.sample(data.user_ids, min(_pareto(rng, 1.3, sizes.users - 1), sizes.users))
+        for reactor in reactors:
+            reaction = rng.choices(REACTION_TYPES, weights=REACTION_WEIGHTS)[0]
+            reaction_totals[reaction] += 1
+            reaction_rows.append({"post_id": post_id, "user_id": reactor, "post_reaction_type": reaction})
+        # Reaction counts are sparse: types nobody used have no row
+        for reaction, total in reaction_totals.items():
+            if total:
+                reaction_count_rows.append({"post_id": post_id, "post_reaction_type": reaction, "reaction_count": total})
+        post_rows[-1]["reaction_summary"] = {reaction: total for reaction, total in reaction_totals.items() if total}
+
+        post_comment_ids: List[str] = []
+        for _ in range(_pareto(rng, 1.5, 50)):
+            comment_id = _uuid(rng)
+            parent = rng.choice(post_comment_ids) if post_comment_ids and rng.random() < 0.4 else None
+            comment_rows.append({
+                "post_comment_id": comment_id,
+                "post_id": post_id,
+                "user_id": rng.choice(data.user_ids),
+                "post_comment_text": "Seeded comment",
+                "post_comment_status": CommentStatus.NORMAL,
+                "parent_post_comment_id": parent,
+                "created_at": created_at,
+            })
+            comment_like_count_rows.append({"post_comment_id": comment_id, "post_comment_like_count": 0})
+            post_comment_ids.append(comment_id)
+        data.comment_ids[post_id] = post_comment_ids
+
+    _bulk_insert(HashTags, hashtag_rows)
+    _bulk_insert(Posts, post_rows)
+    _bulk_insert(PostMedia, media_rows)
+    _bulk_insert(PostHashTags, post_hashtag_rows)
+    _bulk_insert(PostReactions, reaction_rows)
+    _bulk_insert(PostReactionCounts, reaction_count_rows)
+    _bulk_insert(PostComments, comment_rows)
+    _bulk_insert(PostCommentLikeCounts, comment_like_count_rows)
+
+    # USER STATS (kept consistent with the rows above)
+    _bulk_insert(UserStats, [
+        {
+            "user_id": user_id,
+            "follower_count": follower_counts[user_id],
+            "following_count": following_counts[user_id],
+            "post_count": post_counts[user_id],
+        }
+        for user_id in data.user_ids
+    ])
+    db.session.commit()
+
+    data.counts = {
+        "users": len(user_rows),
+        "follows": len(follow_rows),
+        "blocks": len(block_rows),
+        "hashtags": len(hashtag_rows),
+        "posts": len(post_rows),
+        "post_media": len(media_rows),
+        "post_hashtags": len(post_hashtag_rows),
+        "post_reactions": len(reaction_rows),
+        "post_comments": len(comment_rows),
+    }
+    return data
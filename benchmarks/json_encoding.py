@@ -0,0 +1,103 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+from typing import Any, Callable, Dict, List
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from app.types.enum import PostType
+from app.utils import json_provider
+from app.utils.json_provider import FastJSONProvider
+from benchmarks.dataset import BASE_TIME, REACTION_TYPES
+
+
+def build_post_payload(posts: int, seed: int = 42) -> Dict[str, Any]:
+    """
+    Builds a response body shaped like the paginated output of `GET /posts`.
+
+    Like the output of `Posts.to_dict`, values include datetimes and dates.
+
+    Args:
+        posts (int): Number of posts in the list.
+        seed (int): Random seed.
+
+    Returns:
+        Dict[str, Any]: `{"posts": [...], "_meta": {...}}`.
+    """
+    rng = random.Random(seed)
+    items: List[Dict[str, Any]] = []
+    for index in range(posts):
+        created_at = BASE_TIME + timedelta(minutes=rng.randint(0, 500_000), microseconds=rng.randint(0, 999_999))
+        items.append({
+            "id": f"post-{index:08d}",
+            "caption": f"Caption for post {index} with a few more words to look like real text #{index % 50}",
+            "type": rng.choice(list(PostType)).value,
+            "category": {"id": rng.randint(1, 10), "name": f"Category {rng.randint(1, 10)}"},
+            "view_count": rng.randint(0, 100_000),
+            "poster": {
+                "public_user_id": f"{rng.randint(0, 999):03d}-{rng.randint(0, 999):03d}",
+                "username": f"user_{rng.randint(0, 10_000)}",
+                "profile_picture": f"https://cdn.example.com/avatars/{index}.jpg",
+                "biography": "Lorem ipsum dolor sit amet, consectetur adipiscing elit.",
+                "created_at": created_at - timedelta(days=rng.randint(1, 900)),
+                "birth_date": (created_at - timedelta(days=rng.randint(6000, 20000))).date(),
+                "stats": {"follower_count": rng.randint(0, 50_000), "following_count": rng.randint(0, 2_000), "post_count": rng.randint(0, 500)},
+            },
+            "created_at": created_at,
+            "hashtags": [f"tag{rng.randint(0, 100)}" for _ in range(rng.randint(0, 5))],
+            "media": [
+                {"url": f"https://cdn.example.com/media/{index}/{order}.jpg", "size": rng.randint(10_000, 5_000_000), "order": order, "created_at": created_at}
+                for order in range(rng.randint(1, 4))
+            ],
+            "reactions": [{"type": reaction, "count": rng.randint(0, 1_000)} for reaction in REACTION_TYPES],
+            "user_reacted": rng.random() < 0.2,
+        })
+    return {"posts": items, "_meta": {"total": posts * 10, "pages": 10, "current_page": 1, "next_page": 2, "prev_page": None}}
+
+
+def _time_call(fn: Callable[[], Any], repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def run_json_benchmark(posts: int = 1000, repeat: int = 30) -> Dict[str, Dict[str, float]]:
+    """
+    Times `jsonify` of a large post list with Flask's default provider and with `FastJSONProvider`.
+
+    The fast provider is measured twice: with orjson (when installed) and with its
+    standard library fallback.
+
+    Args:
+        posts (int): Number of posts in the payload.
+        repeat (int): Timed repetitions per provider.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Per provider the median and p95 in milliseconds, and the body size in bytes.
+    """
+    payload = build_post_payload(posts)
+    app = Flask(__name__)
+    providers = {"flask_default": DefaultJSONProvider(app), "fast_stdlib": FastJSONProvider(app)}
+    if json_provider.orjson is not None:
+        providers["fast_orjson"] = FastJSONProvider(app)
+
+    results = {}
+    for name, provider in providers.items():
+        orjson_module = json_provider.orjson
+        if name == "fast_stdlib":
+            json_provider.orjson = None
+        try:
+            with app.app_context():
+                body = provider.response(payload).get_data()
+                samples = _time_call(lambda: provider.response(payload), repeat)
+        finally:
+            json_provider.orjson = orjson_module
+        results[name] = {
+            "median_ms": round(statistics.median(samples), 3),
+            "p95_ms": round(sorted(samples)[int(0.95 * (len(samples) - 1))], 3),
+            "bytes": len(body),
+        }
+    return results
@@ -0,0 +1,226 @@
+import json
+import os
+import platform
+import random
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from fnmatch import fnmatch
+from typing import Any, Dict, List, Optional
+from sqlalchemy import event
+from config import Config
+from app import create_app, db
+from benchmarks.dataset import DatasetSizes, seed_dataset
+from benchmarks.scenarios import SCENARIOS, ScenarioContext
+
+DEFAULT_DATABASE_URI: str = f"sqlite:///{os.path.join(tempfile.gettempdir(), 'avabuzz_benchmark.db')}"
+
+
+def make_config(database_uri: str) -> type:
+    """Builds a configuration class for benchmark runs.
+
+    Echo is disabled (it would dominate the timings) and access tokens live
+    long enough to outlast a full run.
+
+    Args:
+        database_uri (str): The database to benchmark against. It is dropped and recreated.
+
+    Returns:
+        type: A `Config` subclass.
+    """
+    class BenchmarkConfig(Config):
+        SQLALCHEMY_DATABASE_URI = database_uri
+        SQLALCHEMY_ECHO = False
+        JWT_ACCESS_TOKEN_EXPIRES = 24 * 3600
+    return BenchmarkConfig
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Returns the `pct` percentile of `values` using linear interpolation."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(values: List[float]) -> Dict[str, Optional[float]]:
+    """Summarizes a list of samples into min/mean/p50/p95/p99/max."""
+    if not values:
+        return {"min": None, "mean": None, "p50": None, "p95": None, "p99": None, "max": None}
+    return {
+        "min": round(min(values), 3),
+        "mean": round(sum(values) / len(values), 3),
+        "p50": round(percentile(values, 50), 3),
+        "p95": round(percentile(values, 95), 3),
+        "p99": round(percentile(values, 99), 3),
+        "max": round(max(values), 3),
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(
+    database_uri: str = DEFAULT_DATABASE_URI,
+    seed: int = 42,
+    sizes: DatasetSizes = DatasetSizes(),
+    iterations: int = 50,
+    warmup: int = 5,
+    only: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """Seeds a fresh database and measures every scenario.
+
+    Each request runs outside any long-lived application context so that,
+    like in production, every request starts with an empty session.
+
+    Args:
+        database_uri (str): The database to use. All tables are dropped first.
+        seed (int): Seed for both the dataset and request generation.
+        sizes (DatasetSizes): Controls the size of the seeded dataset.
+        iterations (int): Measured requests per scenario.
+        warmup (int): Unmeasured requests per scenario, run first.
+        only (list, optional): Glob patterns; when given, only matching scenario names run.
+
+    Returns:
+        Dict[str, Any]: The results document (see `benchmarks/__init__.py`).
+    """
+    app = create_app(make_config(database_uri))
+    statements = {"count": 0}
+
+    with app.app_context():
+        import app.models as _models  # noqa: F401  (register every table on the metadata)
+        db.drop_all()
+        db.create_all()
+        seed_started = time.perf_counter()
+        dataset = seed_dataset(seed, sizes)
+        seed_seconds = time.perf_counter() - seed_started
+
+        def count_statement(conn, cursor, statement, parameters, context, executemany):
+            statements["count"] += 1
+        event.listen(db.engine, "before_cursor_execute", count_statement)
+        dialect = db.engine.dialect.name
+        db.session.remove()
+
+    client = app.test_client()
+    ctx = ScenarioContext(dataset, random.Random(seed))
+    results: Dict[str, Any] = {}
+
+    for scenario in SCENARIOS:
+        if only and not any(fnmatch(scenario.name, pattern) for pattern in only):
+            continue
+
+        latencies: List[float] = []
+        query_counts: List[int] = []
+        status_codes: Dict[str, int] = {}
+        skipped = 0
+
+        for iteration in range(warmup + iterations):
+            with app.app_context():
+                call = scenario.build(ctx)
+                db.session.remove()
+            if call is None:
+                skipped += iteration >= warmup
+                continue
+
+            headers = {"x-api-key": Config.API_KEY}
+            if call.token:
+                headers["Authorization"] = f"Bearer {call.token}"
+
+            statements["count"] = 0
+            started = time.perf_counter()
+            response = client.open(call.path, method=scenario.method, json=call.json, headers=headers)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+
+            if scenario.collect is not None:
+                with app.app_context():
+                    scenario.collect(ctx, call, response)
+                    db.session.remove()
+
+            if iteration < warmup:
+                continue
+            latencies.append(elapsed_ms)
+            query_counts.append(statements["count"])
+            status_codes[str(response.status_code)] = status_codes.get(str(response.status_code), 0) + 1
+
+        total_seconds = sum(latencies) / 1000
+        results[scenario.name] = {
+            "method": scenario.method,
+            "route": scenario.route,
+            "requests": len(latencies),
+            "skipped": skipped,
+            "status_codes": status_codes,
+            "latency_ms": summarize(latencies),
+            "throughput_rps": round(len(latencies) / total_seconds, 2) if total_seconds else None,
+            "sql_statements": {
+                "mean": round(sum(query_counts) / len(query_counts), 2) if query_counts else None,
+                "p50": percentile(query_counts, 50),
+                "max": max(query_counts) if query_counts else None,
+                "total": sum(query_counts),
+            },
+        }
+
+    return {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": dialect,
+            "seed": seed,
+            "iterations": iterations,
+            "warmup": warmup,
+            "dataset": dataset.counts,
+            "seed_seconds": round(seed_seconds, 3),
+        },
+        "endpoints": results,
+    }
+
+
+def write_results(results: Dict[str, Any], path: str) -> None:
+    """Writes a results document as pretty-printed, key-sorted JSON so runs diff cleanly."""
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(results, handle, indent=2, sort_keys=True)
+        handle.write("\n")
+
+
+def compare_results(before: Dict[str, Any], after: Dict[str, Any]) -> str:
+    """Renders a side-by-side comparison of two results documents.
+
+    Args:
+        before (dict): The baseline results.
+        after (dict): The results to compare against the baseline.
+
+    Returns:
+        str: A plain-text table with latency percentiles and SQL statement means per endpoint.
+    """
+    def delta(old: Optional[float], new: Optional[float]) -> str:
+        if old is None or new is None:
+            return "n/a"
+        if old == 0:
+            return "+0.0%" if new == 0 else "new"
+        return f"{(new - old) / old * 100:+.1f}%"
+
+    lines = [f"{'endpoint':<36} {'p50 ms':>18} {'p95 ms':>18} {'p99 ms':>18} {'sql/req':>16}"]
+    names = sorted(set(before["endpoints"]) | set(after["endpoints"]))
+    for name in names:
+        old = before["endpoints"].get(name)
+        new = after["endpoints"].get(name)
+        if old is None or new is None:
+            lines.append(f"{name:<36} {'only in ' + ('after' if old is None else 'before'):>18}")
+            continue
+        cells = []
+        for pct in ("p50", "p95", "p99"):
+            old_value, new_value = old["latency_ms"][pct], new["latency_ms"][pct]
+            cells.append(f"{new_value if new_value is not None else '-':>9} {delta(old_value, new_value):>8}")
+        old_sql, new_sql = old["sql_statements"]["mean"], new["sql_statements"]["mean"]
+        cells.append(f"{new_sql if new_sql is not None else '-':>7} {delta(old_sql, new_sql):>8}")
+        lines.append(f"{name:<36} " + " ".join(cells))
+    return "\n".join(lines)
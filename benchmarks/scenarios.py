@@ -0,0 +1,369 @@
+import random
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+from flask_jwt_extended import create_access_token, create_refresh_token
+from app.models import ProfileAccessories
+from app.types.enum import PostType
+from benchmarks.dataset import Dataset, BENCHMARK_PASSWORD
+
+API_PREFIX: str = "/api/v1"
+
+
+@dataclass
+class Call:
+    """A single HTTP request built by a scenario.
+
+    Attributes:
+        path (str): The concrete request path, including the API prefix.
+        json (dict, optional): The JSON body to send.
+        token (str, optional): The bearer token to authenticate with.
+        state (dict): Scenario-specific data handed to the `collect` hook.
+    """
+    path: str
+    json: Optional[dict] = None
+    token: Optional[str] = None
+    state: dict = field(default_factory=dict)
+
+
+@dataclass
+class Scenario:
+    """Describes how to exercise one route.
+
+    Attributes:
+        name (str): `<blueprint>.<endpoint>`, optionally with a `:variant` suffix.
+        method (str): The HTTP method.
+        route (str): The route template, used for reporting.
+        build (Callable): Builds the next `Call`, or returns None when there is nothing left to do.
+        collect (Callable, optional): Inspects the response, e.g. to queue created IDs for a later scenario.
+    """
+    name: str
+    method: str
+    route: str
+    build: Callable[["ScenarioContext"], Optional[Call]]
+    collect: Optional[Callable[["ScenarioContext", Call, object], None]] = None
+
+
+class ScenarioContext:
+    """Shared state for building requests against a seeded dataset.
+
+    Write scenarios come in pairs (follow/unfollow, react/unreact, ...). The
+    first of each pair queues what it did so the second can undo it, keeping
+    the dataset stable across runs.
+    """
+    def __init__(self, dataset: Dataset, rng: random.Random):
+        self.dataset = dataset
+        self.rng = rng
+        self.counter = 0
+        self._tokens: Dict[Tuple[str, bool], str] = {}
+        self.pending: Dict[str, List[tuple]] = {}
+        self.commented_posts = [post_id for post_id, comments in dataset.comment_ids.items() if comments]
+        self.follower_counts: Dict[str, int] = {user_id: 0 for user_id in dataset.user_ids}
+        for _, followee in dataset.follows:
+            self.follower_counts[followee] += 1
+
+    def next_id(self) -> int:
+        self.counter += 1
+        return self.counter
+
+    def user(self) -> str:
+        return self.rng.choice(self.dataset.user_ids)
+
+    def public_id(self, user_id: str) -> str:
+        return self.dataset.public_ids[user_id]
+
+    def post(self) -> str:
+        return self.rng.choice(self.dataset.post_ids)
+
+    def token(self, user_id: str, refresh: bool = False) -> str:
+        """Returns a cached access (or refresh) token for the user."""
+        key = (user_id, refresh)
+        if key not in self._tokens:
+            self._tokens[key] = self.fresh_token(user_id, refresh)
+        return self._tokens[key]
+
+    def fresh_token(self, user_id: str, refresh: bool = False) -> str:
+        """Creates a new token; used where the token is consumed (e.g. logout)."""
+        role = "ADMIN" if user_id == self.dataset.admin_id else "USER"
+        factory = create_refresh_token if refresh else create_access_token
+        return factory(identity=user_id, additional_claims={"role": role})
+
+    def push(self, queue: str, item: tuple) -> None:
+        self.pending.setdefault(queue, []).append(item)
+
+    def pop(self, queue: str) -> Optional[tuple]:
+        items = self.pending.get(queue)
+        return items.pop() if items else None
+
+
+#region AUTH
+def _login(ctx: ScenarioContext) -> Call:
+    user_id = ctx.user()
+    return Call(f"{API_PREFIX}/login", json={"email": ctx.dataset.emails[user_id], "password": BENCHMARK_PASSWORD})
+
+def _refresh(ctx: ScenarioContext) -> Call:
+    return Call(f"{API_PREFIX}/refresh", token=ctx.token(ctx.user(), refresh=True))
+
+def _logout(ctx: ScenarioContext) -> Call:
+    return Call(f"{API_PREFIX}/logout", token=ctx.fresh_token(ctx.user()))
+#endregion AUTH
+
+
+#region USERS
+def _get_users(ctx: ScenarioContext) -> Call:
+    return Call(f"{API_PREFIX}/users")
+
+def _get_user(ctx: ScenarioContext) -> Call:
+    return Call(f"{API_PREFIX}/users/{ctx.public_id(ctx.user())}")
+
+def _get_me(ctx: ScenarioContext) -> Call:
+    return Call(f"{API_PREFIX}/users/me", token=ctx.token(ctx.user()))
+
+def _get_user_posts(ctx: ScenarioContext) -> Call:
+    return Call(f"{API_PREFIX}/users/{ctx.public_id(ctx.user())}/posts")
+
+def _get_followers(ctx: ScenarioContext) -> Call:
+    # Bias towards popular accounts; those are the expensive listings.
+    user_id = max(ctx.rng.sample(ctx.dataset.user_ids, 3), key=ctx.follower_counts.__getitem__)
+    return Call(f"{API_PREFIX}/users/{ctx.public_id(user_id)}/followers")
+
+def _get_following(ctx: ScenarioContext) -> Call:
+    return Call(f"{API_PREFIX}/users/{ctx.public_id(ctx.user())}/following")
+
+def _update_user(ctx: ScenarioContext) -> Call:
+    # update_user always validates friend_code, so send a valid one derived from the user's index
+    user_id = ctx.user()
+    index = ctx.dataset.user_ids.index(user_id)
+    body = {"biography": f"Updated biography {ctx.next_id()}", "friend_code": f"{index // 1000:03d}-{index % 1000:03d}"}
+    return Call(f"{API_PREFIX}/users", json=body, token=ctx.token(user_id))
+
+def _create_user(ctx: ScenarioContext) -> Call:
+    index = ctx.next_id()
+    return Call(f"{API_PREFIX}/users", json={"username": f"bnew_{index:06d}", "email": f"bnew{index}@example.com", "password": BENCHMARK_PASSWORD})
+
+def _follow(ctx: ScenarioContext) -> Optional[Call]:
+    for _ in range(20):
+        follower, followee = ctx.user(), ctx.user()
+        if follower != followee and (follower, followee) not in ctx.dataset.follows:
+            return Call(f"{API_PREFIX}/users/{ctx.public_id(followee)}/follow", token=ctx.token(follower), state={"pair": (follower, followee)})
+    return None
+
+def _collect_follow(ctx: ScenarioContext, call: Call, response) -> None:
+    if response.status_code == 200:
+        ctx.push("follows", call.state["pair"])
+
+def _unfollow(ctx: ScenarioContext) -> Optional[Call]:
+    pair = ctx.pop("follows")
+    if pair is None:
+        return None
+    follower, followee = pair
+    return Call(f"{API_PREFIX}/users/{ctx.public_id(followee)}/unfollow", token=ctx.token(follower))
+#endregion USERS
+
+
+#region POSTS
+def _get_posts_anonymous(ctx: ScenarioContext) -> Call:
+    return Call(f"{API_PREFIX}/posts")
+
+def _get_posts(ctx: ScenarioContext) -> Call:
+    return Call(f"{API_PREFIX}/posts", token=ctx.token(ctx.user()))
+
+def _get_post(ctx: ScenarioContext) -> Call:
+    return Call(f"{API_PREFIX}/posts/{ctx.post()}", token=ctx.token(ctx.user()))
+
+def _create_post(ctx: ScenarioContext) -> Call:
+    user_id = ctx.user()
+    body = {
+        "post_caption": f"Benchmark created post {ctx.next_id()}",
+        "post_type": PostType.IMAGE.value,
+        "post_category_id": ctx.rng.choice(ctx.dataset.category_ids),
+        "hashtags": ctx.rng.sample(ctx.dataset.hashtag_names, 3) + [f"fresh{ctx.counter}"],
+        "media_urls": [{"url": f"https://cdn.example.com/new/{ctx.counter}/{i}.jpg", "size": 1024 * (i + 1)} for i in range(2)],
+    }
+    return Call(f"{API_PREFIX}/posts", json=body, token=ctx.token(user_id), state={"user_id": user_id})
+
+def _collect_create_post(ctx: ScenarioContext, call: Call, response) -> None:
+    if response.status_code == 201:
+        ctx.push("posts", (call.state["user_id"], response.get_json()["post"]["id"]))
+
+def _delete_post(ctx: ScenarioContext) -> Optional[Call]:
+    created = ctx.pop("posts")
+    if created is None:
+        return None
+    user_id, post_id = created
+    return Call(f"{API_PREFIX}/posts/{post_id}", token=ctx.token(user_id))
+
+def _react(ctx: ScenarioContext) -> Call:
+    user_id, post_id = ctx.user(), ctx.post()
+    reaction = ctx.rng.choice(["like", "love", "laugh"])
+    return Call(f"{API_PREFIX}/posts/{post_id}/react/{reaction}", token=ctx.token(user_id), state={"pair": (user_id, post_id)})
+
+def _collect_react(ctx: ScenarioContext, call: Call, response) -> None:
+    if response.status_code == 200:
+        ctx.push("reactions", call.state["pair"])
+
+def _unreact(ctx: ScenarioContext) -> Optional[Call]:
+    pair = ctx.pop("reactions")
+    if pair is None:
+        return None
+    user_id, post_id = pair
+    return Call(f"{API_PREFIX}/posts/{post_id}/react", token=ctx.token(user_id))
+
+def _get_comments(ctx: ScenarioContext) -> Call:
+    return Call(f"{API_PREFIX}/posts/{ctx.rng.choice(ctx.commented_posts or ctx.dataset.post_ids)}/comments")
+
+def _comment(ctx: ScenarioContext) -> Call:
+    return Call(f"{API_PREFIX}/posts/{ctx.post()}/comments", json={"content": f"Benchmark comment {ctx.next_id()}"}, token=ctx.token(ctx.user()))
+
+def _like_comment(ctx: ScenarioContext) -> Optional[Call]:
+    if not ctx.commented_posts:
+        return None
+    post_id = ctx.rng.choice(ctx.commented_posts)
+    comment_id = ctx.rng.choice(ctx.dataset.comment_ids[post_id])
+    user_id = ctx.user()
+    return Call(f"{API_PREFIX}/posts/{post_id}/comments/{comment_id}/like", token=ctx.token(user_id), state={"like": (user_id, post_id, comment_id)})
+
+def _collect_like_comment(ctx: ScenarioContext, call: Call, response) -> None:
+    if response.status_code == 200:
+        ctx.push("likes", call.state["like"])
+
+def _unlike_comment(ctx: ScenarioContext) -> Optional[Call]:
+    like = ctx.pop("likes")
+    if like is None:
+        return None
+    user_id, post_id, comment_id = like
+    return Call(f"{API_PREFIX}/posts/{post_id}/comments/{comment_id}/like", token=ctx.token(user_id))
+#endregion POSTS
+
+
+#region HASHTAGS
+def _popular_hashtag(ctx: ScenarioContext) -> str:
+    # Hashtag popularity is Zipf-distributed; the head of the list is the hot set.
+    return ctx.dataset.hashtag_names[min(int(ctx.rng.expovariate(0.2)), len(ctx.dataset.hashtag_names) - 1)]
+
+def _get_hashtags(ctx: ScenarioContext) -> Call:
+    return Call(f"{API_PREFIX}/hashtags")
+
+def _get_hashtag(ctx: ScenarioContext) -> Call:
+    return Call(f"{API_PREFIX}/hashtags/{_popular_hashtag(ctx)}")
+
+def _get_hashtag_posts(ctx: ScenarioContext) -> Call:
+    return Call(f"{API_PREFIX}/hashtags/{_popular_hashtag(ctx)}/posts")
+#endregion HASHTAGS
+
+
+#region BLOCKS
+def _get_blocks(ctx: ScenarioContext) -> Call:
+    blocker = ctx.rng.choice(sorted(ctx.dataset.blocks))[0] if ctx.dataset.blocks else ctx.user()
+    return Call(f"{API_PREFIX}/blocks", json={}, token=ctx.token(blocker))
+
+def _block(ctx: ScenarioContext) -> Optional[Call]:
+    for _ in range(20):
+        blocker, blocked = ctx.user(), ctx.user()
+        if blocker != blocked and (blocker, blocked) not in ctx.dataset.blocks:
+            return Call(f"{API_PREFIX}/blocks/{ctx.public_id(blocked)}", token=ctx.token(blocker), state={"pair": (blocker, blocked)})
+    return None
+
+def _collect_block(ctx: ScenarioContext, call: Call, response) -> None:
+    if response.status_code == 200:
+        ctx.push("blocks", call.state["pair"])
+
+def _unblock(ctx: ScenarioContext) -> Optional[Call]:
+    pair = ctx.pop("blocks")
+    if pair is None:
+        return None
+    blocker, blocked = pair
+    return Call(f"{API_PREFIX}/blocks/{ctx.public_id(blocked)}", token=ctx.token(blocker))
+#endregion BLOCKS
+
+
+#region FEED
+def _get_feed(ctx: ScenarioContext) -> Call:
+    # A user who follows someone, so the page is not empty
+    follower = ctx.rng.choice(sorted(ctx.dataset.follows))[0] if ctx.dataset.follows else ctx.user()
+    return Call(f"{API_PREFIX}/feed", token=ctx.token(follower))
+#endregion FEED
+
+
+#region MARKET
+def _get_market(ctx: ScenarioContext) -> Call:
+    return Call(f"{API_PREFIX}/market/profile-accessories", json={"filter": [{"name": "banner"}]}, token=ctx.token(ctx.user()))
+
+def _create_market_item(ctx: ScenarioContext) -> Call:
+    name = f"Bench item {ctx.next_id()}"
+    body = {"creation": {
+        "name": name,
+        "description": "Created by the benchmark",
+        "url": "https://cdn.example.com/accessories/new.png",
+        "accessory_type": "BADGE",
+        "profile_type": "USER_PROFILE",
+        "ownership_type": "USER",
+        "available": True,
+        "bits": 100,
+    }}
+    return Call(f"{API_PREFIX}/market/profile-accessories", json=body, token=ctx.token(ctx.dataset.admin_id), state={"name": name})
+
+def _collect_create_market_item(ctx: ScenarioContext, call: Call, response) -> None:
+    if response.status_code == 201:
+        item = ProfileAccessories.query.filter_by(accessory_name=call.state["name"]).first()
+        if item is not None:
+            ctx.push("market_update", (item.accessory_id,))
+
+def _update_market_item(ctx: ScenarioContext) -> Optional[Call]:
+    item = ctx.pop("market_update")
+    if item is None:
+        return None
+    ctx.push("market_delete", item)
+    return Call(f"{API_PREFIX}/market/profile-accessories/{item[0]}", json={"update": {"bits": 150}}, token=ctx.token(ctx.dataset.admin_id))
+
+def _delete_market_item(ctx: ScenarioContext) -> Optional[Call]:
+    item = ctx.pop("market_delete")
+    if item is None:
+        return None
+    return Call(f"{API_PREFIX}/market/profile-accessories/{item[0]}", token=ctx.token(ctx.dataset.admin_id))
+#endregion MARKET
+
+
+# Scenarios run in this order; the second half of each write pair undoes the first.
+SCENARIOS: List[Scenario] = [
+    Scenario("auth.login", "POST", "/login", _login),
+    Scenario("auth.refresh", "POST", "/refresh", _refresh),
+    Scenario("auth.logout", "POST", "/logout", _logout),
+
+    Scenario("users.get_users", "GET", "/users", _get_users),
+    Scenario("users.get_user", "GET", "/users/<public_user_id>", _get_user),
+    Scenario("users.get_logged_in_user", "GET", "/users/me", _get_me),
+    Scenario("users.get_posts_by_user", "GET", "/users/<public_user_id>/posts", _get_user_posts),
+    Scenario("users.get_user_followers", "GET", "/users/<public_user_id>/followers", _get_followers),
+    Scenario("users.get_user_following", "GET", "/users/<public_user_id>/following", _get_following),
+    Scenario("users.update_user", "PUT", "/users", _update_user),
+    Scenario("users.create_user", "POST", "/users", _create_user),
+    Scenario("users.follow_user", "POST", "/users/<followee_public_user_id>/follow", _follow, _collect_follow),
+    Scenario("users.unfollow_user", "POST", "/users/<unfollowee_public_user_id>/unfollow", _unfollow),
+
+    Scenario("posts.get_posts:anonymous", "GET", "/posts", _get_posts_anonymous),
+    Scenario("posts.get_posts", "GET", "/posts", _get_posts),
+    Scenario("posts.get_post_by_id", "GET", "/posts/<post_id>", _get_post),
+    Scenario("posts.create_post", "POST", "/posts", _create_post, _collect_create_post),
+    Scenario("posts.react_to_post", "POST", "/posts/<post_id>/react/<reaction>", _react, _collect_react),
+    Scenario("posts.unreact_to_post", "DELETE", "/posts/<post_id>/react", _unreact),
+    Scenario("posts.get_post_comments", "GET", "/posts/<post_id>/comments", _get_comments),
+    Scenario("posts.comment_on_post", "POST", "/posts/<post_id>/comments", _comment),
+    Scenario("posts.like_comment", "POST", "/posts/<post_id>/comments/<comment_id>/like", _like_comment, _collect_like_comment),
+    Scenario("posts.unlike_comment", "DELETE", "/posts/<post_id>/comments/<comment_id>/like", _unlike_comment),
+    Scenario("posts.delete_post", "DELETE", "/posts/<post_id>", _delete_post),
+
+    Scenario("hashtags.get_hashtags", "GET", "/hashtags", _get_hashtags),
+    Scenario("hashtags.get_specific_hashtag", "GET", "/hashtags/<hashtag_name>", _get_hashtag),
+    Scenario("hashtags.get_posts_for_hashtag", "GET", "/hashtags/<hashtag_name>/posts", _get_hashtag_posts),
+
+    Scenario("blocks.get_blocked_users", "GET", "/blocks", _get_blocks),
+    Scenario("blocks.block_user", "POST", "/blocks/<blocked_id>", _block, _collect_block),
+    Scenario("blocks.unblock_user", "DELETE", "/blocks/<unblocked_id>", _unblock),
+
+    Scenario("feed.get_feed", "GET", "/feed", _get_feed),
+
+    Scenario("market.get_market_items", "GET", "/market/profile-accessories", _get_market),
+    Scenario("market.create_market_item", "POST", "/market/profile-accessories", _create_market_item, _collect_create_market_item),
+    Scenario("market.update_market_item", "PUT", "/market/profile-accessories/<item_id>", _update_market_item),
+    Scenario("market.delete_market_item", "DELETE", "/market/profile-accessories/<item_id>", _delete_market_item),
+]
@@ -4,6 +4,13 @@ from dotenv import load_dotenv
 # Load environment variables from .env file
 load_dotenv()
 
+# Connection pool profiles per FLASK_ENV. Each DB_POOL_* / DB_MAX_OVERFLOW environment variable overrides its value
+DB_POOL_PROFILES: dict = {
+    "development": {"pool_size": 5, "max_overflow": 5, "pool_timeout": 10, "pool_recycle": 1800, "pool_pre_ping": True},
+    "testing": {"pool_size": 2, "max_overflow": 2, "pool_timeout": 5, "pool_recycle": 1800, "pool_pre_ping": False},
+    "production": {"pool_size": 10, "max_overflow": 20, "pool_timeout": 30, "pool_recycle": 1800, "pool_pre_ping": True},
+}
+
 class Config:
     # Flask app configuration
     FLASK_ENV = os.getenv("FLASK_ENV", "production")  # Default to 'production' if not set
@@ -15,7 +22,120 @@ class Config:
     # Flask-SQLAlchemy configuration
     SQLALCHEMY_DATABASE_URI: str = os.getenv("DATABASE_URI", "sqlite:///default.db")
     SQLALCHEMY_TRACK_MODIFICATIONS: bool = False
-    SQLALCHEMY_ECHO: bool = True
+    SQLALCHEMY_ECHO: bool = os.getenv("SQLALCHEMY_ECHO", "false").lower() == "true"
+
+    # Read replicas (comma-separated URIs). Reads of GET requests go to a replica unless the user wrote recently
+    SQLALCHEMY_REPLICA_URIS: list = [uri.strip() for uri in os.getenv("DATABASE_REPLICA_URIS", "").split(",") if uri.strip()]
+    REPLICA_STICKINESS_SECONDS: float = float(os.getenv("REPLICA_STICKINESS_SECONDS", 5))
+
+    # Connection pool (applied to SQLALCHEMY_ENGINE_OPTIONS in create_app)
+    _POOL_PROFILE: dict = DB_POOL_PROFILES.get(FLASK_ENV, DB_POOL_PROFILES["production"])
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", _POOL_PROFILE["pool_size"]))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", _POOL_PROFILE["max_overflow"]))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", _POOL_PROFILE["pool_timeout"]))  # Whole seconds; SQLAlchemy coerces it to int
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", _POOL_PROFILE["pool_recycle"]))  # Below MySQL's wait_timeout
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", str(_POOL_PROFILE["pool_pre_ping"])).lower() == "true"
+
+    # Slow-query log (JSON lines with the statement, parameters, origin and EXPLAIN output)
+    SLOW_QUERY_LOG_ENABLED: bool = os.getenv("SLOW_QUERY_LOG_ENABLED", "true").lower() == "true"
+    SLOW_QUERY_THRESHOLD_MS: float = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", 200))
+    SLOW_QUERY_LOG_FILE: str = os.getenv("SLOW_QUERY_LOG_FILE", os.path.join("logs", "slow_queries.log"))
+    SLOW_QUERY_LOG_MAX_BYTES: int = int(os.getenv("SLOW_QUERY_LOG_MAX_BYTES", 10 * 1024 * 1024))
+    SLOW_QUERY_LOG_BACKUP_COUNT: int = int(os.getenv("SLOW_QUERY_LOG_BACKUP_COUNT", 5))
+    SLOW_QUERY_EXPLAIN: bool = os.getenv("SLOW_QUERY_EXPLAIN", "true").lower() == "true"
+
+    # Query tracking (X-DB-Query-Count / X-DB-Time-Ms headers and N+1 warnings)
+    QUERY_TRACKING_ENABLED: bool = os.getenv("QUERY_TRACKING_ENABLED", "false").lower() == "true"
+    N_PLUS_ONE_THRESHOLD: int = int(os.getenv("N_PLUS_ONE_THRESHOLD", 5))
+
+    # Metrics (/metrics endpoint). Set METRICS_MULTIPROC_DIR when running several worker processes
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    METRICS_MULTIPROC_DIR: str = os.getenv("METRICS_MULTIPROC_DIR")
+    METRICS_FLUSH_INTERVAL: float = float(os.getenv("METRICS_FLUSH_INTERVAL", 1.0))
+    # Bearer token required to scrape /metrics. Without it, /metrics requires the API key
+    METRICS_TOKEN: str = os.getenv("METRICS_TOKEN")
+
+    # On-demand profiling. Admins can profile a request with the X-Profile header; others are sampled
+    PROFILING_ENABLED: bool = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+    PROFILING_SAMPLE_RATE: float = float(os.getenv("PROFILING_SAMPLE_RATE", 0.0))
+    PROFILING_DIR: str = os.getenv("PROFILING_DIR", "profiles")
+    PROFILING_RETENTION: int = int(os.getenv("PROFILING_RETENTION", 100))
+
+    # Response compression (gzip/deflate negotiated from Accept-Encoding)
+    COMPRESSION_ENABLED: bool = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+    COMPRESSION_LEVEL: int = int(os.getenv("COMPRESSION_LEVEL", 6))
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", 500))
+
+    # In-process cache of rendered user summaries, evicted on commit. Per worker, so keep the TTL short
+    USER_CACHE_ENABLED: bool = os.getenv("USER_CACHE_ENABLED", "true").lower() == "true"
+    USER_CACHE_MAX_SIZE: int = int(os.getenv("USER_CACHE_MAX_SIZE", 10000))
+    USER_CACHE_TTL_SECONDS: float = float(os.getenv("USER_CACHE_TTL_SECONDS", 60))
+
+    # Write-behind view counters. A crashed worker loses at most COUNTER_FLUSH_INTERVAL seconds of views; 0 writes through
+    COUNTER_BUFFER_ENABLED: bool = os.getenv("COUNTER_BUFFER_ENABLED", "true").lower() == "true"
+    COUNTER_FLUSH_INTERVAL: float = float(os.getenv("COUNTER_FLUSH_INTERVAL", 5.0))
+    COUNTER_BUFFER_MAX_KEYS: int = int(os.getenv("COUNTER_BUFFER_MAX_KEYS", 10000))
+
+    # Paginated listings using the cached count strategy reuse a total for this long
+    COUNT_CACHE_TTL_SECONDS: float = float(os.getenv("COUNT_CACHE_TTL_SECONDS", 30))
+    COUNT_CACHE_MAX_SIZE: int = int(os.getenv("COUNT_CACHE_MAX_SIZE", 1024))
+
+    # Spread increments of hot follower and reaction counts over shard rows
+    COUNTER_SHARDING_ENABLED: bool = os.getenv("COUNTER_SHARDING_ENABLED", "false").lower() == "true"
+    COUNTER_SHARDS: int = int(os.getenv("COUNTER_SHARDS", 16))
+    # A counter row receiving this many increments within the window is sharded for COUNTER_HOT_TTL_SECONDS
+    COUNTER_HOT_THRESHOLD: int = int(os.getenv("COUNTER_HOT_THRESHOLD", 50))
+    COUNTER_HOT_WINDOW_SECONDS: float = float(os.getenv("COUNTER_HOT_WINDOW_SECONDS", 10))
+    COUNTER_HOT_TTL_SECONDS: float = float(os.getenv("COUNTER_HOT_TTL_SECONDS", 600))
+    COUNTER_SHARD_CACHE_TTL_SECONDS: float = float(os.getenv("COUNTER_SHARD_CACHE_TTL_SECONDS", 5))
+    COUNTER_COMPACT_INTERVAL: float = float(os.getenv("COUNTER_COMPACT_INTERVAL", 30))
+
+    # Persistent job queue for delete cascades and timeline maintenance. Jobs are run by
+    # JOBS_EMBEDDED_WORKERS threads in each web worker and by any `flask jobs work` processes,
+    # unless JOBS_RUN_INLINE runs them right after the request's commit (tests and scripts).
+    # Only set JOBS_EMBEDDED_WORKERS to 0 when `flask jobs work` processes are deployed
+    JOBS_RUN_INLINE: bool = os.getenv("JOBS_RUN_INLINE", "false").lower() == "true"
+    JOBS_EMBEDDED_WORKERS: int = int(os.getenv("JOBS_EMBEDDED_WORKERS", 1))
+    JOBS_WORKER_THREADS: int = int(os.getenv("JOBS_WORKER_THREADS", 4))
+    JOBS_POLL_INTERVAL: float = float(os.getenv("JOBS_POLL_INTERVAL", 1))
+    JOBS_MAX_ATTEMPTS: int = int(os.getenv("JOBS_MAX_ATTEMPTS", 5))
+    JOBS_BACKOFF_BASE_SECONDS: float = float(os.getenv("JOBS_BACKOFF_BASE_SECONDS", 5))
+    JOBS_BACKOFF_MAX_SECONDS: float = float(os.getenv("JOBS_BACKOFF_MAX_SECONDS", 3600))
+    JOBS_LOCK_TIMEOUT_SECONDS: float = float(os.getenv("JOBS_LOCK_TIMEOUT_SECONDS", 600))
+    JOBS_CLAIM_CANDIDATES: int = int(os.getenv("JOBS_CLAIM_CANDIDATES", 10))
+    JOBS_RETENTION_DAYS: int = int(os.getenv("JOBS_RETENTION_DAYS", 7))
+
+    # Materialized home timelines: new posts are fanned out to followers, except those posted while
+    # their author had more than TIMELINE_CELEBRITY_THRESHOLD followers, which are merged in at read time
+    TIMELINE_ENABLED: bool = os.getenv("TIMELINE_ENABLED", "false").lower() == "true"
+    TIMELINE_CELEBRITY_THRESHOLD: int = int(os.getenv("TIMELINE_CELEBRITY_THRESHOLD", 10000))
+    TIMELINE_FANOUT_BATCH_SIZE: int = int(os.getenv("TIMELINE_FANOUT_BATCH_SIZE", 1000))
+    TIMELINE_BACKFILL_POSTS: int = int(os.getenv("TIMELINE_BACKFILL_POSTS", 50))
+    TIMELINE_CELEBRITY_CACHE_MAX_SIZE: int = int(os.getenv("TIMELINE_CELEBRITY_CACHE_MAX_SIZE", 10000))
+    TIMELINE_CELEBRITY_CACHE_TTL_SECONDS: float = float(os.getenv("TIMELINE_CELEBRITY_CACHE_TTL_SECONDS", 60))
+
+    # Revocation checks are answered from each worker's copy of the token blocklist, which
+    # picks up logouts from other workers within TOKEN_BLOCKLIST_POLL_INTERVAL_SECONDS.
+    # A TOKEN_BLOCKLIST_BLOOM_CAPACITY above 0 keeps a Bloom filter instead of the exact set
+    TOKEN_BLOCKLIST_CACHE_ENABLED: bool = os.getenv("TOKEN_BLOCKLIST_CACHE_ENABLED", "true").lower() == "true"
+    TOKEN_BLOCKLIST_POLL_INTERVAL_SECONDS: float = float(os.getenv("TOKEN_BLOCKLIST_POLL_INTERVAL_SECONDS", 5))
+    TOKEN_BLOCKLIST_POLL_OVERLAP_SECONDS: float = float(os.getenv("TOKEN_BLOCKLIST_POLL_OVERLAP_SECONDS", 30))
+    TOKEN_BLOCKLIST_RELOAD_INTERVAL_SECONDS: float = float(os.getenv("TOKEN_BLOCKLIST_RELOAD_INTERVAL_SECONDS", 3600))
+    TOKEN_BLOCKLIST_BLOOM_CAPACITY: int = int(os.getenv("TOKEN_BLOCKLIST_BLOOM_CAPACITY", 0))
+    TOKEN_BLOCKLIST_BLOOM_ERROR_RATE: float = float(os.getenv("TOKEN_BLOCKLIST_BLOOM_ERROR_RATE", 0.001))
+
+    # Each worker caches users' token generations this long, so "log out everywhere" takes up to
+    # this long to reach other workers; 0 reads the generation on every authenticated request
+    TOKEN_GENERATION_CACHE_MAX_SIZE: int = int(os.getenv("TOKEN_GENERATION_CACHE_MAX_SIZE", 100000))
+    TOKEN_GENERATION_CACHE_TTL_SECONDS: float = float(os.getenv("TOKEN_GENERATION_CACHE_TTL_SECONDS", 30))
+
+    # Reaction types are reference data; each worker caches the list for this long
+    REACTION_TYPES_CACHE_TTL_SECONDS: float = float(os.getenv("REACTION_TYPES_CACHE_TTL_SECONDS", 300))
+    # Serialize post reactions from posts.reaction_summary instead of loading the reaction count rows.
+    # Summaries are not maintained while this is off; run `flask posts refresh-reaction-summaries` after enabling it
+    REACTION_SUMMARY_ENABLED: bool = os.getenv("REACTION_SUMMARY_ENABLED", "false").lower() == "true"
+    # The summary is recomputed by a job this long after the counts change, so bursts of reactions share one refresh
+    REACTION_SUMMARY_REFRESH_DELAY_SECONDS: float = float(os.getenv("REACTION_SUMMARY_REFRESH_DELAY_SECONDS", 1))
 
     # JWT configuration
     JWT_SECRET_KEY: str = os.getenv("JWT_SECRET_KEY", "your_default_jwt_secret_key")
@@ -0,0 +1,13 @@
+import pytest
+from benchmarks.counter_stress import run_counter_stress
+
+
+@pytest.mark.parametrize("sharded", [False, True], ids=["atomic", "sharded"])
+def test_concurrent_increments_are_not_lost(tmp_path, sharded):
+    """Every committed increment of every counter must be in its final value."""
+    results = run_counter_stress(f"sqlite:///{tmp_path / 'counters.db'}", writers=4, increments=25, sharded=sharded)
+
+    assert results
+    for name, result in results.items():
+        assert result["committed"] == 4 * 25, name
+        assert result["lost"] == 0, name
@@ -0,0 +1,66 @@
+import pytest
+from app import create_app, db
+from app.models import Posts, Users
+from app.services.jobs import JobWorker
+from benchmarks.dataset import BENCHMARK_PASSWORD, DatasetSizes, seed_dataset
+from benchmarks.runner import make_config
+from config import Config
+
+
+@pytest.fixture()
+def app(tmp_path):
+    config = make_config(f"sqlite:///{tmp_path / 'delete.db'}")
+    # Leave the cascade queued, as it is while the job waits for a worker
+    config.JOBS_EMBEDDED_WORKERS = 0
+    app = create_app(config)
+    with app.app_context():
+        db.create_all()
+        app.dataset = seed_dataset(1, DatasetSizes(users=5, posts=20, hashtags=3))
+    return app
+
+
+def _login(client, email):
+    return client.post("/api/v1/login", json={"email": email, "password": BENCHMARK_PASSWORD}, headers={"x-api-key": Config.API_KEY})
+
+
+def _run_jobs(app):
+    JobWorker(app, threads=1, poll_interval=0).run(once=True)
+
+
+def test_deleted_post_is_hidden_before_the_cascade_runs(app):
+    dataset = app.dataset
+    post_id = dataset.post_ids[0]
+    author_id = dataset.post_authors[post_id]
+    client = app.test_client()
+    token = _login(client, dataset.emails[author_id]).get_json()["access_token"]
+    headers = {"x-api-key": Config.API_KEY, "Authorization": f"Bearer {token}"}
+
+    assert client.delete(f"/api/v1/posts/{post_id}", headers=headers).status_code == 202
+    assert client.get(f"/api/v1/posts/{post_id}", headers=headers).status_code == 404
+    assert client.delete(f"/api/v1/posts/{post_id}", headers=headers).status_code == 404
+    listed = client.get(f"/api/v1/users/{dataset.public_ids[author_id]}/posts", headers=headers).get_json()
+    assert post_id not in [post["post_id"] for post in listed]
+
+    _run_jobs(app)
+    with app.app_context():
+        assert db.session.get(Posts, post_id) is None
+
+
+def test_deleted_user_is_logged_out_and_hidden_before_the_cascade_runs(app):
+    dataset = app.dataset
+    user_id = next(author_id for author_id in dataset.post_authors.values())
+    client = app.test_client()
+    token = _login(client, dataset.emails[user_id]).get_json()["access_token"]
+    headers = {"x-api-key": Config.API_KEY, "Authorization": f"Bearer {token}"}
+
+    assert client.delete("/api/v1/users", headers=headers).status_code == 202
+    assert _login(client, dataset.emails[user_id]).status_code == 401
+    assert client.get("/api/v1/users/me", headers=headers).status_code == 401
+    assert client.get(f"/api/v1/users/{dataset.public_ids[user_id]}", headers=headers).status_code == 404
+    for post_id, author_id in dataset.post_authors.items():
+        if author_id == user_id:
+            assert client.get(f"/api/v1/posts/{post_id}", headers={"x-api-key": Config.API_KEY}).status_code == 404
+
+    _run_jobs(app)
+    with app.app_context():
+        assert db.session.get(Users, user_id) is None
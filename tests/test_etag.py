@@ -0,0 +1,84 @@
+import pytest
+from sqlalchemy import update
+from app import create_app, db
+from app.models import Posts, Users
+from app.utils.cache import get_user_cache
+from app.utils.counter_buffer import get_counter_buffer
+from benchmarks.dataset import DatasetSizes, seed_dataset
+from benchmarks.runner import make_config
+from config import Config
+
+
+@pytest.fixture()
+def app(tmp_path):
+    config = make_config(f"sqlite:///{tmp_path / 'etag.db'}")
+    # Flush view counts only when the test asks for it
+    config.COUNTER_FLUSH_INTERVAL = 3600
+    config.JOBS_RUN_INLINE = True
+    app = create_app(config)
+    with app.app_context():
+        db.create_all()
+        app.dataset = seed_dataset(1, DatasetSizes(users=5, posts=5, hashtags=3))
+    return app
+
+
+def _flush_views(app):
+    with app.app_context():
+        assert get_counter_buffer().flush() > 0
+
+
+@pytest.mark.parametrize("resource", ["post", "hashtag"])
+def test_revalidation_survives_view_count_flush(app, resource):
+    """Counting the revalidating client's own views must not change the ETag."""
+    dataset = app.dataset
+    url = f"/api/v1/posts/{dataset.post_ids[0]}" if resource == "post" else f"/api/v1/hashtags/{dataset.hashtag_names[0]}"
+    client = app.test_client()
+    headers = {"x-api-key": Config.API_KEY}
+
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    for _ in range(2):
+        _flush_views(app)
+        response = client.get(url, headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+
+
+@pytest.mark.parametrize("resource", ["user", "post"])
+def test_etag_and_body_agree_after_another_workers_change(app, resource):
+    """A change committed by another worker must not be served from this worker's user cache."""
+    dataset = app.dataset
+    with app.app_context():
+        post = Posts.query.filter_by(post_id=dataset.post_ids[0]).first()
+        user = post.user
+        private_user_id, public_user_id = user.private_user_id, user.public_user_id
+    url = f"/api/v1/users/{public_user_id}" if resource == "user" else f"/api/v1/posts/{dataset.post_ids[0]}"
+    client = app.test_client()
+    headers = {"x-api-key": Config.API_KEY}
+
+    def biography(response):
+        body = response.get_json()
+        return body["biography"] if resource == "user" else body["poster"]["biography"]
+
+    # Render the user once so this worker's cache holds them
+    with app.test_request_context():
+        user = Users.query.filter_by(private_user_id=private_user_id).first()
+        user.to_dict()
+        assert get_user_cache().get(private_user_id) is not None
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    # Another worker's commit bypasses this worker's session and its cache invalidation
+    with app.app_context(), db.engine.begin() as connection:
+        connection.execute(update(Users).where(Users.private_user_id == private_user_id).values(biography="Changed elsewhere"))
+
+    response = client.get(url, headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert biography(response) == "Changed elsewhere"
+
+    response = client.get(url, headers={**headers, "If-None-Match": response.headers["ETag"]})
+    assert response.status_code == 304
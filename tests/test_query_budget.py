@@ -0,0 +1,41 @@
+import pytest
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.utils.query_tracking import assert_max_queries
+from benchmarks.dataset import DatasetSizes, seed_dataset
+from benchmarks.runner import make_config
+from config import Config
+
+# Maximum statements per request, including authentication, whatever the page size
+ROUTE_BUDGETS = {
+    "/api/v1/posts": 6,
+    "/api/v1/feed": 7,
+}
+
+
+@pytest.fixture()
+def app(tmp_path):
+    config = make_config(f"sqlite:///{tmp_path / 'query_budget.db'}")
+    config.JOBS_EMBEDDED_WORKERS = 0
+    app = create_app(config)
+    with app.app_context():
+        db.create_all()
+        app.dataset = seed_dataset(1, DatasetSizes(users=20, posts=200, hashtags=5))
+        app.token = create_access_token(identity=app.dataset.user_ids[0], additional_claims={"role": "USER"})
+    return app
+
+
+@pytest.mark.parametrize("url", sorted(ROUTE_BUDGETS))
+@pytest.mark.parametrize("per_page", [5, 20])
+def test_page_stays_within_query_budget(app, url, per_page):
+    """A page costs the same number of statements however many posts it holds."""
+    client = app.test_client()
+    headers = {"x-api-key": Config.API_KEY, "Authorization": f"Bearer {app.token}"}
+
+    # Warm this worker's caches (token blocklist, token generations) like a running server
+    assert client.get(url, headers=headers).status_code == 200
+
+    with assert_max_queries(ROUTE_BUDGETS[url]):
+        response = client.get(url, query_string={"pp": per_page}, headers=headers)
+    assert response.status_code == 200
+    assert len(response.get_json()["posts"]) == per_page